@@ -0,0 +1,133 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from app.core.config import get_settings
+from app.core.logger import logging
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt):
+    """
+    Normalize a prompt so trivially different phrasings share a cache key.
+
+    Example:
+        >>> normalize_prompt("  RSI of TCS? ")
+        'rsi of tcs'
+    """
+    prompt = _NON_WORD.sub(" ", prompt.lower())
+    return _WHITESPACE.sub(" ", prompt).strip()
+
+
+class AnswerCache:
+    """
+    A TTL + LRU cache of whole chat answers.
+
+    Entries are keyed by the normalized prompt. Each entry also records the
+    symbols its tool calls resolved and their data versions, and is only served
+    while every one of those symbols is still at the same version.
+    """
+
+    def __init__(self, max_entries, ttl_seconds):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.saved_latency_seconds = 0.0
+
+    def get(self, prompt_key, current_version):
+        """
+        Look up a cached answer.
+
+        Args:
+            prompt_key (str): The normalized prompt.
+            current_version (callable): Returns the current data version of a symbol.
+
+        Returns:
+            dict: The cached ``{"role", "message_text"}`` answer, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(prompt_key)
+            if entry and entry["expires_at"] <= time.monotonic():
+                del self._entries[prompt_key]
+                entry = None
+
+        if entry and any(
+            current_version(symbol) != version
+            for symbol, version in entry["versions"].items()
+        ):
+            with self._lock:
+                self._entries.pop(prompt_key, None)
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(prompt_key)
+            self.hits += 1
+            self.saved_latency_seconds += entry["latency_seconds"]
+        logger.info("Answer cache hit for prompt: %s", prompt_key)
+        return entry["answer"]
+
+    def put(self, prompt_key, answer, versions, latency_seconds):
+        """
+        Store an answer.
+
+        Args:
+            prompt_key (str): The normalized prompt.
+            answer (dict): The ``{"role", "message_text"}`` answer.
+            versions (dict): Data version of every symbol the answer used.
+            latency_seconds (float): How long producing the answer took.
+        """
+        with self._lock:
+            self._entries[prompt_key] = {
+                "answer": answer,
+                "versions": versions,
+                "latency_seconds": latency_seconds,
+                "expires_at": time.monotonic() + self.ttl_seconds,
+            }
+            self._entries.move_to_end(prompt_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record_bypass(self):
+        with self._lock:
+            self.bypasses += 1
+
+    def stats(self):
+        """
+        Return hit-rate and saved-latency metrics.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypasses": self.bypasses,
+                "hitRate": self.hits / lookups if lookups else 0.0,
+                "savedLatencySeconds": round(self.saved_latency_seconds, 3),
+            }
+
+
+@lru_cache
+def get_answer_cache():
+    """
+    Return the process-wide answer cache, sized from the settings on first use.
+    """
+    settings = get_settings()
+    return AnswerCache(
+        max_entries=settings.answer_cache_max_entries,
+        ttl_seconds=settings.answer_cache_ttl_seconds,
+    )
@@ -0,0 +1,254 @@
+import json
+import os
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timezone
+import numpy as np
+from app.core.config import get_settings
+from app.core.data_version import fetch_data_version, read_adjustment_factors
+from app.core.logger import logging
+
+logger = logging.getLogger(__name__)
+
+# Row order of the (len(FIELDS), n_bars) float64 array stored per symbol.
+# Columns are bars in chronological order; Date is stored as epoch seconds.
+FIELDS = ("Date", "Open", "High", "Low", "Close", "Volume")
+DATE, OPEN, HIGH, LOW, CLOSE, VOLUME = range(len(FIELDS))
+
+_mapped = {}
+
+
+def _paths(stock_symbol):
+    if not stock_symbol or os.path.basename(stock_symbol) != stock_symbol:
+        raise ValueError(f"Invalid stock symbol: {stock_symbol!r}")
+    directory = get_settings().bar_store_dir
+    return (
+        os.path.join(directory, f"{stock_symbol}.npy"),
+        os.path.join(directory, f"{stock_symbol}.json"),
+    )
+
+
+def to_timestamp(value):
+    """
+    Convert a bar date (datetime or ISO string, naive meaning UTC) to epoch seconds.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def records_to_bars(stock_data):
+    """
+    Convert bar dicts, in any order, to a chronological ``(len(FIELDS), n)``
+    float64 array.
+    """
+    ordered = sorted(stock_data, key=lambda bar: to_timestamp(bar["Date"]))
+    rows = [
+        [to_timestamp(bar["Date"])] + [bar.get(field) for field in FIELDS[1:]]
+        for bar in ordered
+    ]
+    # Missing values (None) become NaN
+    return np.ascontiguousarray(
+        np.array(rows, dtype=np.float64).reshape(-1, len(FIELDS)).T
+    )
+
+
+def write_bars(stock_symbol, stock_data, version, adjustments=None):
+    """
+    Write a symbol's bars to the on-disk bar store.
+
+    The array is written to a temporary file and atomically renamed, so a
+    worker that has the previous file mapped keeps a consistent view of it.
+
+    Args:
+        stock_symbol (str): The stock symbol.
+        stock_data (list): The bars as stored in MongoDB, in any order.
+        version (str): The data version the bars correspond to.
+        adjustments (dict, optional): The symbol's price-adjustment factors,
+            stored in the stamp so workers can adjust prices without MongoDB.
+    """
+    array_path, stamp_path = _paths(stock_symbol)
+    os.makedirs(os.path.dirname(array_path), exist_ok=True)
+
+    bars = records_to_bars(stock_data)
+    temporary_path = f"{array_path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        np.save(file, bars)
+    os.replace(temporary_path, array_path)
+    with open(f"{stamp_path}.{os.getpid()}.tmp", "w", encoding="utf-8") as file:
+        stamp = {"version": version, "bars": len(stock_data)}
+        if adjustments:
+            stamp["adjustments"] = {
+                key: adjustments[key] for key in ("revision", "dates", "price", "volume")
+            }
+        json.dump(stamp, file)
+    os.replace(f"{stamp_path}.{os.getpid()}.tmp", stamp_path)
+    logger.info("Wrote %d bar(s) for %s at version %s", len(stock_data), stock_symbol, version)
+
+
+def _read_stamp(stock_symbol):
+    try:
+        _, stamp_path = _paths(stock_symbol)
+        with open(stamp_path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def read_version(stock_symbol):
+    """
+    Return the data version stamped on a symbol's stored bars, or None.
+    """
+    return _read_stamp(stock_symbol).get("version")
+
+
+def read_adjustments(stock_symbol):
+    """
+    Return the price-adjustment factors stamped on a symbol's stored bars, or
+    None if it has none.
+    """
+    return _read_stamp(stock_symbol).get("adjustments")
+
+
+def load_bars(stock_symbol, version=None):
+    """
+    Memory-map a symbol's stored bars.
+
+    Every worker process maps the same file read-only, so the bars live once
+    in the OS page cache no matter how many workers serve requests.
+
+    Args:
+        stock_symbol (str): The stock symbol.
+        version (str, optional): Only return the bars if they were stored for
+            this data version.
+
+    Returns:
+        numpy.ndarray: A read-only ``(len(FIELDS), n_bars)`` view, or None when
+        the symbol is not stored (or stored for another version).
+    """
+    try:
+        array_path, _ = _paths(stock_symbol)
+        modified = os.stat(array_path).st_mtime_ns
+    except (OSError, ValueError):
+        return None
+    if version is not None and read_version(stock_symbol) != version:
+        return None
+
+    cached = _mapped.get(stock_symbol)
+    if cached is None or cached[0] != modified:
+        cached = (modified, np.load(array_path, mmap_mode="r"))
+        _mapped[stock_symbol] = cached
+    return cached[1]
+
+
+class Bar(Mapping):
+    """
+    Read-only view of one stored bar, used like the MongoDB bar dicts.
+    """
+
+    __slots__ = ("_bars", "_column")
+
+    def __init__(self, bars, column):
+        self._bars = bars
+        self._column = column
+
+    def __getitem__(self, field):
+        try:
+            row = FIELDS.index(field)
+        except ValueError:
+            raise KeyError(field) from None
+        value = float(self._bars[row, self._column])
+        return datetime.fromtimestamp(value, timezone.utc) if row == DATE else value
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+
+class BarRecords(Sequence):
+    """
+    Newest-first sequence of bars backed by a stored bar array.
+
+    The calculators index, slice and iterate bars like a list of dicts. This
+    view serves those reads straight from the memory-mapped array: slicing
+    returns another view and values are only read when a field is accessed,
+    so no copy of the history is made per request.
+    """
+
+    __slots__ = ("_bars",)
+
+    def __init__(self, bars):
+        # Reversing the columns of a (memory-mapped) array is a view, not a copy
+        self._bars = bars[:, ::-1]
+
+    def __len__(self):
+        return self._bars.shape[1]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            view = BarRecords.__new__(BarRecords)
+            view._bars = self._bars[:, index]
+            return view
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("bar index out of range")
+        return Bar(self._bars, index)
+
+    def __iter__(self):
+        return (Bar(self._bars, index) for index in range(len(self)))
+
+    def column(self, field):
+        """
+        Return one field of every bar, newest first, as a read-only array view.
+        """
+        return self._bars[FIELDS.index(field)]
+
+    def to_bars(self):
+        """
+        Return the bars as a chronological ``(len(FIELDS), n)`` array view.
+        """
+        return self._bars[:, ::-1]
+
+
+def bars_to_records(bars, limit=None):
+    """
+    Wrap stored bars in the newest-first sequence the calculators use.
+
+    Args:
+        bars (numpy.ndarray): Bars returned by ``load_bars``.
+        limit (int, optional): Only expose the newest ``limit`` bars.
+
+    Returns:
+        BarRecords: A zero-copy view of the bars.
+    """
+    start = 0 if not limit else max(bars.shape[1] - limit, 0)
+    return BarRecords(bars[:, start:])
+
+
+def prime_bar_store(db, symbols):
+    """
+    Write the current bars of every symbol to the bar store.
+
+    Used before starting workers so that each of them maps the same files
+    instead of loading its own copy of the history from MongoDB.
+
+    Returns:
+        int: The number of symbols written.
+    """
+    written = 0
+    for stock_symbol in symbols:
+        stock_data = list(db[stock_symbol].find({}, {"_id": 0}).sort("Date", -1))
+        if not stock_data:
+            continue
+        write_bars(
+            stock_symbol,
+            stock_data,
+            fetch_data_version(db, stock_symbol),
+            read_adjustment_factors(db, stock_symbol),
+        )
+        written += 1
+    return written
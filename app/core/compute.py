@@ -0,0 +1,286 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from multiprocessing import shared_memory
+import numpy as np
+from app.core.config import get_settings
+from app.core.logger import logging
+
+logger = logging.getLogger(__name__)
+
+# Recent run times kept for the latency metrics
+DURATION_SAMPLES = 1000
+
+
+class ComputeOverloadedError(RuntimeError):
+    """
+    Raised when the compute pool already has its maximum of pending calls.
+    """
+
+
+class SharedArray:
+    """
+    Picklable handle of a NumPy array placed in shared memory.
+
+    Only the block name, shape and dtype cross the process boundary; the
+    worker maps the same pages instead of unpickling a copy of the array.
+    """
+
+    __slots__ = ("name", "shape", "dtype")
+
+    def __init__(self, name, shape, dtype):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+    def __getstate__(self):
+        return self.name, self.shape, self.dtype
+
+    def __setstate__(self, state):
+        self.name, self.shape, self.dtype = state
+
+
+def _share(array, blocks):
+    # Copy an array into a new shared memory block owned by the caller
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    blocks.append(block)
+    np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+    return SharedArray(block.name, array.shape, array.dtype.str)
+
+
+def _attach(handle, blocks):
+    # Workers share the parent's resource tracker, so attaching registers the
+    # block again under the same name and the parent's unlink clears it
+    block = shared_memory.SharedMemory(name=handle.name)
+    blocks.append(block)
+    array = np.ndarray(handle.shape, np.dtype(handle.dtype), buffer=block.buf)
+    array.setflags(write=False)
+    return array
+
+
+def _warm_worker():
+    # Import NumPy, the data layer and every calculator once per worker, so
+    # the first call routed to it does not pay for the imports. Workers are
+    # handed their bars, so a MongoDB client they open by accident is kept
+    # to a single connection.
+    from app.core.database import limit_pool_size
+    from app.tools.registry import all_tools
+
+    limit_pool_size(1)
+    all_tools()
+
+
+def _ready():
+    return os.getpid()
+
+
+def _call(fn, args, kwargs):
+    # Runs in a worker: map the shared arrays, then call the function
+    blocks = []
+    try:
+        args = [_attach(arg, blocks) if isinstance(arg, SharedArray) else arg for arg in args]
+        kwargs = {
+            key: _attach(value, blocks) if isinstance(value, SharedArray) else value
+            for key, value in kwargs.items()
+        }
+        return fn(*args, **kwargs)
+    finally:
+        del args, kwargs
+        for block in blocks:
+            try:
+                block.close()
+            except BufferError:
+                pass  # The result still references the block; it is closed when collected
+
+
+class ComputeExecutor:
+    """
+    Runs CPU-heavy calculations on a pool of pre-warmed worker processes.
+
+    Pure Python calculations hold the GIL, so running them on the event loop
+    (or its thread pool) stalls every other request of the worker. Here they
+    run in separate processes: NumPy array arguments are copied once into
+    shared memory and mapped by the worker, everything else is pickled. At
+    most ``max_queue`` calls may be pending (queued or running); further
+    calls fail fast with ``ComputeOverloadedError`` instead of piling up, and
+    callers stop waiting after ``timeout`` seconds.
+    """
+
+    def __init__(self, max_workers, max_queue, timeout):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._pool = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._durations = deque(maxlen=DURATION_SAMPLES)
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def start(self):
+        """
+        Start the worker processes and wait until each has imported the calculators.
+        """
+        with self._lock:
+            if self._pool is not None:
+                return
+            # Spawned, not forked: the API process runs threads (and clients)
+            # that must not be copied into the workers
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+            )
+            # Every submission starts one more worker until the pool is full
+            warmups = [self._pool.submit(_ready) for _ in range(self.max_workers)]
+        started = time.perf_counter()
+        workers = {warmup.result() for warmup in warmups}
+        logger.info(
+            "Started %d compute worker(s) in %.2fs", len(workers), time.perf_counter() - started
+        )
+
+    def shutdown(self):
+        """
+        Stop the worker processes, cancelling calls that have not started.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    async def run(self, fn, *args, timeout=None, **kwargs):
+        """
+        Run ``fn(*args, **kwargs)`` on a worker process.
+
+        Args:
+            fn (callable): A module-level (picklable) function.
+            *args, **kwargs: Its arguments. NumPy arrays are passed through
+                shared memory and arrive as read-only arrays.
+            timeout (float, optional): Seconds to wait for the result.
+                Defaults to the executor's timeout.
+
+        Returns:
+            The result of ``fn``.
+
+        Raises:
+            ComputeOverloadedError: If ``max_queue`` calls are already pending.
+            TimeoutError: If the result is not ready in time.
+        """
+        if self._pool is None:
+            await asyncio.to_thread(self.start)
+        with self._lock:
+            if self._pending >= self.max_queue:
+                self.rejected += 1
+                raise ComputeOverloadedError(
+                    f"The compute pool is busy ({self._pending} calls pending), try again shortly"
+                )
+            self._pending += 1
+            self.submitted += 1
+
+        blocks = []
+        started = time.perf_counter()
+        try:
+            args = [_share(arg, blocks) if isinstance(arg, np.ndarray) else arg for arg in args]
+            kwargs = {
+                key: _share(value, blocks) if isinstance(value, np.ndarray) else value
+                for key, value in kwargs.items()
+            }
+            future = self._pool.submit(_call, fn, args, kwargs)
+        except BaseException:
+            self._finished(blocks, started, None)
+            raise
+        future.add_done_callback(partial(self._finished, blocks, started))
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            # A call that already started keeps its worker until it returns
+            future.cancel()
+            self.timeouts += 1
+            raise TimeoutError(
+                f"{getattr(fn, '__name__', fn)} did not finish within {timeout or self.timeout}s"
+            ) from None
+
+    def _finished(self, blocks, started, future):
+        # Called from the pool's thread once the worker is done with the arrays
+        for block in blocks:
+            block.close()
+            block.unlink()
+        with self._lock:
+            self._pending -= 1
+            if future is None or future.cancelled():
+                return
+            if future.exception() is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+            self._durations.append(time.perf_counter() - started)
+
+    def stats(self):
+        """
+        Return pool size, queue depth, outcome counts and call durations.
+        """
+        with self._lock:
+            durations = sorted(self._durations)
+            pending = self._pending
+
+        def percentile(fraction):
+            return (
+                round(durations[min(len(durations) - 1, int(fraction * len(durations)))], 4)
+                if durations
+                else 0.0
+            )
+
+        return {
+            "workers": self.max_workers,
+            "started": self._pool is not None,
+            "pending": pending,
+            "maxQueue": self.max_queue,
+            "timeoutSeconds": self.timeout,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "durationSeconds": {
+                "samples": len(durations),
+                "average": round(sum(durations) / len(durations), 4) if durations else 0.0,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": round(durations[-1], 4) if durations else 0.0,
+            },
+        }
+
+
+@lru_cache
+def get_compute_executor():
+    """
+    Return the process-wide compute executor, sized from the settings on first use.
+
+    By default the CPUs are split evenly between the API workers.
+    """
+    settings = get_settings()
+    workers = settings.compute_workers or (os.cpu_count() or 1) // max(
+        1, settings.web_concurrency
+    )
+    return ComputeExecutor(
+        max_workers=max(1, workers),
+        max_queue=settings.compute_max_queue,
+        timeout=settings.compute_timeout_seconds,
+    )
+
+
+def close_compute_executor():
+    """
+    Stop the compute workers if they were started.
+    """
+    if get_compute_executor.cache_info().currsize:
+        get_compute_executor().shutdown()
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -7,9 +8,48 @@ class Settings(BaseSettings):
     mongo_db_uri: str
     db_name: str
 
+    # Whole-answer cache for repeated chat prompts
+    answer_cache_max_entries: int = 1024
+    answer_cache_ttl_seconds: int = 900
+
+    # Multi-worker deployment (see serve.py)
+    web_concurrency: int = 1
+    mongo_max_connections: int = 100
+    bar_store_dir: str = "var/bars"
+
+    # OpenAI rate limits of the whole deployment (see app/core/llm_scheduler.py)
+    openai_requests_per_minute: int = 500
+    openai_tokens_per_minute: int = 200000
+    openai_max_concurrency: int = 32
+    openai_max_retries: int = 4
+
+    # Process pool for CPU-heavy calculations (see app/core/compute.py);
+    # 0 workers splits the CPUs evenly between the API workers
+    compute_workers: int = 0
+    compute_max_queue: int = 64
+    compute_timeout_seconds: float = 30.0
+
+    # Seconds between rounds of the alert webhook dispatcher (see
+    # app/utils/alerts.py); 0 disables it, e.g. when a separate process sends
+    alert_dispatch_interval_seconds: float = 10.0
+
     # Configuration for loading environment variables
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
 
-# Create an instance of the Settings class
-settings = Settings()
+@lru_cache
+def get_settings():
+    """
+    Return the application settings, loading them on first use.
+
+    Settings are not read at import time, so modules that never touch them
+    (e.g. the indicator calculators) can be imported without credentials.
+    """
+    return Settings()
+
+
+def __getattr__(name):
+    # Backwards compatible, lazily evaluated `from app.core.config import settings`
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
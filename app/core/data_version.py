@@ -0,0 +1,175 @@
+import time
+from pymongo import ReturnDocument
+from app.core.database import get_database
+from app.core.logger import logging
+
+logger = logging.getLogger(__name__)
+
+# How long a symbol's latest bar date is trusted before Mongo is asked again.
+# New daily bars land once a day, so a short TTL keeps caches fresh without a
+# database round trip on every request.
+VERSION_TTL_SECONDS = 60
+
+# One document per symbol with the price-adjustment factors derived from its
+# corporate actions (see app.utils.price_adjustment)
+ADJUSTMENT_FACTORS_COLLECTION = "adjustment_factors"
+# One document per symbol counting the ingestions that rewrote stored bars
+BAR_REVISIONS_COLLECTION = "bar_revisions"
+
+_versions = {}
+
+
+def format_data_version(latest_date, revision=0, bar_revision=0):
+    """
+    Build a data version from the date of the latest bar, the revision of the
+    symbol's stored bars (0 before any bar was corrected) and the revision of
+    its price adjustments (0 before any corporate action).
+    """
+    version = str(latest_date)
+    if bar_revision:
+        version += f"#rev{bar_revision}"
+    if revision:
+        version += f"#adj{revision}"
+    return version
+
+
+def adjustment_revision(version):
+    """
+    Return the price-adjustment revision encoded in a data version.
+    """
+    _, _, revision = (version or "").partition("#adj")
+    return int(revision) if revision else 0
+
+
+def bar_revision(version):
+    """
+    Return the stored-bar revision encoded in a data version.
+    """
+    _, _, revision = (version or "").partition("#rev")
+    revision, _, _ = revision.partition("#")
+    return int(revision) if revision else 0
+
+
+def latest_bar_date(db, stock_symbol):
+    """
+    Return the date of a symbol's latest stored bar, or None.
+    """
+    latest = (
+        db[stock_symbol]
+        .find({}, {"_id": 0, "Date": 1})
+        .sort("Date", -1)
+        .limit(1)
+        .to_list(length=1)
+    )
+    return latest[0]["Date"] if latest else None
+
+
+def bump_bar_revision(db, stock_symbol):
+    """
+    Record that stored bars of a symbol were rewritten (e.g. a corrected
+    historical or same-day bar), so that its data version changes even though
+    its latest date does not.
+
+    Returns:
+        int: The new revision.
+    """
+    revision = db[BAR_REVISIONS_COLLECTION].find_one_and_update(
+        {"symbol": stock_symbol},
+        {"$inc": {"revision": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return revision["revision"]
+
+
+def read_adjustment_factors(db, stock_symbol):
+    """
+    Return the stored adjustment factors of a symbol, or None if it has no
+    corporate actions.
+    """
+    return db[ADJUSTMENT_FACTORS_COLLECTION].find_one({"symbol": stock_symbol}, {"_id": 0})
+
+
+def fetch_data_version(db, stock_symbol):
+    """
+    Read a symbol's data version from MongoDB, bypassing the cache.
+
+    Returns:
+        str: The data version, or None if there is no data.
+    """
+    if db is None:
+        db = get_database()
+    latest = latest_bar_date(db, stock_symbol)
+    if latest is None:
+        return None
+    factors = db[ADJUSTMENT_FACTORS_COLLECTION].find_one(
+        {"symbol": stock_symbol}, {"_id": 0, "revision": 1}
+    )
+    rewrites = db[BAR_REVISIONS_COLLECTION].find_one(
+        {"symbol": stock_symbol}, {"_id": 0, "revision": 1}
+    )
+    return format_data_version(
+        latest,
+        factors["revision"] if factors else 0,
+        rewrites["revision"] if rewrites else 0,
+    )
+
+
+def _read_stamped_version(stock_symbol):
+    # Imported lazily: the bar store pulls in NumPy
+    from app.core.bar_store import read_version
+
+    return read_version(stock_symbol)
+
+
+def get_data_version(db, stock_symbol):
+    """
+    Return the data version of a symbol: the date of its latest stored bar,
+    followed by the revision of its stored bars once one was corrected and
+    the revision of its price adjustments once corporate actions were
+    ingested (e.g. ``2024-06-28 00:00:00#rev1#adj2``).
+
+    Derived results (cached answers, materialized indicators, ...) are tagged
+    with this version and become stale as soon as a newer or corrected bar or
+    a corporate action of the symbol is stored.
+
+    Args:
+        db (Database): The MongoDB database instance, or None to connect only
+            when the version is not known yet.
+        stock_symbol (str): The stock symbol, which is also its collection name.
+
+    Returns:
+        str: The data version, or None if there is no data.
+    """
+    cached = _versions.get(stock_symbol)
+    if cached and time.monotonic() - cached[1] < VERSION_TTL_SECONDS:
+        return cached[0]
+    if cached is None:
+        # A fresh worker trusts the version stamped on the bar store for one
+        # TTL, so it can serve indicators before touching MongoDB.
+        version = _read_stamped_version(stock_symbol)
+        if version is not None:
+            _versions[stock_symbol] = (version, time.monotonic())
+            return version
+
+    version = fetch_data_version(db, stock_symbol)
+    _versions[stock_symbol] = (version, time.monotonic())
+    logger.debug("Data version for %s: %s", stock_symbol, version)
+    return version
+
+
+def set_data_version(stock_symbol, version):
+    """
+    Record a symbol's data version, e.g. right after new bars were ingested.
+    """
+    _versions[stock_symbol] = (version, time.monotonic())
+
+
+def invalidate_data_version(stock_symbol=None):
+    """
+    Forget the cached data version of one symbol, or of every symbol.
+    """
+    if stock_symbol is None:
+        _versions.clear()
+    else:
+        _versions.pop(stock_symbol, None)
@@ -1,30 +1,129 @@
 from pymongo import MongoClient, errors
-from app.core.config import settings
+from app.core.config import get_settings
 from app.core.logger import logging
+import os
+import threading
 import time
 
 logger = logging.getLogger(__name__)
 
+_client = None
+_client_lock = threading.Lock()
+_max_pool_size = None
 
-def get_database():
+
+def _pool_size(settings):
+    # Each worker process owns its own client, so the deployment-wide
+    # connection budget is split evenly between the workers.
+    size = max(1, settings.mongo_max_connections // max(1, settings.web_concurrency))
+    return min(size, _max_pool_size) if _max_pool_size else size
+
+
+def limit_pool_size(size):
     """
-    Connect to the MongoDB database.
+    Cap the connection pool of this process's MongoDB client.
 
-    Returns:
-        Database: The connected MongoDB database instance.
+    Compute workers receive their data from the API process and should not
+    need MongoDB; should one connect anyway, it does not take a share of the
+    connection budget meant for an API worker.
+
+    Args:
+        size (int): Maximum number of connections of the client.
     """
+    global _max_pool_size
+    _max_pool_size = size
+
+
+def _connect():
+    settings = get_settings()
     retries = 3
     delay = 2
     for attempt in range(retries):
         try:
-            client = MongoClient(settings.mongo_db_uri, serverSelectionTimeoutMS=5000)
+            client = MongoClient(
+                settings.mongo_db_uri,
+                serverSelectionTimeoutMS=5000,
+                maxPoolSize=_pool_size(settings),
+            )
             client.admin.command("ping")
-            db = client[settings.db_name]
             logger.info("Connected to MongoDB successfully.")
-            return db
+            return client
         except (errors.ConnectionFailure, errors.ServerSelectionTimeoutError) as e:
-            logger.error(f"Attempt {attempt + 1} - Failed to connect to MongoDB: {e}")
+            logger.error("Attempt %d - Failed to connect to MongoDB: %s", attempt + 1, e)
             if attempt < retries - 1:
                 time.sleep(delay)
             else:
                 raise Exception("Failed to connect to MongoDB after multiple attempts.")
+
+
+def get_mongo_client():
+    """
+    Return the process-wide MongoDB client, connecting on first use.
+
+    The client owns a connection pool, so it is created once and shared
+    instead of reconnecting (and pinging) on every call.
+
+    Returns:
+        MongoClient: The connected MongoDB client.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _connect()
+    return _client
+
+
+def close_mongo_client():
+    """
+    Close the process-wide MongoDB client if it was created.
+    """
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def _forget_client_after_fork():
+    # MongoClient is not fork-safe; a child process must open its own client
+    global _client
+    _client = None
+    _ensured_indexes.clear()
+
+
+os.register_at_fork(after_in_child=_forget_client_after_fork)
+
+
+def get_database():
+    """
+    Connect to the MongoDB database.
+
+    Returns:
+        Database: The connected MongoDB database instance.
+    """
+    return get_mongo_client()[get_settings().db_name]
+
+
+_ensured_indexes = set()
+
+
+def ensure_index(db, collection_name, keys, **kwargs):
+    """
+    Create an index once per process.
+
+    Index creation is idempotent on the server, but it still costs a round trip,
+    so the first successful call for a given collection/key spec is remembered.
+
+    Args:
+        db (Database): The MongoDB database instance.
+        collection_name (str): The collection to index.
+        keys: A key name or a list of (key, direction) pairs.
+        **kwargs: Extra options forwarded to ``create_index`` (e.g. ``unique``).
+    """
+    marker = (collection_name, repr(keys), tuple(sorted(kwargs.items())))
+    if marker in _ensured_indexes:
+        return
+    db[collection_name].create_index(keys, **kwargs)
+    _ensured_indexes.add(marker)
+    logger.info("Ensured index on %s: %s", collection_name, keys)
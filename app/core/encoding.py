@@ -0,0 +1,202 @@
+import gzip
+import json
+from datetime import datetime
+from functools import lru_cache
+from importlib import import_module
+from importlib.util import find_spec
+import orjson
+from bson import ObjectId
+from fastapi import Response
+from pydantic import BaseModel
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+# Older clients ask for MessagePack under its unregistered name
+MEDIA_TYPE_ALIASES = {"application/x-msgpack": MSGPACK}
+
+# Optional dependency of each binary encoding and content coding
+OPTIONAL_MODULES = {MSGPACK: "msgpack", ARROW: "pyarrow", "br": "brotli"}
+
+# Smaller bodies are sent uncompressed; the headers would outweigh the savings
+COMPRESSION_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+@lru_cache
+def _installed(name):
+    module = OPTIONAL_MODULES.get(name)
+    return module is None or find_spec(module) is not None
+
+
+def _preferences(header):
+    # Parse an Accept or Accept-Encoding header into (value, q) pairs,
+    # highest q first; ties keep the order of the header. Values with q=0
+    # are kept, as they refuse what a wildcard would otherwise accept.
+    preferences = []
+    for index, part in enumerate((header or "").split(",")):
+        value, *params = [item.strip() for item in part.split(";")]
+        if not value:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, number = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        preferences.append((-q, index, value.lower()))
+    return [(value, -q) for q, _, value in sorted(preferences)]
+
+
+def negotiate_media_type(accept, offered):
+    """
+    Pick the media type of a response from the request's Accept header.
+
+    Args:
+        accept (str): The Accept header, if any.
+        offered (list): Media types the endpoint can produce, preferred first.
+
+    Returns:
+        str: The most preferred offered type whose encoder is installed, or
+        JSON when the client accepts nothing else on offer.
+    """
+    preferences = [
+        (MEDIA_TYPE_ALIASES.get(value, value), q) for value, q in _preferences(accept)
+    ]
+    refused = {value for value, q in preferences if q <= 0}
+    available = [
+        media_type
+        for media_type in offered
+        if _installed(media_type) and media_type not in refused
+    ]
+    for value, q in preferences:
+        if q <= 0 or not available:
+            break
+        if value in ("*/*", "application/*"):
+            return available[0]
+        if value in available:
+            return value
+    return JSON
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Pick ``br`` or ``gzip`` from the Accept-Encoding header, or None.
+    """
+    accepted = dict(_preferences(accept_encoding))
+    for coding in ("br", "gzip"):
+        if accepted.get(coding, accepted.get("*", 0)) > 0 and _installed(coding):
+            return coding
+    return None
+
+
+def _default(value):
+    # Values orjson and MessagePack do not serialize natively
+    if isinstance(value, BaseModel):
+        return value.model_dump(by_alias=True)  # Typed results of the data layer
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    if hasattr(value, "tolist"):
+        return value.tolist()  # NumPy scalars and arrays
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def dumps_json(value):
+    """
+    Serialize a tool output (or any result) to a JSON string with orjson.
+
+    Result models, datetimes, ObjectIds and NumPy values are converted as
+    they are reached, so the output is never copied beforehand.
+    """
+    return orjson.dumps(
+        value,
+        default=_default,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+    ).decode()
+
+
+def _arrow(content, table, table_field):
+    pyarrow = import_module("pyarrow")
+    columns = pyarrow.table(table)
+    # Everything but the tabular field travels as JSON in the schema metadata
+    metadata = {
+        key: json.dumps(value, default=_default)
+        for key, value in content.items()
+        if key != table_field
+    }
+    columns = columns.replace_schema_metadata(metadata)
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, columns.schema) as writer:
+        writer.write_table(columns)
+    return sink.getvalue().to_pybytes()
+
+
+def encode(content, media_type, table=None, table_field=None):
+    """
+    Serialize a response body.
+
+    Args:
+        content (dict): The response, as returned by ``model_dump``.
+        media_type (str): ``JSON``, ``MSGPACK`` or ``ARROW``.
+        table (dict, optional): Equal-length columns sent as the Arrow
+            record batch in place of ``content[table_field]``; the other
+            fields go in its schema metadata.
+        table_field (str, optional): The field of ``content`` that ``table``
+            holds.
+
+    Returns:
+        bytes: The encoded body.
+    """
+    if media_type == MSGPACK:
+        return import_module("msgpack").packb(content, default=_default)
+    if media_type == ARROW:
+        return _arrow(content, table, table_field)
+    return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def compress(body, coding):
+    """
+    Compress a body with ``br`` or ``gzip`` (None leaves it as is).
+    """
+    if coding == "br":
+        return import_module("brotli").compress(body, quality=BROTLI_QUALITY)
+    if coding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+    return body
+
+
+def negotiated_response(request, content, headers=None, table=None, table_field=None):
+    """
+    Build a response in the media type and content coding the client prefers.
+
+    JSON (serialized with orjson) is the default. Clients may ask for
+    MessagePack, or for Arrow IPC when the endpoint passes a ``table``, with
+    the Accept header, and for brotli or gzip compression with
+    Accept-Encoding. Encodings whose library is not installed are not offered.
+
+    Args:
+        request (Request): The incoming request.
+        content (dict): The response body.
+        headers (dict, optional): Extra response headers (e.g. ETag).
+        table (dict, optional): Columns to send as an Arrow record batch.
+        table_field (str, optional): The field of ``content`` the columns
+            come from, left out of the Arrow metadata.
+
+    Returns:
+        Response: The encoded, possibly compressed, response.
+    """
+    offered = [JSON, MSGPACK] + ([ARROW] if table is not None else [])
+    media_type = negotiate_media_type(request.headers.get("accept"), offered)
+    body = encode(content, media_type, table, table_field)
+    headers = {**(headers or {}), "Vary": "Accept, Accept-Encoding"}
+    if len(body) >= COMPRESSION_MIN_BYTES:
+        coding = negotiate_encoding(request.headers.get("accept-encoding"))
+        if coding:
+            body = compress(body, coding)
+            headers["Content-Encoding"] = coding
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -0,0 +1,282 @@
+import asyncio
+import random
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
+from app.core.config import get_settings
+from app.core.logger import logging
+
+logger = logging.getLogger(__name__)
+
+# Interactive (streaming) calls are always dispatched before standard ones
+INTERACTIVE = "interactive"
+STANDARD = "standard"
+LANES = (INTERACTIVE, STANDARD)
+
+# Rough prompt size estimate used until the response reports its usage
+CHARS_PER_TOKEN = 4
+COMPLETION_TOKEN_RESERVE = 512
+
+# Recent queue waits kept for the wait-time percentiles
+WAIT_SAMPLES = 1000
+
+
+def estimate_tokens(*texts, completion_tokens=COMPLETION_TOKEN_RESERVE):
+    """
+    Estimate the tokens of a call from the size of its inputs.
+    """
+    return sum(len(str(text)) for text in texts) // CHARS_PER_TOKEN + completion_tokens
+
+
+def _is_rate_limited(error):
+    # openai.RateLimitError, without importing openai here
+    return getattr(error, "status_code", None) == 429
+
+
+def _retry_after(error):
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class TokenBucket:
+    """
+    A token bucket refilled continuously at ``per_minute`` tokens per minute,
+    holding at most one minute of tokens.
+    """
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount):
+        """
+        Return how many seconds until ``amount`` tokens are available.
+
+        Amounts above the capacity only wait for a full bucket.
+        """
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount):
+        """
+        Take tokens; a negative amount returns them. The level may go below
+        zero when a call used more tokens than estimated.
+        """
+        self._refill()
+        self.level = min(self.capacity, self.level - amount)
+
+
+class _Request:
+    __slots__ = ("future", "tokens", "enqueued_at")
+
+    def __init__(self, future, tokens):
+        self.future = future
+        self.tokens = tokens
+        self.enqueued_at = time.monotonic()
+
+
+class LLMScheduler:
+    """
+    Admission control for OpenAI calls made by this process.
+
+    Calls wait in one queue per session and lane. Sessions are served round
+    robin, so a burst from one session cannot starve the others, and the
+    interactive lane is always served first. A call starts once a
+    concurrency slot is free and both the request and the token bucket
+    allow it. Calls rejected with HTTP 429 are retried with jittered
+    exponential backoff, queueing again behind waiting calls.
+
+    All bookkeeping happens on the event loop; the blocking OpenAI calls run
+    in worker threads.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute,
+        tokens_per_minute,
+        max_concurrency,
+        max_retries=4,
+        backoff_seconds=1.0,
+        max_backoff_seconds=30.0,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._lanes = {lane: OrderedDict() for lane in LANES}
+        self._in_flight = 0
+        self._timer = None
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+
+    async def run(
+        self, call, *args, session_id=None, interactive=False, estimated_tokens=0, **kwargs
+    ):
+        """
+        Run a blocking OpenAI call once the scheduler admits it.
+
+        Args:
+            call (callable): The client method, e.g. ``client.responses.create``.
+            *args, **kwargs: Passed to ``call``.
+            session_id (str, optional): The session the call is made for; calls
+                of different sessions are interleaved fairly.
+            interactive (bool): Use the priority lane (streaming replies).
+            estimated_tokens (int): Tokens the call is expected to use; corrected
+                with the reported usage when the response has one.
+
+        Returns:
+            The result of ``call``.
+        """
+        lane = INTERACTIVE if interactive else STANDARD
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(lane, session_id, estimated_tokens)
+            try:
+                result = await asyncio.to_thread(call, *args, **kwargs)
+            except Exception as e:
+                if not _is_rate_limited(e) or attempt == self.max_retries:
+                    self.failed += 1
+                    raise
+                delay = max(
+                    random.uniform(
+                        0, min(self.max_backoff_seconds, self.backoff_seconds * 2**attempt)
+                    ),
+                    _retry_after(e),
+                )
+            else:
+                usage = getattr(getattr(result, "usage", None), "total_tokens", None)
+                if usage is not None:
+                    self.tokens.take(usage - estimated_tokens)
+                self.completed += 1
+                return result
+            finally:
+                self._release()
+
+            self.retries += 1
+            logger.warning(
+                "OpenAI rate limit hit (attempt %d), retrying in %.2fs", attempt + 1, delay
+            )
+            await asyncio.sleep(delay)
+
+    async def _acquire(self, lane, session_id, tokens):
+        request = _Request(asyncio.get_running_loop().create_future(), tokens)
+        self._lanes[lane].setdefault(session_id, deque()).append(request)
+        self._dispatch()
+        try:
+            await request.future
+        except asyncio.CancelledError:
+            if request.future.done() and not request.future.cancelled():
+                # Admitted just as the caller went away
+                self._release()
+            raise
+
+    def _release(self):
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _next(self):
+        # The first live request of the first session with one, per lane
+        for sessions in self._lanes.values():
+            while sessions:
+                session_id, queue = next(iter(sessions.items()))
+                while queue and queue[0].future.done():
+                    queue.popleft()  # cancelled while waiting
+                if queue:
+                    return sessions, session_id, queue
+                del sessions[session_id]
+        return None
+
+    def _dispatch(self):
+        while self._in_flight < self.max_concurrency:
+            found = self._next()
+            if found is None:
+                return
+            sessions, session_id, queue = found
+            request = queue[0]
+            wait = max(self.requests.wait_time(1), self.tokens.wait_time(request.tokens))
+            if wait > 0:
+                if self._timer is None:
+                    self._timer = asyncio.get_running_loop().call_later(wait, self._on_timer)
+                return
+
+            queue.popleft()
+            if queue:
+                sessions.move_to_end(session_id)  # round robin between sessions
+            else:
+                del sessions[session_id]
+            self.requests.take(1)
+            self.tokens.take(request.tokens)
+            self._in_flight += 1
+            self._waits.append(time.monotonic() - request.enqueued_at)
+            request.future.set_result(None)
+
+    def _on_timer(self):
+        self._timer = None
+        self._dispatch()
+
+    def stats(self):
+        """
+        Return queue depth, wait-time and throughput metrics.
+        """
+        waits = sorted(self._waits)
+
+        def percentile(fraction):
+            return round(waits[min(len(waits) - 1, int(fraction * len(waits)))], 4) if waits else 0.0
+
+        return {
+            "queueDepth": {
+                lane: sum(
+                    sum(not request.future.done() for request in queue)
+                    for queue in sessions.values()
+                )
+                for lane, sessions in self._lanes.items()
+            },
+            "waitingSessions": len(
+                {session_id for sessions in self._lanes.values() for session_id in sessions}
+            ),
+            "inFlight": self._in_flight,
+            "maxConcurrency": self.max_concurrency,
+            "completed": self.completed,
+            "failed": self.failed,
+            "retries": self.retries,
+            "waitSeconds": {
+                "samples": len(waits),
+                "average": round(sum(waits) / len(waits), 4) if waits else 0.0,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": round(waits[-1], 4) if waits else 0.0,
+            },
+            "requestsAvailable": round(self.requests.level, 1),
+            "tokensAvailable": round(self.tokens.level, 1),
+        }
+
+
+@lru_cache
+def get_llm_scheduler():
+    """
+    Return the process-wide LLM scheduler, sized from the settings on first use.
+
+    The rate limits are per deployment, so each worker gets an equal share.
+    """
+    settings = get_settings()
+    workers = max(1, settings.web_concurrency)
+    return LLMScheduler(
+        requests_per_minute=max(1, settings.openai_requests_per_minute // workers),
+        tokens_per_minute=max(1, settings.openai_tokens_per_minute // workers),
+        max_concurrency=max(1, settings.openai_max_concurrency // workers),
+        max_retries=settings.openai_max_retries,
+    )
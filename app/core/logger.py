@@ -1,21 +1,161 @@
+import atexit
+import json
 import logging
+import os
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
+# Read from the environment rather than the settings, which need credentials
+# that scripts and benchmarks importing the app do not have
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")  # "text" or "json"
+LOG_MESSAGE_LIMIT = int(os.environ.get("LOG_MESSAGE_LIMIT", 2000))
 
-def configure_logging():
-    logging.basicConfig(
-        level=logging.INFO,  # Changed from INFO to DEBUG to capture all log levels
-        format="%(asctime)s | %(name)s | %(levelname)s | %(message)s",
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            RotatingFileHandler(
-                "app.log", maxBytes=5 * 1024 * 1024, backupCount=3
-            ),  # 5MB log file
-        ],
-    )
+TEXT_FORMAT = "%(asctime)s | %(name)s | %(levelname)s | %(message)s"
+
+# Attributes every LogRecord has; anything else was passed with `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listener = None
+
+
+def _truncate(text, limit):
+    if limit and len(text) > limit:
+        return f"{text[:limit]}... ({len(text) - limit} more chars)"
+    return text
+
+
+class Truncated:
+    """
+    Log argument that is converted to text, and cut to ``limit`` characters,
+    only if the record is actually emitted.
+
+    Example:
+        logger.debug("Output of %s: %s", name, Truncated(output))
+    """
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value, limit=200):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self):
+        return _truncate(str(self.value), self.limit)
+
+    __repr__ = __str__
+
+
+class TextFormatter(logging.Formatter):
+    """
+    The ``time | logger | level | message`` format, with long messages cut.
+    """
+
+    def __init__(self, limit=LOG_MESSAGE_LIMIT):
+        super().__init__(TEXT_FORMAT)
+        self.limit = limit
+
+    def formatMessage(self, record):
+        record.message = _truncate(record.message, self.limit)
+        return super().formatMessage(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per record: time, level, logger and message, plus every
+    field passed with ``extra=`` and the formatted exception, if any.
+    """
+
+    def __init__(self, limit=LOG_MESSAGE_LIMIT):
+        super().__init__()
+        self.limit = limit
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": _truncate(record.getMessage(), self.limit),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    # QueueHandler.prepare formats the message on the logging thread so the
+    # record can be pickled. The listener runs in this process, so the record
+    # is queued as is and all formatting happens on the listener's thread
+    # (so arguments must not be mutated after they are logged).
+    def prepare(self, record):
+        return record
+
+
+def _start_listener(handlers):
+    global _listener
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return log_queue
+
+
+def _restart_after_fork():
+    # A forked child (e.g. a materializer worker) does not inherit the
+    # listener thread; give it its own queue and listener
+    if _listener is None:
+        return
+    handlers = _listener.handlers
+    log_queue = _start_listener(handlers)
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, _DeferredQueueHandler):
+            handler.queue = log_queue
+
+
+def stop_logging():
+    """
+    Write out the queued records and stop the listener thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def configure_logging(level=LOG_LEVEL, log_format=LOG_FORMAT, log_file="app.log"):
+    """
+    Log to the console and a rotating file without blocking the caller.
+
+    Loggers only put records on a queue; a listener thread formats them and
+    writes them to the handlers. Set ``LOG_FORMAT=json`` for one JSON object
+    per record, and ``LOG_LEVEL`` to change the level (INFO by default).
+    Messages longer than ``LOG_MESSAGE_LIMIT`` characters are truncated.
+    """
+    if _listener is not None:
+        return
+    formatter = JsonFormatter() if log_format == "json" else TextFormatter()
+    handlers = [
+        logging.StreamHandler(sys.stdout),
+        RotatingFileHandler(log_file, maxBytes=5 * 1024 * 1024, backupCount=3),  # 5MB log file
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_DeferredQueueHandler(_start_listener(handlers)))
+    root.setLevel(level)
 
     logging.getLogger("pymongo").setLevel(logging.WARNING)
+    atexit.register(stop_logging)
+
+
+os.register_at_fork(after_in_child=_restart_after_fork)
 
 
 # This FastAPI route:
@@ -1,14 +1,35 @@
-from openai import OpenAI
-from app.core.config import settings
+from functools import lru_cache
+from app.core.config import get_settings
 from app.core.logger import logging
 
 logger = logging.getLogger(__name__)
 
-try:
-    client = OpenAI(
-        api_key=settings.openai_api_key,
-    )
-    logger.info("OpenAI client initialized successfully.")
-except Exception as e:
-    logger.error("Failed to initialize OpenAI client: %s", e)
-    raise
+
+@lru_cache
+def get_openai_client():
+    """
+    Return the shared OpenAI client, creating it on first use.
+
+    The ``openai`` package is only imported here, so importing the routers
+    does not pay for it. Also usable as a FastAPI dependency.
+    """
+    from openai import OpenAI
+
+    try:
+        client = OpenAI(
+            api_key=get_settings().openai_api_key,
+        )
+        logger.info("OpenAI client initialized successfully.")
+        return client
+    except Exception as e:
+        logger.error("Failed to initialize OpenAI client: %s", e)
+        raise
+
+
+def close_openai_client():
+    """
+    Close the shared OpenAI client if it was created.
+    """
+    if get_openai_client.cache_info().currsize:
+        get_openai_client().close()
+        get_openai_client.cache_clear()
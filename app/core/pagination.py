@@ -0,0 +1,94 @@
+import base64
+import hashlib
+import json
+from datetime import datetime
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import DESCENDING
+
+# Index that backs the (created_at, _id) keyset used by every listing endpoint
+KEYSET_INDEX = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+
+def encode_cursor(document):
+    """
+    Encode the keyset position of a document as an opaque cursor string.
+
+    Args:
+        document (dict): The last document of a page.
+
+    Returns:
+        str: A URL-safe cursor.
+    """
+    raw = json.dumps(
+        {"c": document["created_at"].isoformat(), "i": str(document["_id"])}
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Returns:
+        tuple: The ``(created_at, _id)`` keyset position.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(raw["c"]), ObjectId(raw["i"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def fetch_page(collection, projection, limit, cursor=None):
+    """
+    Fetch one page of a collection, newest first, using keyset pagination.
+
+    Seeking past the previous page's last ``(created_at, _id)`` keeps the cost
+    of every page constant, unlike ``skip`` which rescans earlier pages.
+
+    Args:
+        collection (Collection): The collection to read.
+        projection (dict): Fields to return.
+        limit (int): Maximum number of documents in the page.
+        cursor (str, optional): Cursor returned with the previous page.
+
+    Returns:
+        tuple: The page documents and the cursor for the next page (or None).
+    """
+    query = {}
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        query = {
+            "$or": [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": last_id}},
+            ]
+        }
+
+    # Read one extra document to know whether another page exists
+    documents = list(
+        collection.find(query, projection).sort(KEYSET_INDEX).limit(limit + 1)
+    )
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        next_cursor = encode_cursor(documents[-1])
+    return documents, next_cursor
+
+
+def compute_etag(documents, fields):
+    """
+    Compute a weak ETag for a page from the listed fields of its documents.
+    """
+    digest = hashlib.sha1()
+    for document in documents:
+        digest.update(str(document["_id"]).encode())
+        for field in fields:
+            digest.update(b"\x1f")
+            digest.update(str(document.get(field)).encode())
+        digest.update(b"\x1e")
+    return f'W/"{digest.hexdigest()}"'
@@ -0,0 +1,273 @@
+import asyncio
+import base64
+import json
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError
+from app.core.database import ensure_index
+from app.core.logger import logging
+
+logger = logging.getLogger(__name__)
+
+SESSIONS_COLLECTION = "sessions"
+MESSAGES_COLLECTION = "session_messages"
+
+# Messages are stored in buckets of roughly this many entries. A bucket is
+# only appended to while it holds fewer than BUCKET_SIZE messages, so a full
+# bucket is never written again and stays well under the document size limit.
+BUCKET_SIZE = 50
+BUCKET_INDEX = [("session_id", ASCENDING), ("created_at", DESCENDING)]
+
+_compacted_sessions = set()
+
+# The chat session (or assistant thread) of the current request, for tools
+# that store state on behalf of the user (e.g. alerts)
+current_session_id = ContextVar("current_session_id", default=None)
+
+
+def build_message(role, message_text):
+    """
+    Build a session message using the canonical stored schema.
+
+    Args:
+        role (str): The author of the message ("user" or "assistant").
+        message_text (str): The message body.
+
+    Returns:
+        dict: The message document.
+    """
+    return {
+        "role": role,
+        "message_text": message_text,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+def normalize_message(message):
+    """
+    Normalize a stored message to the canonical schema.
+
+    Older user messages were written with a ``messageText`` key instead of
+    ``message_text``.
+    """
+    if "message_text" not in message and "messageText" in message:
+        message = dict(message)
+        message["message_text"] = message.pop("messageText")
+    return message
+
+
+def _append_messages(db, session_id, messages):
+    ensure_index(db, MESSAGES_COLLECTION, BUCKET_INDEX)
+    # A single upsert appends to the open bucket, or starts a new one when the
+    # latest bucket is full, so each write is one round trip.
+    db[MESSAGES_COLLECTION].update_one(
+        {"session_id": session_id, "count": {"$lt": BUCKET_SIZE}},
+        {
+            "$push": {"messages": {"$each": messages}},
+            "$inc": {"count": len(messages)},
+            "$setOnInsert": {"created_at": messages[0]["created_at"]},
+            "$set": {"updated_at": messages[-1]["created_at"]},
+        },
+        upsert=True,
+    )
+
+
+async def append_messages(db, session_id, messages):
+    """
+    Append messages to a session in one atomic write.
+
+    The synchronous PyMongo call runs in a worker thread so the event loop is
+    not blocked while waiting on the database.
+
+    Args:
+        db (Database): The MongoDB database instance.
+        session_id (str): The session to append to.
+        messages (list): Messages built with ``build_message``.
+    """
+    if not messages:
+        return
+    await asyncio.to_thread(_append_messages, db, session_id, messages)
+    logger.info("Stored %d message(s) for session_id=%s", len(messages), session_id)
+
+
+def _insert_legacy_buckets(db, buckets):
+    try:
+        db[MESSAGES_COLLECTION].insert_many(buckets, ordered=False)
+    except BulkWriteError as e:
+        # Buckets another request (or worker) already moved
+        if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+            raise
+
+
+def compact_session(db, session_id):
+    """
+    Move messages embedded in a legacy session document into buckets.
+
+    Sessions written before messages were bucketed kept every message in the
+    ``sessions`` document itself. They are re-inserted as full buckets and the
+    embedded array is then removed, which keeps the session document small.
+
+    Each legacy bucket gets a deterministic ``_id`` and duplicates are
+    ignored, so concurrent compactions of the same session (e.g. from two
+    workers) insert every bucket once, and a compaction interrupted before
+    the array is removed can simply run again.
+
+    Returns:
+        int: The number of messages moved.
+    """
+    if session_id in _compacted_sessions:
+        return 0
+    legacy = db[SESSIONS_COLLECTION].find_one(
+        {"session_id": session_id, "messages": {"$exists": True}},
+        {"_id": 0, "messages": 1},
+    )
+    messages = [normalize_message(m) for m in (legacy or {}).get("messages", [])]
+    if messages:
+        ensure_index(db, MESSAGES_COLLECTION, BUCKET_INDEX)
+        buckets = [
+            messages[start : start + BUCKET_SIZE]
+            for start in range(0, len(messages), BUCKET_SIZE)
+        ]
+        _insert_legacy_buckets(
+            db,
+            [
+                {
+                    "_id": f"{session_id}:legacy:{index}",
+                    "session_id": session_id,
+                    # Legacy buckets are marked full so new writes never reopen them
+                    "count": max(len(bucket), BUCKET_SIZE),
+                    "created_at": bucket[0]["created_at"],
+                    "updated_at": bucket[-1]["created_at"],
+                    "messages": bucket,
+                }
+                for index, bucket in enumerate(buckets)
+            ],
+        )
+    if legacy is not None:
+        db[SESSIONS_COLLECTION].update_one(
+            {"session_id": session_id}, {"$unset": {"messages": ""}}
+        )
+        logger.info(
+            "Compacted %d legacy message(s) for session_id=%s",
+            len(messages),
+            session_id,
+        )
+    _compacted_sessions.add(session_id)
+    return len(messages)
+
+
+def encode_message_cursor(created_at, skip):
+    """
+    Encode the position of a message page as an opaque cursor string.
+
+    Args:
+        created_at (datetime): Creation time of the oldest message returned.
+        skip (int): How many messages created at exactly that time were
+            already returned.
+    """
+    raw = json.dumps({"c": created_at.isoformat(), "s": skip})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_message_cursor(cursor):
+    """
+    Decode a cursor produced by ``encode_message_cursor``.
+
+    Returns:
+        tuple: The ``(created_at, skip)`` position.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(raw["c"]), int(raw["s"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def get_messages(db, session_id, limit, before=None, cursor=None):
+    """
+    Read one page of a session's messages, newest page first.
+
+    Only buckets that start no later than the page boundary are scanned, and
+    each one is trimmed server-side with ``$filter``/``$slice`` so only the
+    messages that can be on the page cross the wire.
+
+    Timestamps have millisecond precision, so several messages (e.g. the user
+    message and the reply of one turn) can share one. The cursor therefore
+    holds the boundary time and how many messages at exactly that time were
+    already returned; ties are ordered by bucket and position in the bucket.
+
+    Args:
+        db (Database): The MongoDB database instance.
+        session_id (str): The session to read.
+        limit (int): Maximum number of messages to return.
+        before (datetime, optional): Only return messages created before this.
+        cursor (str, optional): The cursor returned with the previous page;
+            takes precedence over ``before``.
+
+    Returns:
+        tuple: The messages in chronological order and the cursor of the
+        next (older) page, or None when there are no older messages.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    skip = 0
+    operator = "$lt"
+    if cursor is not None:
+        before, skip = decode_message_cursor(cursor)
+        operator = "$lte"
+
+    bucket_query = {"session_id": session_id}
+    messages = "$messages"
+    if before is not None:
+        bucket_query["created_at"] = {operator: before}
+        messages = {
+            "$filter": {
+                "input": "$messages",
+                "cond": {operator: ["$$this.created_at", before]},
+            }
+        }
+
+    pipeline = [
+        {"$match": bucket_query},
+        {"$sort": {"created_at": -1, "_id": -1}},
+        {"$project": {"_id": 0, "messages": {"$slice": [messages, -(limit + skip + 1)]}}},
+    ]
+    collected = []
+    for rank, bucket in enumerate(
+        db[MESSAGES_COLLECTION].aggregate(pipeline, batchSize=2)
+    ):
+        collected.extend(
+            ((message["created_at"], -rank, position), message)
+            for position, message in enumerate(bucket["messages"])
+        )
+        if len(collected) > limit + skip:
+            break
+
+    collected.sort(key=lambda item: item[0])
+    messages = [message for _, message in collected]
+    if skip:
+        # The newest messages at the boundary time were on the previous page
+        messages = messages[: len(messages) - skip]
+    next_cursor = None
+    if len(messages) > limit:
+        messages = messages[-limit:]
+        oldest = messages[0]["created_at"]
+        ties = sum(1 for message in messages if message["created_at"] == oldest)
+        next_cursor = encode_message_cursor(
+            oldest, ties + (skip if oldest == before else 0)
+        )
+    return [normalize_message(m) for m in messages], next_cursor
+
+
+def delete_messages(db, session_id):
+    """
+    Delete every message bucket of a session.
+    """
+    result = db[MESSAGES_COLLECTION].delete_many({"session_id": session_id})
+    _compacted_sessions.discard(session_id)
+    return result.deleted_count
@@ -0,0 +1,55 @@
+import asyncio
+from app.core.logger import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical async calls into one execution.
+
+    The first caller for a key starts the call; callers arriving with the
+    same key while it runs await the same task and get the same result (or
+    exception). Nothing is kept once the call finishes, so this only
+    deduplicates work that overlaps in time and never serves stale results.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key, call):
+        """
+        Run ``call()`` unless an identical call is already in flight.
+
+        Args:
+            key (Hashable): Identifies identical calls.
+            call (callable): Returns the awaitable to run.
+
+        Returns:
+            The result of the shared call.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+            logger.debug("Coalesced call: %s", key)
+        # Shielded so that one caller going away does not cancel the others' call
+        return await asyncio.shield(task)
+
+    def stats(self):
+        """
+        Return how many calls ran and how many joined a call in flight.
+        """
+        requests = self.executions + self.coalesced
+        return {
+            "inFlight": len(self._calls),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalescedRate": self.coalesced / requests if requests else 0.0,
+        }
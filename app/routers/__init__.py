@@ -2,5 +2,22 @@ from app.routers.threads import router as threads_router
 from app.routers.message import router as messages_router
 from app.routers.response_api.response import router as response_api_router
 from app.routers.response_api.sessions import router as sessions_router
+from app.routers.metrics import router as metrics_router
+from app.routers.indicators import router as indicators_router
+from app.routers.backtest import router as backtest_router
+from app.routers.analytics import router as analytics_router
+from app.routers.alerts import router as alerts_router
+from app.routers.portfolio import router as portfolio_router
 
-all_routes = [threads_router, messages_router, response_api_router, sessions_router]
+all_routes = [
+    threads_router,
+    messages_router,
+    response_api_router,
+    sessions_router,
+    metrics_router,
+    indicators_router,
+    backtest_router,
+    analytics_router,
+    alerts_router,
+    portfolio_router,
+]
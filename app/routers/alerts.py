@@ -0,0 +1,116 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+from fastapi import APIRouter, HTTPException, Query, status
+from app.core.logger import logging
+from app.schemas.base import CamelCaseModel
+from app.tools.create_alert import CreateAlertParams
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/alerts", tags=["alerts"])
+
+
+class AlertRequest(CreateAlertParams):
+    session_id: Optional[str] = None
+
+
+class Alert(CamelCaseModel):
+    alert_id: str
+    symbol: str
+    condition: str
+    series: str
+    params: Dict[str, Union[int, float]]
+    operator: str
+    threshold: float
+    webhook_url: Optional[str] = None
+    session_id: Optional[str] = None
+    active: bool
+    created_at: datetime
+    triggered_at: Optional[datetime] = None
+    current_value: Optional[float] = None
+
+
+class TriggeredAlert(CamelCaseModel):
+    alert_id: str
+    symbol: str
+    condition: str
+    value: float
+    bar_date: datetime
+    status: str
+    attempts: int
+    session_id: Optional[str] = None
+    created_at: datetime
+    delivered_at: Optional[datetime] = None
+
+
+def _alert(rule):
+    return Alert(alert_id=str(rule["_id"]), **rule)
+
+
+@router.post("", response_model=Alert, status_code=status.HTTP_201_CREATED)
+async def create_alert(request: AlertRequest):
+    """
+    Creates an alert rule, evaluated each time new bars are ingested.
+
+    Args:
+        request (AlertRequest): The symbol, indicator series, operator,
+            threshold and optional webhook URL and session ID.
+
+    Returns:
+        Alert: The stored rule and the current value of its series.
+    """
+    # Imported lazily: the alert engine pulls in NumPy and the data layer
+    from app.utils.alerts import create_alert
+
+    try:
+        rule = await asyncio.to_thread(
+            create_alert, request.model_dump(by_alias=True), request.session_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return _alert(rule)
+
+
+@router.get("", response_model=List[Alert])
+async def list_alerts(
+    session_id: Optional[str] = Query(None, alias="sessionId"),
+    active: Optional[bool] = None,
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """
+    Lists alert rules, newest first, optionally of one session or state.
+    """
+    from app.utils.alerts import list_alerts
+
+    rules = await asyncio.to_thread(list_alerts, session_id, active, limit)
+    return [_alert(rule) for rule in rules]
+
+
+@router.get("/triggered", response_model=List[TriggeredAlert])
+async def list_triggered_alerts(
+    session_id: Optional[str] = Query(None, alias="sessionId"),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """
+    Lists triggered alerts from the outbox, newest first, with their
+    webhook delivery status.
+    """
+    from app.utils.alerts import list_triggered_alerts
+
+    alerts = await asyncio.to_thread(list_triggered_alerts, session_id, limit)
+    return [TriggeredAlert(alert_id=str(alert["rule_id"]), **alert) for alert in alerts]
+
+
+@router.delete("/{alert_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_alert(alert_id: str):
+    """
+    Deletes an alert rule.
+    """
+    from app.utils.alerts import delete_alert
+
+    try:
+        deleted = await asyncio.to_thread(delete_alert, alert_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not deleted:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Alert not found")
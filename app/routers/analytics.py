@@ -0,0 +1,180 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional
+from fastapi import APIRouter, HTTPException, Query, status
+from app.core.logger import logging
+from app.schemas.base import CamelCaseModel
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+class DatedValue(CamelCaseModel):
+    date: datetime
+    value: Optional[float] = None
+
+
+class StockStrength(CamelCaseModel):
+    symbol: str
+    beta: Optional[float] = None
+    relative_strength: Dict[str, Optional[float]]
+    relative_strength_score: Optional[float] = None
+    relative_strength_rank: int
+
+
+class CorrelationResponse(CamelCaseModel):
+    symbols: List[str]
+    as_of: Optional[datetime] = None
+    window: int
+    lookback: int
+    correlation: List[List[Optional[float]]]
+    average_correlation: List[DatedValue]
+    stocks: List[StockStrength]
+
+
+class SectorBreadth(CamelCaseModel):
+    above_sma50_pct: Optional[float] = None
+    above_sma200_pct: Optional[float] = None
+    rsi_above70_pct: Optional[float] = None
+
+
+class SectorHistoryPoint(CamelCaseModel):
+    date: datetime
+    equal_weight: float
+    value_weight: float
+
+
+class SectorMember(CamelCaseModel):
+    symbol: str
+    close: float
+    above_sma50: Optional[bool] = None
+    above_sma200: Optional[bool] = None
+    rsi: Optional[float] = None
+
+
+class Sector(CamelCaseModel):
+    industry: str
+    stocks: int
+    as_of: datetime
+    equal_weight_level: float
+    value_weight_level: float
+    momentum: Dict[str, float]
+    momentum_score: Optional[float] = None
+    momentum_rank: int
+    breadth: SectorBreadth
+    history: Optional[List[SectorHistoryPoint]] = None
+    members: Optional[List[SectorMember]] = None
+
+
+class SectorsResponse(CamelCaseModel):
+    sectors: List[Sector]
+
+
+class PatternEvent(CamelCaseModel):
+    date: datetime
+    pattern: str
+
+
+class PriceLevel(CamelCaseModel):
+    level: float
+    touches: int
+
+
+class StockPatterns(CamelCaseModel):
+    symbol: str
+    as_of: datetime
+    close: float
+    patterns: List[PatternEvent]
+    counts: Dict[str, int]
+    support: List[PriceLevel]
+    resistance: List[PriceLevel]
+
+
+class PatternsResponse(CamelCaseModel):
+    lookback_days: int
+    stocks: List[StockPatterns]
+
+
+def _symbols(symbols):
+    return [symbol.strip() for symbol in symbols.split(",") if symbol.strip()] if symbols else None
+
+
+@router.get("/correlation", response_model=CorrelationResponse)
+async def get_correlation(
+    symbols: Optional[str] = Query(None, description="Comma-separated symbols (default: Nifty 50)"),
+    window: int = Query(60, ge=2, le=250),
+    lookback: int = Query(250, ge=2, le=1000),
+):
+    """
+    Returns the rolling correlation matrix, betas and relative-strength ranks.
+
+    Args:
+        symbols (str, optional): Comma-separated symbols to compare.
+        window (int): Days per rolling correlation window.
+        lookback (int): Days of rolling correlations and of the beta estimate.
+
+    Returns:
+        CorrelationResponse: The latest correlation matrix, the average
+        pairwise correlation per day and per-stock beta and relative strength.
+    """
+    # Imported lazily: the analytics pull in NumPy and the data layer
+    from app.utils.market_correlation import market_correlation
+
+    try:
+        return await asyncio.to_thread(
+            market_correlation, _symbols(symbols), window, lookback
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/sectors", response_model=SectorsResponse, response_model_exclude_none=True)
+async def get_sectors(
+    industry: Optional[str] = Query(None, description="Industry to focus on (partial match)"),
+    history: int = Query(0, ge=0, le=5000, description="Number of recent index levels"),
+):
+    """
+    Returns sector indices, breadth and momentum ranks for the Nifty 50 industries.
+
+    Args:
+        industry (str, optional): Only return matching sectors, with their stocks.
+        history (int): Number of most recent index levels to include per sector.
+
+    Returns:
+        SectorsResponse: The sectors, strongest momentum first.
+    """
+    # Imported lazily: the analytics pull in NumPy and the data layer
+    from app.utils.sector_analytics import sector_analysis
+
+    result = await asyncio.to_thread(sector_analysis, industry, history)
+    if industry and not result["sectors"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No sector data found for industry '{industry}'",
+        )
+    return result
+
+
+@router.get("/patterns", response_model=PatternsResponse)
+async def get_patterns(
+    symbols: Optional[str] = Query(None, description="Comma-separated symbols (default: Nifty 50)"),
+    lookback_days: int = Query(5, alias="lookbackDays", ge=1, le=250),
+):
+    """
+    Returns recent candlestick and chart patterns with support and resistance levels.
+
+    Args:
+        symbols (str, optional): Comma-separated symbols to scan.
+        lookback_days (int): Report patterns from this many latest bars.
+
+    Returns:
+        PatternsResponse: Per stock, the recent patterns, pattern counts over
+        the whole history and the nearest support and resistance levels.
+    """
+    # Imported lazily: the analytics pull in NumPy and the data layer
+    from app.utils.pattern_detection import chart_patterns
+
+    try:
+        return await asyncio.to_thread(chart_patterns, _symbols(symbols), lookback_days)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
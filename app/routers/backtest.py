@@ -0,0 +1,64 @@
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status
+from app.core.logger import logging
+from app.schemas.base import CamelCaseModel
+from app.tools.backtest_strategy import BacktestStrategyParams
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/backtest", tags=["backtest"])
+
+
+class SymbolBacktest(CamelCaseModel):
+    symbol: str
+    bars: int
+    trades: int
+    wins: int
+    total_return: float
+    buy_and_hold_return: float
+    max_drawdown: float
+    hit_rate: Optional[float] = None
+    exposure: float
+
+
+class BacktestSummary(CamelCaseModel):
+    symbols: int
+    trades: int
+    hit_rate: Optional[float] = None
+    average_return: Optional[float] = None
+    median_return: Optional[float] = None
+    average_buy_and_hold_return: Optional[float] = None
+    worst_drawdown: Optional[float] = None
+
+
+class BacktestResponse(CamelCaseModel):
+    summary: BacktestSummary
+    results: List[SymbolBacktest]
+
+
+@router.post("", response_model=BacktestResponse)
+async def backtest(request: BacktestStrategyParams):
+    """
+    Backtests a long-only indicator strategy over the stored daily history.
+
+    The symbols are simulated in parallel on the compute process pool.
+
+    Args:
+        request (BacktestStrategyParams): Entry and exit rules, symbols and dates.
+
+    Returns:
+        BacktestResponse: Per-symbol results and an overall summary.
+    """
+    # Imported lazily: the engine pulls in NumPy and the data layer
+    from app.core.compute import ComputeOverloadedError
+    from app.utils.backtest import run_backtest
+
+    try:
+        return await run_backtest(request.model_dump(by_alias=True))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ComputeOverloadedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+        )
+    except TimeoutError as e:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
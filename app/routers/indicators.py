@@ -0,0 +1,400 @@
+import asyncio
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Literal, Optional, Union
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from app.core.data_version import VERSION_TTL_SECONDS, get_data_version
+from app.core.encoding import negotiated_response
+from app.core.logger import logging
+from pydantic import PositiveFloat, PositiveInt
+from app.schemas.base import CamelCaseModel
+from app.tools.registry import all_tools, compute_indicator, compute_indicator_series
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/indicators", tags=["indicators"])
+
+# Query parameters of the endpoints that are not indicator arguments
+RESERVED_PARAMS = {"series", "seriesLength", "seriesLayout"}
+# Computed results and series kept per worker, keyed by tool, arguments and
+# data version (and series length)
+RESULT_CACHE_SIZE = 1024
+
+_results = OrderedDict()
+
+
+class SeriesPoint(CamelCaseModel):
+    date: datetime
+    values: Dict[str, float]
+
+
+class SeriesColumns(CamelCaseModel):
+    # One array per field, aligned by index with `date`
+    date: List[datetime]
+    values: Dict[str, List[Optional[float]]]
+
+
+class IndicatorResponse(CamelCaseModel):
+    symbol: str
+    indicator: str
+    as_of: str
+    parameters: Dict[str, Union[bool, int, float, str]]
+    values: Dict[str, Union[float, List[float]]]
+    series: Optional[Union[SeriesColumns, List[SeriesPoint]]] = None
+
+
+class IndicatorsResponse(CamelCaseModel):
+    symbol: str
+    as_of: str
+    indicators: Dict[str, Dict[str, Union[float, List[float]]]]
+
+
+class SweepRequest(CamelCaseModel):
+    period: Optional[List[PositiveInt]] = None
+    short_period: Optional[List[PositiveInt]] = None
+    long_period: Optional[List[PositiveInt]] = None
+    signal_period: Optional[List[PositiveInt]] = None
+    multiplier: Optional[List[PositiveFloat]] = None
+    start_date: Optional[date] = None
+
+
+class SweepResponse(CamelCaseModel):
+    symbol: str
+    indicator: str
+    as_of: str
+    axes: Dict[str, List[Union[int, float]]]
+    table: List[Dict[str, Union[int, float, None]]]
+    matrix: Dict[str, Any]
+
+
+def _slug(tool_name):
+    # getStockBollingerBands -> bollinger-bands, getStockRSI -> rsi
+    words = re.findall(r"[A-Z]+(?![a-z])|[A-Z][a-z]*", tool_name.removeprefix("getStock"))
+    return "-".join(word.lower() for word in words)
+
+
+def _parameter_names(spec):
+    # Query parameter names of an indicator; the symbol comes from the path
+    return {
+        field.alias or name for name, field in spec.params.model_fields.items()
+    } - {"stockSymbol"}
+
+
+@lru_cache
+def indicator_specs():
+    """
+    Return the registered indicators keyed by their URL name.
+    """
+    return {_slug(spec.name): spec for spec in all_tools() if spec.compute is not None}
+
+
+def _values(output, arguments):
+    """
+    Strip the description and echoed parameters from an indicator output.
+    """
+    values = {
+        key: value
+        for key, value in output.items()
+        if key != "description" and key not in arguments
+    }
+    if len(values) == 1:
+        key, value = next(iter(values.items()))
+        if isinstance(value, str):
+            raise ValueError(value)  # e.g. "Not enough data to calculate MACD"
+        if isinstance(value, dict):
+            values = value
+    return values
+
+
+@contextmanager
+def _calculation_errors():
+    # Imported lazily: the compute pool pulls in NumPy
+    from app.core.compute import ComputeOverloadedError
+
+    try:
+        yield
+    except ComputeOverloadedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+        )
+    except TimeoutError as e:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+
+
+async def _compute(spec, stock_data, arguments):
+    with _calculation_errors():
+        return _values(await compute_indicator(spec, stock_data, arguments), arguments)
+
+
+async def _get_stock_data(arguments, limit):
+    # Imported lazily: the data layer pulls in NumPy for the bar store
+    from app.utils.stock_information import get_stock_data
+
+    return await get_stock_data(
+        arguments["stockSymbol"],
+        limit,
+        arguments.get("timeframe", "daily"),
+        arguments.get("adjusted", True),
+    )
+
+
+def _remember(key, value):
+    _results[key] = value
+    if len(_results) > RESULT_CACHE_SIZE:
+        _results.popitem(last=False)
+
+
+async def _cached_values(spec, arguments, version):
+    key = (spec.name, json.dumps(arguments, sort_keys=True), version)
+    values = _results.get(key)
+    if values is None:
+        stock_data = await _get_stock_data(arguments, spec.bars_needed(arguments))
+        values = await _compute(spec, stock_data, arguments)
+        _remember(key, values)
+    else:
+        _results.move_to_end(key)
+    return values
+
+
+async def _vectorized_series(spec, arguments, series_length):
+    # Imported lazily: the series are NumPy arrays
+    import numpy as np
+    from app.core.bar_store import DATE
+
+    stock_data = await _get_stock_data(arguments, None)
+    with _calculation_errors():
+        bars, columns = await compute_indicator_series(spec, stock_data, arguments)
+    start = max(bars.shape[1] - series_length, 0)
+    columns = {field: np.asarray(values)[start:] for field, values in columns.items()}
+    # Bars before the indicator is warmed up have no value
+    known = ~np.isnan(np.array(list(columns.values()))).any(axis=0)
+    dates = [datetime.fromtimestamp(day, timezone.utc) for day in bars[DATE, start:][known]]
+    return dates, {field: values[known].tolist() for field, values in columns.items()}
+
+
+async def _pointwise_series(spec, arguments, series_length):
+    lookback = spec.bars_needed(arguments)
+    if lookback is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Series output is not available for {_slug(spec.name)}: "
+            "it is computed over the full history.",
+        )
+    stock_data = await _get_stock_data(arguments, lookback + series_length - 1)
+    # Each point applies the same calculation to the window ending at that bar
+    dates, points = [], []
+    for i in reversed(range(max(len(stock_data) - lookback + 1, 0))):
+        dates.append(stock_data[i]["Date"])
+        points.append(await _compute(spec, stock_data[i:], arguments))
+    fields = list(dict.fromkeys(field for values in points for field in values))
+    return dates, {field: [values.get(field) for values in points] for field in fields}
+
+
+async def _series(spec, arguments, version, series_length, layout="columns"):
+    """
+    Build the latest ``series_length`` values of an indicator, oldest first.
+
+    Indicators with a vectorized ``series`` function are computed for every
+    bar at once; the others repeat the calculation on the window ending at
+    each bar. Either way the series is cached per data version.
+    """
+    key = (spec.name, json.dumps(arguments, sort_keys=True), version, series_length)
+    series = _results.get(key)
+    if series is None:
+        build = _vectorized_series if spec.series else _pointwise_series
+        series = await build(spec, arguments, series_length)
+        _remember(key, series)
+    else:
+        _results.move_to_end(key)
+
+    dates, columns = series
+    if layout == "rows":
+        return [
+            SeriesPoint(date=day, values={field: values[i] for field, values in columns.items()})
+            for i, day in enumerate(dates)
+        ]
+    return SeriesColumns(date=dates, values=columns)
+
+
+async def _data_version(symbol):
+    # Reading a version that is not cached queries MongoDB
+    version = await asyncio.to_thread(get_data_version, None, symbol)
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No stock data found for symbol: {symbol}",
+        )
+    return version
+
+
+def _cache_headers(*parts):
+    """
+    Build the caching headers of a response keyed by the data version.
+    """
+    etag = 'W/"{}"'.format(hashlib.sha1("\x1f".join(parts).encode()).hexdigest())
+    return {"ETag": etag, "Cache-Control": f"public, max-age={VERSION_TTL_SECONDS}"}
+
+
+@router.get("/{symbol}", response_model=IndicatorsResponse)
+async def get_indicators(symbol: str, request: Request, response: Response):
+    """
+    Returns every indicator of a stock computed with its default parameters.
+
+    Args:
+        symbol (str): The stock symbol.
+
+    Returns:
+        IndicatorsResponse: The indicator values keyed by indicator name.
+    """
+    version = await _data_version(symbol)
+    headers = _cache_headers(symbol, version)
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+    indicators = {}
+    for name, spec in indicator_specs().items():
+        arguments = spec.validate({"stockSymbol": symbol})
+        try:
+            indicators[name] = await _cached_values(spec, arguments, version)
+        except HTTPException as e:
+            logger.warning("Skipping %s for %s: %s", name, symbol, e.detail)
+    return IndicatorsResponse(symbol=symbol, as_of=version, indicators=indicators)
+
+
+@router.get("/{symbol}/{indicator}", response_model=IndicatorResponse)
+async def get_indicator(
+    symbol: str,
+    indicator: str,
+    request: Request,
+    series: bool = False,
+    series_length: int = Query(100, alias="seriesLength", ge=1, le=1000),
+    series_layout: Literal["columns", "rows"] = Query("columns", alias="seriesLayout"),
+):
+    """
+    Returns one indicator of a stock.
+
+    Indicator parameters (e.g. ``period``, ``shortPeriod``) are passed as query
+    parameters and default to the same values as the chat tools.
+
+    Args:
+        symbol (str): The stock symbol.
+        indicator (str): The indicator name, e.g. ``rsi`` or ``bollinger-bands``.
+        series (bool): Also return the indicator for each of the latest bars.
+        series_length (int): Number of bars in the series.
+        series_layout (str): ``columns`` (a date array and one array per
+            field) or ``rows`` (one object per bar).
+
+    The response is JSON by default. Send ``Accept: application/msgpack``
+    for MessagePack or ``Accept: application/vnd.apache.arrow.stream`` for
+    the series as an Arrow IPC stream, and ``Accept-Encoding`` for brotli or
+    gzip compression.
+
+    Returns:
+        IndicatorResponse: The latest indicator values, and the series if requested.
+    """
+    spec = indicator_specs().get(indicator)
+    if spec is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown indicator: {indicator}. "
+            f"Available: {', '.join(indicator_specs())}",
+        )
+    parameters = {
+        key: value for key, value in request.query_params.items() if key not in RESERVED_PARAMS
+    }
+    unknown = sorted(set(parameters) - _parameter_names(spec))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown parameter(s) for {indicator}: {', '.join(unknown)}. "
+            f"Available: {', '.join(sorted(_parameter_names(spec) | RESERVED_PARAMS))}",
+        )
+    try:
+        arguments = spec.validate({**parameters, "stockSymbol": symbol})
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+
+    version = await _data_version(symbol)
+    headers = _cache_headers(
+        spec.name,
+        json.dumps(arguments, sort_keys=True),
+        version,
+        f"{series_length}:{series_layout}" if series else "",
+    )
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    content = IndicatorResponse(
+        symbol=symbol,
+        indicator=indicator,
+        as_of=version,
+        parameters={key: value for key, value in arguments.items() if key != "stockSymbol"},
+        values=await _cached_values(spec, arguments, version),
+        series=(
+            await _series(spec, arguments, version, series_length, series_layout)
+            if series
+            else None
+        ),
+    ).model_dump(by_alias=True)
+    if not (series and series_layout == "columns"):
+        return negotiated_response(request, content, headers)
+    # The columnar series is also offered as an Arrow record batch
+    columns = content["series"]
+    return negotiated_response(
+        request,
+        content,
+        headers,
+        table={"date": columns["date"], **columns["values"]},
+        table_field="series",
+    )
+
+
+@router.post("/{symbol}/{indicator}/sweep", response_model=SweepResponse)
+async def sweep_indicator(symbol: str, indicator: str, request: SweepRequest):
+    """
+    Evaluates a grid of indicator periods over a stock's history in one pass.
+
+    Omitted parameters use a default grid. Every configuration reports the
+    indicator at the latest bar and the total return of a standard rule for
+    the indicator, as a table and as matrices shaped like the parameter axes.
+
+    Args:
+        symbol (str): The stock symbol.
+        indicator (str): ``ma``, ``rsi``, ``macd`` or ``bollinger-bands``.
+        request (SweepRequest): The values to try per parameter.
+
+    Returns:
+        SweepResponse: The sweep table and heatmap-ready matrices.
+    """
+    # Imported lazily: the sweep pulls in NumPy and the data layer
+    from app.core.compute import ComputeOverloadedError, get_compute_executor
+    from app.utils.parameter_sweep import sweep
+    from app.utils.stock_information import get_bar_history
+
+    version = await _data_version(symbol)
+    grid = request.model_dump(by_alias=True, exclude={"start_date"})
+    try:
+        bars = await asyncio.to_thread(get_bar_history, symbol)
+        result = await get_compute_executor().run(
+            sweep, bars, indicator, grid, request.start_date
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ComputeOverloadedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+        )
+    except TimeoutError as e:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
+    return SweepResponse(symbol=symbol, as_of=version, **result)
@@ -1,13 +1,16 @@
-from fastapi import APIRouter, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import StreamingResponse
 from app.utils.function_handlers import handle_tool_outputs
-from app.core.openai import client
-from app.core.config import settings
-from app.core.logger import logging
+from app.core.encoding import dumps_json
+from app.core.llm_scheduler import estimate_tokens, get_llm_scheduler
+from app.core.openai import get_openai_client
+from app.core.config import get_settings
+from app.core.logger import Truncated, logging
+from app.core.session_store import current_session_id
+from functools import lru_cache
 from typing import Dict, Any
 from pydantic import BaseModel
 import json
-from openai import AssistantEventHandler
 from typing_extensions import override
 import asyncio
 
@@ -15,62 +18,77 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/message", tags=["messages"])
 
 
-class EventHandler(AssistantEventHandler):
-    """Custom event handler for processing assistant events."""
+@lru_cache
+def get_event_handler_class():
+    """Build the event handler class on first use so `openai` is imported lazily."""
+    from openai import AssistantEventHandler
 
-    def __init__(self):
-        self.events = []
+    class EventHandler(AssistantEventHandler):
+        """Custom event handler for processing assistant events."""
 
-    @override
-    def on_text_created(self, text) -> None:
-        self.events.append(
-            f"data: {json.dumps({'role': 'assistant', 'messageText': ''})}\n\n"
-        )
+        def __init__(self):
+            self.events = []
 
-    @override
-    def on_text_delta(self, delta, snapshot):
-        self.events.append(f"data: {json.dumps({'messageText': delta.value})}\n\n")
+        @override
+        def on_text_created(self, text) -> None:
+            self.events.append(
+                f"data: {json.dumps({'role': 'assistant', 'messageText': ''})}\n\n"
+            )
 
-    @override
-    def on_tool_call_created(self, tool_call):
-        self.events.append(
-            f"data: {json.dumps({'role': 'assistant', 'messageText': tool_call.type})}\n\n"
-        )
+        @override
+        def on_text_delta(self, delta, snapshot):
+            self.events.append(f"data: {json.dumps({'messageText': delta.value})}\n\n")
 
-    @override
-    def on_tool_call_delta(self, delta, snapshot):
-        if delta.type == "code_interpreter":
-            if delta.code_interpreter.input:
-                self.events.append(
-                    f"data: {json.dumps({'messageText': delta.code_interpreter.input})}\n\n"
-                )
-            if delta.code_interpreter.outputs:
-                for output in delta.code_interpreter.outputs:
-                    if output.type == "logs":
-                        self.events.append(
-                            f"data: {json.dumps({'messageText': output.logs})}\n\n"
-                        )
+        @override
+        def on_tool_call_created(self, tool_call):
+            self.events.append(
+                f"data: {json.dumps({'role': 'assistant', 'messageText': tool_call.type})}\n\n"
+            )
+
+        @override
+        def on_tool_call_delta(self, delta, snapshot):
+            if delta.type == "code_interpreter":
+                if delta.code_interpreter.input:
+                    self.events.append(
+                        f"data: {json.dumps({'messageText': delta.code_interpreter.input})}\n\n"
+                    )
+                if delta.code_interpreter.outputs:
+                    for output in delta.code_interpreter.outputs:
+                        if output.type == "logs":
+                            self.events.append(
+                                f"data: {json.dumps({'messageText': output.logs})}\n\n"
+                            )
 
-    def get_events(self):
-        """Retrieve all accumulated events."""
-        while self.events:
-            yield self.events.pop(0)
+        def get_events(self):
+            """Retrieve all accumulated events."""
+            while self.events:
+                yield self.events.pop(0)
+
+    return EventHandler
 
 
 async def stream_assistant_response(thread_id: str, assistant_id: str):
     """Stream assistant responses using the custom event handler."""
-    event_handler = EventHandler()
-    try:
+    client = get_openai_client()
+    event_handler = get_event_handler_class()()
+
+    def run_stream():
         with client.beta.threads.runs.stream(
             thread_id=thread_id,
             assistant_id=assistant_id,
             event_handler=event_handler,
         ) as stream:
             stream.until_done()
-            async for event in event_handler.get_events():
-                yield event
+
+    try:
+        # Streaming replies are interactive, so they use the priority lane
+        await get_llm_scheduler().run(
+            run_stream, session_id=thread_id, interactive=True
+        )
+        for event in event_handler.get_events():
+            yield event
     except Exception as e:
-        logger.error(f"Streaming error: {str(e)}")
+        logger.error("Streaming error: %s", e)
         yield f"data: {json.dumps({'error': 'Streaming failed'})}\n\n"
 
 
@@ -80,17 +98,24 @@ class MessageRequest(BaseModel):
 
 
 @router.post("/stream")
-async def create_message_stream(request: MessageRequest):
+async def create_message_stream(
+    request: MessageRequest, client=Depends(get_openai_client)
+):
     try:
         # Extract message and threadId from the request body
         message = request.message
         threadId = request.threadId
 
         # Create the user message in the thread
-        msg = client.beta.threads.messages.create(
-            thread_id=threadId, role="user", content=message
+        msg = await get_llm_scheduler().run(
+            client.beta.threads.messages.create,
+            thread_id=threadId,
+            role="user",
+            content=message,
+            session_id=threadId,
+            interactive=True,
         )
-        logger.info(f"User message created in thread {threadId}")
+        logger.info("User message created in thread %s", threadId)
 
         # headers = {
         #     "Content-Type": "text/event-stream",
@@ -99,14 +124,16 @@ async def create_message_stream(request: MessageRequest):
         # }
         # Return a StreamingResponse
         return StreamingResponse(
-            stream_assistant_response(threadId, assistant_id=settings.assistant_id),
+            stream_assistant_response(
+                threadId, assistant_id=get_settings().assistant_id
+            ),
             # headers=headers,
             media_type="text/event-stream",
         )
 
     except Exception as e:
         # Handle errors gracefully
-        logger.error(f"Error creating message stream: {e}")
+        logger.error("Error creating message stream: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -118,19 +145,30 @@ async def check_status(thread_id: str, run_id: str):
         thread_id (str): The thread ID.
         run_id (str): The run ID.
     """
+    client = get_openai_client()
+    scheduler = get_llm_scheduler()
+    # Tools that store state for the user (e.g. createAlert) record the thread
+    current_session_id.set(thread_id)
     try:
         while True:
-            run_object = client.beta.threads.runs.retrieve(
-                thread_id=thread_id, run_id=run_id
+            run_object = await scheduler.run(
+                client.beta.threads.runs.retrieve,
+                thread_id=thread_id,
+                run_id=run_id,
+                session_id=thread_id,
             )
             status = run_object.status
-            logger.info(f"Current status: {status}")
+            logger.info("Current status: %s", status)
 
             if status == "completed":
                 logger.info("Run completed. Fetching messages...")
-                messages_list = client.beta.threads.messages.list(thread_id=thread_id)
+                messages_list = await scheduler.run(
+                    client.beta.threads.messages.list,
+                    thread_id=thread_id,
+                    session_id=thread_id,
+                )
 
-                logger.debug(f"Messages list: {messages_list}")
+                logger.debug("Messages list: %s", Truncated(messages_list))
 
                 messages = [
                     {
@@ -164,15 +202,15 @@ async def check_status(thread_id: str, run_id: str):
                         output = await handle_tool_outputs(
                             func_name, function_arguments
                         )
-                        logger.info(f"Output of handleToolOutputs: {output}")
+                        logger.debug("Output of handleToolOutputs: %s", Truncated(output))
                         tools_output.append(
                             {
                                 "tool_call_id": action.id,
-                                "output": json.dumps(output),
+                                "output": dumps_json(output),
                             }
                         )
                     except Exception as e:
-                        logger.error(f"Error in handleToolOutputs: {str(e)}")
+                        logger.error("Error in handleToolOutputs: %s", e)
                         tools_output.append(
                             {
                                 "tool_call_id": action.id,
@@ -181,26 +219,32 @@ async def check_status(thread_id: str, run_id: str):
                         )
 
                 # Submit the tool outputs to the Assistant API
-                client.beta.threads.runs.submit_tool_outputs(
+                await scheduler.run(
+                    client.beta.threads.runs.submit_tool_outputs,
                     thread_id=thread_id,
                     run_id=run_id,
                     tool_outputs=tools_output,
+                    session_id=thread_id,
+                    estimated_tokens=estimate_tokens(tools_output),
                 )
 
             await asyncio.sleep(3)  # Poll every 3 seconds
 
     except Exception as e:
-        logger.error(f"Error in check_status: {str(e)}")
+        logger.error("Error in check_status: %s", e)
         raise HTTPException(status_code=500, detail="Error checking status")
 
 
 @router.post("/")
-async def create_message_without_polling(request: MessageRequest):
+async def create_message_without_polling(
+    request: MessageRequest, client=Depends(get_openai_client)
+):
     """
     Create a user message and start polling for assistant run status.
 
     Args:
         request (MessageRequest): The request body containing message and threadId.
+        client (OpenAI): The OpenAI client (injected via Depends).
 
     Returns:
         dict: The final status and messages after completion.
@@ -211,22 +255,31 @@ async def create_message_without_polling(request: MessageRequest):
         thread_id = request.threadId
 
         # Create the user message in the thread
-        client.beta.threads.messages.create(
-            thread_id=thread_id, role="user", content=message
+        scheduler = get_llm_scheduler()
+        await scheduler.run(
+            client.beta.threads.messages.create,
+            thread_id=thread_id,
+            role="user",
+            content=message,
+            session_id=thread_id,
         )
-        logger.info(f"User message created in thread {thread_id}")
+        logger.info("User message created in thread %s", thread_id)
 
         # Start the assistant run
-        response = client.beta.threads.runs.create(
-            thread_id=thread_id, assistant_id=settings.assistant_id
+        response = await scheduler.run(
+            client.beta.threads.runs.create,
+            thread_id=thread_id,
+            assistant_id=get_settings().assistant_id,
+            session_id=thread_id,
+            estimated_tokens=estimate_tokens(message),
         )
         run_id = response.id
-        logger.info(f"Assistant run started with run ID: {run_id}")
+        logger.info("Assistant run started with run ID: %s", run_id)
 
         # Poll for status and return the result
         result = await check_status(thread_id, run_id)
         return result
 
     except Exception as e:
-        logger.error(f"Error creating message with polling: {e}")
+        logger.error("Error creating message with polling: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
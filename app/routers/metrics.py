@@ -0,0 +1,40 @@
+from fastapi import APIRouter
+from app.core.answer_cache import get_answer_cache
+from app.core.compute import get_compute_executor
+from app.core.llm_scheduler import get_llm_scheduler
+from app.tools.registry import tool_call_stats
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/answer-cache")
+def get_answer_cache_metrics():
+    """
+    Returns hit-rate and saved-latency metrics of the chat answer cache.
+    """
+    return get_answer_cache().stats()
+
+
+@router.get("/llm-scheduler")
+async def get_llm_scheduler_metrics():
+    """
+    Returns queue depth, queue wait times and retry counts of the OpenAI call scheduler.
+    """
+    return get_llm_scheduler().stats()
+
+
+@router.get("/tool-calls")
+async def get_tool_call_metrics():
+    """
+    Returns how many indicator and analytics tool calls ran and how many were
+    coalesced with an identical call in flight.
+    """
+    return tool_call_stats()
+
+
+@router.get("/compute")
+async def get_compute_metrics():
+    """
+    Returns queue depth, outcome counts and call durations of the compute process pool.
+    """
+    return get_compute_executor().stats()
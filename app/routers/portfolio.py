@@ -0,0 +1,149 @@
+import asyncio
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, status
+from app.core.logger import logging
+from app.schemas.base import CamelCaseModel
+from app.tools.set_portfolio import Holding, SetPortfolioParams
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/session/{session_id}/portfolio", tags=["portfolio"])
+
+
+class Portfolio(CamelCaseModel):
+    session_id: str
+    holdings: List[Holding]
+    updated_at: datetime
+
+
+class Position(CamelCaseModel):
+    symbol: str
+    industry: str
+    quantity: float
+    cost_basis: float
+    close: float
+    market_value: float
+    unrealized_pnl: float
+    unrealized_pnl_pct: float
+    day_change: float
+    weight: float
+    rsi: Optional[float] = None
+    sma50_gap_pct: Optional[float] = None
+    sma200_gap_pct: Optional[float] = None
+    momentum1m_pct: Optional[float] = None
+    annual_volatility: Optional[float] = None
+    risk_contribution: Optional[float] = None
+
+
+class WeightedIndicators(CamelCaseModel):
+    rsi: Optional[float] = None
+    sma50_gap_pct: Optional[float] = None
+    sma200_gap_pct: Optional[float] = None
+    momentum1m_pct: Optional[float] = None
+    above_sma50_weight: float
+    above_sma200_weight: float
+
+
+class SectorExposure(CamelCaseModel):
+    industry: str
+    market_value: float
+    unrealized_pnl: float
+    weight: float
+    symbols: List[str]
+
+
+class PortfolioRisk(CamelCaseModel):
+    return_days: int
+    daily_volatility: float
+    annual_volatility: float
+    confidence: float
+    horizon_days: int
+    parametric_var_pct: float
+    parametric_var: float
+    historical_var_pct: float
+    historical_var: float
+    expected_shortfall_pct: float
+    expected_shortfall: float
+
+
+class PortfolioAnalysis(CamelCaseModel):
+    as_of: datetime
+    total_value: float
+    total_cost: float
+    unrealized_pnl: float
+    unrealized_pnl_pct: float
+    day_change: float
+    day_change_pct: float
+    positions: List[Position]
+    indicators: WeightedIndicators
+    sectors: List[SectorExposure]
+    risk: Optional[PortfolioRisk] = None
+    missing: List[str]
+
+
+@router.put("", response_model=Portfolio)
+async def set_portfolio(session_id: str, request: SetPortfolioParams):
+    """
+    Registers the portfolio of a session, replacing any earlier one.
+
+    Holdings of the same symbol are merged at their average cost.
+
+    Args:
+        session_id (str): The chat session ID.
+        request (SetPortfolioParams): Symbol, quantity and cost basis of
+            every holding.
+
+    Returns:
+        Portfolio: The stored portfolio.
+    """
+    # Imported lazily: the analysis pulls in NumPy and the data layer
+    from app.utils.portfolio import save_portfolio
+
+    holdings = [holding.model_dump() for holding in request.holdings]
+    return await asyncio.to_thread(save_portfolio, session_id, holdings)
+
+
+@router.get("", response_model=Portfolio)
+async def get_portfolio(session_id: str):
+    """
+    Returns the portfolio registered for a session.
+    """
+    from app.utils.portfolio import get_portfolio
+
+    portfolio = await asyncio.to_thread(get_portfolio, session_id)
+    if portfolio is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No portfolio registered")
+    return portfolio
+
+
+@router.get("/analysis", response_model=PortfolioAnalysis)
+async def get_portfolio_analysis(
+    session_id: str,
+    confidence: float = Query(0.95, gt=0.5, lt=1),
+    horizon_days: int = Query(1, alias="horizonDays", ge=1, le=250),
+    lookback_days: int = Query(250, alias="lookbackDays", ge=20, le=5000),
+):
+    """
+    Analyzes the portfolio registered for a session.
+
+    Args:
+        session_id (str): The chat session ID.
+        confidence (float): Confidence level of the Value at Risk.
+        horizon_days (int): Value at Risk horizon in trading days.
+        lookback_days (int): Days of returns used for volatility and VaR.
+
+    Returns:
+        PortfolioAnalysis: Position and total P&L, weighted indicators,
+        sector exposure, and volatility, VaR and expected shortfall.
+    """
+    from app.utils.portfolio import get_portfolio, portfolio_analysis
+
+    portfolio = await asyncio.to_thread(get_portfolio, session_id)
+    if portfolio is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No portfolio registered")
+    try:
+        return await asyncio.to_thread(
+            portfolio_analysis, portfolio["holdings"], confidence, horizon_days, lookback_days
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
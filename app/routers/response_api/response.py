@@ -1,16 +1,28 @@
-from fastapi import APIRouter, HTTPException, Request, status, Depends
+from fastapi import APIRouter, Header, HTTPException, Query, Request, status, Depends
 from fastapi.responses import StreamingResponse
 from app.schemas.base import CamelCaseModel
 from app.utils.function_handlers import handle_tool_outputs
-from app.core.openai import client
-from app.core.config import settings
-from app.core.logger import logging
-from typing import Dict, Any, List
+from app.core.encoding import dumps_json
+from app.core.llm_scheduler import estimate_tokens, get_llm_scheduler
+from app.core.openai import get_openai_client
+from app.core.logger import Truncated, logging
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
 import asyncio
-from app.tools.tools import tools
+import time
+from app.tools.registry import get_tool
+from app.tools.tools import get_tools
 import json
+from app.core.answer_cache import get_answer_cache, normalize_prompt
+from app.core.data_version import get_data_version
 from app.core.database import get_database
+from app.core.session_store import (
+    append_messages,
+    build_message,
+    compact_session,
+    current_session_id,
+    get_messages,
+)
 from bson import ObjectId
 from datetime import datetime, timezone
 from pymongo.database import Database
@@ -21,8 +33,6 @@ router = APIRouter(prefix="/response", tags=["response"])
 
 instructions = "You are designed to provide comprehensive technical analysis for the top 50 stocks in the Nifty index. You offer insights on various technical indicators to aid in making informed buying and selling decisions. \n \nYou are tailored for investors and traders looking to leverage technical analysis to enhance their trading strategies. By integrating these indicators, users can gain a comprehensive understanding of stock performance and market trends, enabling more informed decision-making."
 
-RESPONSE_COLLECTION = "sessions"
-
 
 class Message(CamelCaseModel):
     role: str
@@ -32,6 +42,7 @@ class Message(CamelCaseModel):
 
 class ResponsesData(CamelCaseModel):
     messages: List[Message]
+    next_cursor: Optional[str] = None
 
 
 class UserMessageRequest(CamelCaseModel):
@@ -39,26 +50,40 @@ class UserMessageRequest(CamelCaseModel):
     message: str
 
 
+def _data_versions(db, symbols):
+    # The data version of every symbol an answer used
+    return {symbol: get_data_version(db, symbol) for symbol in symbols}
+
+
 @router.post("")
-async def main(request: UserMessageRequest):
+async def main(
+    request: UserMessageRequest,
+    cache_control: Optional[str] = Header(None),
+    client=Depends(get_openai_client),
+):
     """
     Handles user messages, interacts with OpenAI, and manages session data.
 
     Args:
         msg (str): The user's input message.
+        cache_control (str, optional): ``no-cache`` skips the answer cache
+            lookup, ``no-store`` also keeps the answer out of the cache.
+        client (OpenAI): The OpenAI client (injected via Depends).
 
     Returns:
         dict: The final response from OpenAI or the result of tool calls.
 
     Workflow:
-    1. Creates a new session ID and saves the initial message to the database.
+    1. Builds the user message for the session and serves a cached answer for a repeated prompt if one is still valid.
     2. Sends the message to OpenAI and processes the response.
-    3. If the response is a final plain text answer, it updates the database and returns the response.
-    4. If the response includes tool calls, it processes each tool call, updates the database, and continues the loop.
-    5. Handles errors and logs them appropriately.
+    3. If the response is a final plain text answer, it stores the user message and the reply in one write and returns the response.
+    4. If the response includes tool calls, it processes each tool call and continues the loop.
+    5. Handles errors and logs them appropriately; the user message is still stored on failure.
     """
     db = get_database()
     session_id = request.session_id
+    # Tools that store state for the user (e.g. createAlert) record the session
+    current_session_id.set(session_id)
 
     input_messages = [
         {
@@ -67,35 +92,55 @@ async def main(request: UserMessageRequest):
         },
     ]
 
-    db[RESPONSE_COLLECTION].update_one(
-        {"session_id": session_id, "messages": {"$exists": False}},
-        {"$set": {"messages": []}},
-    )
-
-    db[RESPONSE_COLLECTION].update_one(
-        {"session_id": session_id},
-        {
-            "$push": {
-                "messages": {
-                    "role": "user",
-                    "messageText": request.message,
-                    "created_at": datetime.now(timezone.utc),
-                }
+    # The user message is written together with the reply at the end of the
+    # turn, so the whole exchange costs a single database round trip.
+    user_message = build_message("user", request.message)
+
+    answer_cache = get_answer_cache()
+    cache_directives = (cache_control or "").lower()
+    prompt_key = normalize_prompt(request.message)
+    if "no-cache" in cache_directives or "no-store" in cache_directives:
+        answer_cache.record_bypass()
+    else:
+        # Checking the data versions may query MongoDB
+        cached_answer = await asyncio.to_thread(
+            answer_cache.get, prompt_key, lambda symbol: get_data_version(db, symbol)
+        )
+        if cached_answer:
+            assistant_message = build_message(
+                cached_answer["role"], cached_answer["message_text"]
+            )
+            await append_messages(db, session_id, [user_message, assistant_message])
+            return {
+                "messages": [
+                    {
+                        "role": assistant_message["role"],
+                        "messageText": assistant_message["message_text"],
+                        "created_at": assistant_message["created_at"],
+                    }
+                ]
             }
-        },
-    )
 
     logger.info("Starting main function.")
+    started_at = time.perf_counter()
+    resolved_symbols = set()
+    # An answer that changed stored state (e.g. created an alert) or that
+    # depends on the session (e.g. its portfolio) must not be replayed for
+    # the next identical prompt
+    private = False
     messagesCopy = input_messages.copy()
 
     try:
         while True:
-            response = client.responses.create(
+            response = await get_llm_scheduler().run(
+                client.responses.create,
                 model="gpt-4o-mini",
                 input=messagesCopy,
-                tools=tools,
+                tools=get_tools(),
                 store=True,
                 instructions=instructions,
+                session_id=session_id,
+                estimated_tokens=estimate_tokens(instructions, messagesCopy),
             )
 
             logger.info("Response received from OpenAI.")
@@ -119,36 +164,29 @@ async def main(request: UserMessageRequest):
 
             if not tool_calls:
                 logger.warning("No function calls in response.")
-                role = response.output[0].role
-                message_text = response.output[0].content[0].text
-                # Remove the conflicting `messages` field
-
-                # Step 1: Make sure 'messages' exists
-                db[RESPONSE_COLLECTION].update_one(
-                    {"session_id": session_id, "messages": {"$exists": False}},
-                    {"$set": {"messages": []}},
+                assistant_message = build_message(
+                    response.output[0].role, response.output[0].content[0].text
                 )
-
-                # Step 2: Push message
-                db[RESPONSE_COLLECTION].update_one(
-                    {"session_id": session_id},
-                    {
-                        "$push": {
-                            "messages": {
-                                "role": role,
-                                "message_text": message_text,
-                                "created_at": datetime.now(timezone.utc),
-                            }
-                        }
-                    },
+                await append_messages(
+                    db, session_id, [user_message, assistant_message]
                 )
+                if "no-store" not in cache_directives and not private:
+                    answer_cache.put(
+                        prompt_key,
+                        {
+                            "role": assistant_message["role"],
+                            "message_text": assistant_message["message_text"],
+                        },
+                        await asyncio.to_thread(_data_versions, db, resolved_symbols),
+                        time.perf_counter() - started_at,
+                    )
 
                 return {
                     "messages": [
                         {
-                            "role": response.output[0].role,
-                            "messageText": response.output[0].content[0].text,
-                            "created_at": datetime.now(timezone.utc),
+                            "role": assistant_message["role"],
+                            "messageText": assistant_message["message_text"],
+                            "created_at": assistant_message["created_at"],
                         }
                     ]
                 }
@@ -156,8 +194,17 @@ async def main(request: UserMessageRequest):
             for tool_call in tool_calls:
                 name = tool_call.name
                 args = json.loads(tool_call.arguments)
-
-                logger.debug(f"Calling tool: {name} with args: {args}")
+                symbol = args.get("stockSymbol") or args.get("symbol")
+                if symbol:
+                    resolved_symbols.add(symbol)
+                spec = get_tool(name)
+                if spec and spec.symbols:
+                    # Multi-symbol tools (e.g. getMarketCorrelation) report
+                    # every symbol they read, so the answer goes stale with them
+                    resolved_symbols.update(await asyncio.to_thread(spec.symbols, args))
+                private = private or bool(spec and (spec.mutating or spec.per_session))
+
+                logger.debug("Calling tool: %s with args: %s", name, Truncated(args))
                 result = await handle_tool_outputs(name, args)
 
                 await asyncio.sleep(1)
@@ -167,33 +214,53 @@ async def main(request: UserMessageRequest):
                     {
                         "type": "function_call_output",
                         "call_id": tool_call.call_id,
-                        "output": str(result),
+                        "output": dumps_json(result),
                     }
                 )
 
             logger.info("Tool call(s) processed; continuing loop for next round.")
 
     except Exception as e:
-        logger.error(f"Error creating message: {e}", exc_info=True)
+        logger.error("Error creating message: %s", e, exc_info=True)
+        # Keep the user's message even when no reply could be produced
+        try:
+            await append_messages(db, session_id, [user_message])
+        except PyMongoError as db_error:
+            logger.error("Failed to store user message: %s", db_error)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
 @router.get("/{session_id}", response_model=ResponsesData)
-async def get_responses(session_id: str, db: Database = Depends(get_database)):
+async def get_responses(
+    session_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    db: Database = Depends(get_database),
+):
     """
-    Retrieves all messages for a given session ID.
+    Retrieves one page of messages for a given session ID.
+
+    The newest ``limit`` messages (or those created before ``before``) are
+    returned in chronological order. Pass the returned ``nextCursor`` value
+    as ``cursor`` to load older messages.
     """
     try:
-        session = db[RESPONSE_COLLECTION].find_one({"session_id": session_id}) or {}
+        if before is None and cursor is None:
+            await asyncio.to_thread(compact_session, db, session_id)
+        messages, next_cursor = await asyncio.to_thread(
+            get_messages, db, session_id, limit, before, cursor
+        )
+        logger.info("Retrieved %d message(s) for session_id=%s", len(messages), session_id)
 
-        messages = session.get("messages", [])
-        logger.info(f"Retrieved {len(messages)} message(s) for session_id={session_id}")
+        return {"messages": messages, "next_cursor": next_cursor}
 
-        return {"messages": messages}
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     except PyMongoError as e:
         logger.error(
-            f"Database error while retrieving session {session_id}: {e}", exc_info=True
+            "Database error while retrieving session %s: %s", session_id, e, exc_info=True
         )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,11 +1,13 @@
 # Refactored imports for better readability
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, status
 from pymongo.database import Database
 from pymongo.errors import PyMongoError
-from app.core.database import get_database
+from app.core.database import ensure_index, get_database
 from app.core.logger import logging
+from app.core.pagination import KEYSET_INDEX, compute_etag, fetch_page
+from app.core.session_store import SESSIONS_COLLECTION, delete_messages
 from app.schemas.base import CamelCaseModel
-from typing import List
+from typing import List, Optional
 import datetime
 from bson import ObjectId
 from pydantic import BaseModel
@@ -14,8 +16,8 @@ from pydantic import BaseModel
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/session", tags=["sessions"])
 
-# Constants for collection names
-SESSIONS_COLLECTION = "sessions"
+# Listing never needs the (potentially large) messages array
+SESSION_PROJECTION = {"session_id": 1, "analysis_name": 1, "created_at": 1}
 
 
 # Session model
@@ -45,7 +47,7 @@ def create_session(request: AnalysisRequest, db: Database = Depends(get_database
     Returns:
         Session: The created session data.
     """
-    logger.info(f"Creating a new session for analysis: {request.analysis_name}")
+    logger.info("Creating a new session for analysis: %s", request.analysis_name)
 
     if not request.analysis_name.strip():
         logger.warning("Empty analysis name provided.")
@@ -61,6 +63,7 @@ def create_session(request: AnalysisRequest, db: Database = Depends(get_database
     )
 
     try:
+        ensure_index(db, SESSIONS_COLLECTION, "session_id", unique=True)
         result = db[SESSIONS_COLLECTION].insert_one(session_data.model_dump())
         if not result.inserted_id:
             logger.error("Failed to insert session into database.")
@@ -71,7 +74,7 @@ def create_session(request: AnalysisRequest, db: Database = Depends(get_database
         logger.info("Session saved successfully.")
         return session_data
     except PyMongoError as e:
-        logger.error(f"Database error: {e}", exc_info=True)
+        logger.error("Database error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Database operation failed.",
@@ -80,30 +83,54 @@ def create_session(request: AnalysisRequest, db: Database = Depends(get_database
 
 # Endpoint to fetch all sessions
 @router.get("", response_model=List[Session])
-def get_all_sessions(db: Database = Depends(get_database)):
+def get_all_sessions(
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: Database = Depends(get_database),
+):
     """
-    Retrieves all sessions from the database.
+    Retrieves one page of sessions from the database, newest first.
 
     Args:
+        request (Request): The incoming request (used for If-None-Match).
+        response (Response): The outgoing response (used for paging headers).
+        limit (int): Maximum number of sessions to return.
+        cursor (str, optional): The X-Next-Cursor value of the previous page.
         db (Database): MongoDB database instance.
 
     Returns:
-        List[Session]: List of all sessions.
+        List[Session]: The sessions in the page.
     """
-    logger.info("Fetching all sessions from the database.")
+    logger.info("Fetching sessions from the database (limit=%s).", limit)
 
     try:
-        sessions_cursor = db[SESSIONS_COLLECTION].find().sort("created_at", -1)
-        sessions = [Session(**session) for session in sessions_cursor]
-        logger.info(f"Retrieved {len(sessions)} sessions.")
-        return sessions
+        ensure_index(db, SESSIONS_COLLECTION, KEYSET_INDEX)
+        documents, next_cursor = fetch_page(
+            db[SESSIONS_COLLECTION], SESSION_PROJECTION, limit, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except PyMongoError as e:
-        logger.error(f"Database error: {e}", exc_info=True)
+        logger.error("Database error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve sessions.",
         )
 
+    etag = compute_etag(documents, SESSION_PROJECTION)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    sessions = [Session(**session) for session in documents]
+    logger.info("Retrieved %d sessions.", len(sessions))
+    return sessions
+
 
 # Endpoint to remove a session by its session ID
 @router.delete("/remove/{session_id}", status_code=status.HTTP_200_OK)
@@ -118,19 +145,20 @@ def remove_session(session_id: str, db: Database = Depends(get_database)):
     Returns:
         dict: A message indicating the result of the operation.
     """
-    logger.info(f"Attempting to remove session with ID: {session_id}")
+    logger.info("Attempting to remove session with ID: %s", session_id)
 
     try:
         result = db[SESSIONS_COLLECTION].delete_one({"session_id": session_id})
-        if result.deleted_count == 0:
-            logger.warning(f"No session found with ID: {session_id}")
+        deleted_messages = delete_messages(db, session_id)
+        if result.deleted_count == 0 and deleted_messages == 0:
+            logger.warning("No session found with ID: %s", session_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Session not found."
             )
-        logger.info(f"Session with ID {session_id} removed successfully.")
+        logger.info("Session with ID %s removed successfully.", session_id)
         return {"message": "Session removed successfully."}
     except PyMongoError as e:
-        logger.error(f"Database error: {e}", exc_info=True)
+        logger.error("Database error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to remove session.",
@@ -1,11 +1,12 @@
 import datetime
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, status
 from pymongo.database import Database
 from pymongo.errors import PyMongoError
-from app.core.database import get_database
+from app.core.database import ensure_index, get_database
 from app.core.logger import logging
-from app.core.openai import client
+from app.core.pagination import KEYSET_INDEX, compute_etag, fetch_page
+from app.core.openai import get_openai_client
 from app.schemas.base import CamelCaseModel
 
 # Initialize logger and router
@@ -14,6 +15,7 @@ router = APIRouter(
     prefix="/thread", tags=["threads"]
 )  # tags=["threads"] is optional but recommended for OpenAPI docs grouping  (Swagger UI)
 THREADS_COLLECTION = "threads"
+THREAD_PROJECTION = {"thread_id": 1, "analysis_name": 1, "created_at": 1}
 
 
 class Thread(CamelCaseModel):
@@ -37,17 +39,23 @@ class ThreadMessage(CamelCaseModel):
 
 class ThreadMessagesResponse(CamelCaseModel):
     messages: List[ThreadMessage]
+    next_before: Optional[str] = None
 
 
 # Endpoint to create a new thread (sync)
 @router.get("/new", response_model=Thread, status_code=status.HTTP_201_CREATED)
-def create_thread(name: str, db: Database = Depends(get_database)):
+def create_thread(
+    name: str,
+    db: Database = Depends(get_database),
+    client=Depends(get_openai_client),
+):
     """
     Creates a new thread using the OpenAI client and stores it in the database.
 
     Args:
         name (str): The name of the analysis for the thread (query parameter).
         db (Database): MongoDB database instance (injected via Depends).
+        client (OpenAI): The OpenAI client (injected via Depends).
 
     Returns:
         Thread: The created thread data.
@@ -55,7 +63,7 @@ def create_thread(name: str, db: Database = Depends(get_database)):
     Raises:
         HTTPException: If OpenAI or database operations fail.
     """
-    logger.info(f"Creating a new thread for analysis: {name}")
+    logger.info("Creating a new thread for analysis: %s", name)
 
     # Validate name length (optional, remove if not needed)
     if not name.strip():
@@ -67,9 +75,9 @@ def create_thread(name: str, db: Database = Depends(get_database)):
     try:
         # Call OpenAI client synchronously
         thread = client.beta.threads.create()
-        logger.debug(f"Thread created successfully with ID: {thread.id}")
+        logger.debug("Thread created successfully with ID: %s", thread.id)
     except Exception as e:
-        logger.error(f"OpenAI thread creation failed: {str(e)}", exc_info=True)
+        logger.error("OpenAI thread creation failed: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail="Failed to create thread with OpenAI service.",
@@ -86,16 +94,16 @@ def create_thread(name: str, db: Database = Depends(get_database)):
         # Save thread data synchronously
         result = db[THREADS_COLLECTION].insert_one(thread_data.model_dump())
         if not result.inserted_id:
-            logger.error(f"Failed to insert thread {thread.id} into database.")
+            logger.error("Failed to insert thread %s into database.", thread.id)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to save thread to database.",
             )
-        logger.info(f"Thread {thread.id} saved to database successfully.")
+        logger.info("Thread %s saved to database successfully.", thread.id)
         return thread_data
     except PyMongoError as e:
         logger.error(
-            f"Database insertion failed for thread {thread.id}: {str(e)}", exc_info=True
+            "Database insertion failed for thread %s: %s", thread.id, e, exc_info=True
         )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -105,44 +113,77 @@ def create_thread(name: str, db: Database = Depends(get_database)):
 
 # Endpoint to fetch all threads (sync)
 @router.get("/allThreads", response_model=List[Thread])
-def get_all_threads(db: Database = Depends(get_database)):
+def get_all_threads(
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: Database = Depends(get_database),
+):
     """
-    Retrieves all threads from the database.
+    Retrieves one page of threads from the database, newest first.
 
     Args:
+        request (Request): The incoming request (used for If-None-Match).
+        response (Response): The outgoing response (used for paging headers).
+        limit (int): Maximum number of threads to return.
+        cursor (str, optional): The X-Next-Cursor value of the previous page.
         db (Database): MongoDB database instance (injected via Depends).
 
     Returns:
-        List[Thread]: List of all threads.
+        List[Thread]: The threads in the page.
 
     Raises:
-        HTTPException: If database retrieval fails.
+        HTTPException: If the cursor is invalid or database retrieval fails.
     """
-    logger.info("Retrieving all threads from the database.")
+    logger.info("Retrieving threads from the database (limit=%s).", limit)
 
     try:
-        threads_cursor = (
-            db[THREADS_COLLECTION].find().sort("created_at", -1)
-        )  # Sort newest first
-        threads = [Thread(**thread) for thread in threads_cursor]  # Sync iteration
-        logger.info(f"Retrieved {len(threads)} threads successfully.")
-        return threads
+        ensure_index(db, THREADS_COLLECTION, KEYSET_INDEX)
+        documents, next_cursor = fetch_page(
+            db[THREADS_COLLECTION], THREAD_PROJECTION, limit, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except PyMongoError as e:
-        logger.error(f"Failed to retrieve threads: {str(e)}", exc_info=True)
+        logger.error("Failed to retrieve threads: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve threads from database.",
         )
 
+    etag = compute_etag(documents, THREAD_PROJECTION)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    threads = [Thread(**thread) for thread in documents]
+    logger.info("Retrieved %d threads successfully.", len(threads))
+    return threads
+
 
 # Endpoint to fetch thread messages (sync)
 @router.get("/{thread_id}/messages", response_model=ThreadMessagesResponse)
-def thread_messages(thread_id: str):
+def thread_messages(
+    thread_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    before: Optional[str] = None,
+    client=Depends(get_openai_client),
+):
     """
-    Retrieves all messages for a given thread ID from OpenAI.
+    Retrieves one page of messages for a given thread ID from OpenAI.
+
+    Only a single page is requested from OpenAI, newest first. Pass the
+    returned ``nextBefore`` message ID as ``before`` to load older messages.
 
     Args:
         thread_id (str): The ID of the thread to fetch messages for.
+        limit (int): Maximum number of messages to return.
+        before (str, optional): Only return messages older than this message ID.
+        client (OpenAI): The OpenAI client (injected via Depends).
 
     Returns:
         ThreadMessagesResponse: List of messages wrapped in a response model.
@@ -150,12 +191,14 @@ def thread_messages(thread_id: str):
     Raises:
         HTTPException: If message retrieval fails.
     """
-    logger.info(f"Retrieving messages for thread: {thread_id}")
+    logger.info("Retrieving messages for thread: %s", thread_id)
 
     try:
-        message_list = client.beta.threads.messages.list(
-            thread_id=thread_id
-        )  # Sync call
+        list_params = {"thread_id": thread_id, "limit": limit, "order": "desc"}
+        if before:
+            # With descending order, OpenAI's `after` cursor moves to older messages
+            list_params["after"] = before
+        message_page = client.beta.threads.messages.list(**list_params)  # Sync call
         messages = [
             ThreadMessage(
                 run_id=message.run_id or None,
@@ -164,14 +207,17 @@ def thread_messages(thread_id: str):
                 thread_id=message.thread_id,
                 message_text=message.content[0].text.value if message.content else "",
             )
-            for message in message_list
+            for message in message_page.data
         ]
+        next_before = messages[-1].msg_id if messages and message_page.has_more else None
         messages.reverse()  # Reverse the order of messages
-        logger.info(f"Retrieved {len(messages)} messages for thread {thread_id}.")
-        return ThreadMessagesResponse(messages=messages)
+        logger.info("Retrieved %d messages for thread %s.", len(messages), thread_id)
+        return ThreadMessagesResponse(messages=messages, next_before=next_before)
     except Exception as e:
         logger.error(
-            f"Failed to retrieve messages for thread {thread_id}: {str(e)}",
+            "Failed to retrieve messages for thread %s: %s",
+            thread_id,
+            e,
             exc_info=True,
         )
         raise HTTPException(
@@ -0,0 +1,26 @@
+from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class NiftyStock(BaseModel):
+    """
+    A Nifty 50 constituent as stored in the ``nifty50`` collection.
+
+    Fields keep the collection's names when serialized (``by_alias``), and
+    columns not listed here are kept as they are.
+    """
+
+    model_config = ConfigDict(extra="allow", populate_by_name=True)
+
+    symbol: str = Field(alias="Symbol")
+    company_name: Optional[str] = Field(default=None, alias="Company Name")
+    industry: Optional[str] = Field(default=None, alias="Industry")
+
+
+class StockPrice(BaseModel):
+    """
+    The latest close of a stock.
+    """
+
+    symbol: str
+    price: Optional[float] = None
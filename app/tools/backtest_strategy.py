@@ -0,0 +1,66 @@
+from datetime import date
+from typing import List, Literal, Optional, Union
+from pydantic import Field
+from app.schemas.base import CamelCaseModel
+
+SeriesName = Literal[
+    "close",
+    "sma",
+    "ema",
+    "rsi",
+    "macd",
+    "macdSignal",
+    "macdHistogram",
+    "bollingerUpper",
+    "bollingerMiddle",
+    "bollingerLower",
+    "stochasticK",
+    "obv",
+]
+
+
+# An indicator series evaluated on every bar
+class SeriesOperand(CamelCaseModel):
+    series: SeriesName = Field(description="The indicator series (or the closing price).")
+    period: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Period of sma (default 50), ema (20), rsi (14), bollinger* (20) or stochasticK (14).",
+    )
+    short_period: Optional[int] = Field(None, ge=1, description="MACD short EMA period (default 12).")
+    long_period: Optional[int] = Field(None, ge=1, description="MACD long EMA period (default 26).")
+    signal_period: Optional[int] = Field(None, ge=1, description="MACD signal period (default 9).")
+    multiplier: Optional[float] = Field(
+        None, gt=0, description="Bollinger Bands standard deviation multiplier (default 2)."
+    )
+
+
+# A comparison between a series and a constant or another series
+class Condition(CamelCaseModel):
+    left: SeriesOperand
+    operator: Literal["<", "<=", ">", ">=", "crossesAbove", "crossesBelow"]
+    right: Union[float, SeriesOperand] = Field(
+        description="A constant (e.g. 30 for RSI) or another series."
+    )
+
+
+class BacktestStrategyParams(CamelCaseModel):
+    entry: List[Condition] = Field(
+        min_length=1,
+        description="Conditions that must all hold at a daily close to open a long position."
+    )
+    exit: List[Condition] = Field(
+        min_length=1,
+        description="Conditions of which any one closes the position at a daily close."
+    )
+    symbols: Optional[List[str]] = Field(
+        None, description="Stock symbols to test. Defaults to every Nifty 50 stock."
+    )
+    start_date: Optional[date] = Field(None, description="First date of the test (YYYY-MM-DD).")
+    end_date: Optional[date] = Field(None, description="Last date of the test (YYYY-MM-DD).")
+    cost_bps: float = Field(
+        0,
+        ge=0,
+        le=1000,
+        description="Transaction cost per entry or exit in basis points (0 to 1000). Defaults to 0.",
+    )
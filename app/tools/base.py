@@ -0,0 +1,24 @@
+from typing import Literal
+from pydantic import Field
+from app.schemas.base import CamelCaseModel
+
+
+class StockSymbolParams(CamelCaseModel):
+    """
+    Base parameters of every indicator tool.
+
+    Field names are snake_case and exposed to the model in camelCase
+    (``stock_symbol`` -> ``stockSymbol``).
+    """
+
+    stock_symbol: str = Field(
+        description="The stock symbol (e.g., WIPRO for WIPRO LTD.)",
+    )
+    timeframe: Literal["daily", "weekly", "monthly"] = Field(
+        "daily",
+        description="Bar timeframe the indicator is calculated on; weekly and monthly bars are aggregated from daily bars. Defaults to daily.",
+    )
+    adjusted: bool = Field(
+        True,
+        description="Use prices adjusted for splits and dividends (default) or, when false, the raw traded prices.",
+    )
@@ -0,0 +1,21 @@
+from typing import Literal, Optional
+from pydantic import Field, HttpUrl
+from app.schemas.base import CamelCaseModel
+from app.tools.backtest_strategy import SeriesOperand
+
+
+class CreateAlertParams(CamelCaseModel):
+    stock_symbol: str = Field(
+        description="The stock symbol (e.g., WIPRO for WIPRO LTD.)",
+    )
+    indicator: SeriesOperand = Field(
+        description="The indicator series (or the closing price) to watch on daily bars."
+    )
+    operator: Literal["<", "<=", ">", ">=", "crossesAbove", "crossesBelow"] = Field(
+        description="How the latest value is compared with the threshold. The crosses operators fire only on the day the series crosses it."
+    )
+    threshold: float = Field(description="The level to compare with (e.g. 30 for RSI).")
+    webhook_url: Optional[HttpUrl] = Field(
+        None,
+        description="Public http(s) URL that receives a POST with the triggered alert. Only set it when the user provides one.",
+    )
@@ -0,0 +1,27 @@
+from typing import List, Literal, Optional
+from pydantic import Field
+from app.schemas.base import CamelCaseModel
+
+PatternName = Literal[
+    "bullishEngulfing",
+    "bearishEngulfing",
+    "doji",
+    "hammer",
+    "shootingStar",
+    "doubleTop",
+    "doubleBottom",
+    "resistanceBreakout",
+    "supportBreakdown",
+]
+
+
+class GetChartPatternsParams(CamelCaseModel):
+    symbols: Optional[List[str]] = Field(
+        None, description="Stock symbols to scan. Defaults to every Nifty 50 stock."
+    )
+    lookback_days: int = Field(
+        5, ge=1, le=250, description="Report patterns from the last N trading days. Defaults to 5."
+    )
+    patterns: Optional[List[PatternName]] = Field(
+        None, description="Only report these patterns. Defaults to all of them."
+    )
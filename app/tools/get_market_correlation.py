@@ -0,0 +1,21 @@
+from typing import List, Optional
+from pydantic import Field
+from app.schemas.base import CamelCaseModel
+
+
+class GetMarketCorrelationParams(CamelCaseModel):
+    symbols: Optional[List[str]] = Field(
+        None, description="Stock symbols to compare. Defaults to every Nifty 50 stock."
+    )
+    window: int = Field(
+        60, ge=2, le=250, description="Days per rolling correlation window. Defaults to 60."
+    )
+    lookback: int = Field(
+        250,
+        ge=2,
+        le=1000,
+        description="Days of rolling correlations and of the beta estimate. Defaults to 250.",
+    )
+    top: int = Field(
+        5, ge=1, description="Number of pairs and stocks to list in each ranking. Defaults to 5."
+    )
@@ -0,0 +1,17 @@
+from pydantic import Field
+from app.schemas.base import CamelCaseModel
+
+
+class GetPortfolioAnalysisParams(CamelCaseModel):
+    confidence: float = Field(
+        0.95, gt=0.5, lt=1, description="Confidence level of the Value at Risk. Defaults to 0.95."
+    )
+    horizon_days: int = Field(
+        1, ge=1, le=250, description="Value at Risk horizon in trading days. Defaults to 1."
+    )
+    lookback_days: int = Field(
+        250,
+        ge=20,
+        le=5000,
+        description="Trading days of returns used for volatility and Value at Risk. Defaults to 250.",
+    )
@@ -0,0 +1,10 @@
+from typing import Optional
+from pydantic import Field
+from app.schemas.base import CamelCaseModel
+
+
+class GetSectorAnalysisParams(CamelCaseModel):
+    industry: Optional[str] = Field(
+        None,
+        description="Only return this industry (e.g., 'Banking' or 'IT'), with a per-stock breakdown. Partial, case-insensitive match. Defaults to every sector.",
+    )
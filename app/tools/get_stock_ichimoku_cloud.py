@@ -1,17 +1,5 @@
-get_stock_ichimoku_cloud_tool = {
-    "type": "function",
-    "name": "getStockIchimokuCloud",
-    "description": "Get the Ichimoku Cloud values of the stock based on the symbol.",
-    "strict": False,
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "stockSymbol": {
-                "type": "string",
-                "description": "The stock symbol (e.g., WIPRO for WIPRO LTD.)",
-            }
-        },
-        "additionalProperties": False,  # Disallow extra parameters
-        "required": ["stockSymbol"],
-    },
-}
+from .base import StockSymbolParams
+
+
+class GetStockIchimokuCloudParams(StockSymbolParams):
+    pass
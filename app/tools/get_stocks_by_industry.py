@@ -0,0 +1,10 @@
+from pydantic import Field
+from app.schemas.base import CamelCaseModel
+
+
+# Parameters for listing the Nifty 50 stocks of an industry
+class GetStocksByIndustryParams(CamelCaseModel):
+    # Named `symbol` for compatibility with existing tool calls
+    symbol: str = Field(
+        description="The industry to search for (e.g., 'Banking' or 'IT'). Partial, case-insensitive match.",
+    )
@@ -0,0 +1,389 @@
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib import import_module
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Type
+from pydantic import BaseModel, ValidationError
+from app.core.logger import logging
+from app.core.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Modules that register tools. They are imported the first time the registry
+# is used, so importing the registry itself stays cheap.
+TOOL_MODULES = [
+    "app.utils.stock_information",
+    "app.utils.calculate_stock_MA",
+    "app.utils.calculate_stock_RSI",
+    "app.utils.calculate_stock_MACD",
+    "app.utils.calculate_stock_BollingerBands",
+    "app.utils.calculate_stock_fibonacci_retracement",
+    "app.utils.calculate_stock_ichimoku_cloud",
+    "app.utils.calculate_stock_stochastic_oscillator",
+    "app.utils.calculate_stock_obv",
+    "app.utils.calculate_stock_ADX",
+    "app.utils.calculate_stock_VWAP",
+    "app.utils.backtest",
+    "app.utils.market_correlation",
+    "app.utils.sector_analytics",
+    "app.utils.pattern_detection",
+    "app.utils.alerts",
+    "app.utils.portfolio",
+]
+
+_registry: Dict[str, "ToolSpec"] = {}
+_loaded = False
+# Identical cacheable tool calls running at the same time share one execution
+_flights = SingleFlight()
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """
+    Declarative description of a tool the model can call.
+
+    Attributes:
+        name: The tool name exposed to the model (e.g. ``getStockRSI``).
+        description: The tool description exposed to the model.
+        params: Pydantic model of the arguments; the JSON schema is generated
+            from it and it validates every call.
+        handler: Async callable receiving the validated argument dict.
+        compute: For indicators, the pure function ``compute(stock_data, args)``
+            that builds the output from bars sorted newest first.
+        lookback: For indicators, returns how many of the newest bars the
+            calculation needs for the given arguments (None for full history).
+        series: For indicators, the vectorized ``series(bars, args)`` that
+            returns one array per output field with a value for every bar of
+            the chronological bar array (NaN until enough bars are known).
+        cacheable: Whether the output only depends on the arguments and the
+            stored bars, so it can be cached or precomputed.
+        cpu_heavy: For indicators, whether ``compute`` is expensive enough to
+            run on the compute process pool instead of the event loop.
+        mutating: Whether the tool changes stored state (e.g. creates an
+            alert); answers that called it are never cached.
+        per_session: Whether the output depends on the caller's session
+            (e.g. its portfolio); answers that called it are never cached.
+        symbols: For tools that read several symbols, returns the symbols
+            the given arguments read, so that cached answers are keyed on
+            their data versions too.
+        strict: Whether OpenAI should enforce the schema strictly.
+    """
+
+    name: str
+    description: str
+    params: Type[BaseModel]
+    handler: Callable[[Dict[str, Any]], Awaitable[Any]]
+    compute: Optional[Callable[[list, Dict[str, Any]], Any]] = None
+    lookback: Optional[Callable[[Dict[str, Any]], Optional[int]]] = None
+    series: Optional[Callable[[Any, Dict[str, Any]], Dict[str, Any]]] = None
+    cacheable: bool = False
+    cpu_heavy: bool = False
+    mutating: bool = False
+    per_session: bool = False
+    symbols: Optional[Callable[[Dict[str, Any]], List[str]]] = None
+    strict: bool = False
+
+    def validate(self, arguments):
+        """
+        Validate tool arguments and fill in defaults.
+
+        Raises:
+            ValueError: If the arguments do not match the parameter model.
+        """
+        try:
+            return self.params.model_validate(arguments).model_dump(by_alias=True)
+        except ValidationError as e:
+            raise ValueError(f"Invalid arguments for {self.name}: {e}") from e
+
+    def default_arguments(self):
+        """
+        Return the default value of every optional parameter.
+        """
+        return {
+            field.alias or name: field.default
+            for name, field in self.params.model_fields.items()
+            if not field.is_required()
+        }
+
+    def bars_needed(self, arguments):
+        """
+        Return how many of the newest bars the tool needs (None for all).
+        """
+        return self.lookback(arguments) if self.lookback else None
+
+    def schema(self):
+        """
+        Build the OpenAI function-tool definition from the parameter model.
+        """
+        json_schema = self.params.model_json_schema(by_alias=True)
+        properties = {
+            key: {k: v for k, v in value.items() if k != "title"}
+            for key, value in json_schema.get("properties", {}).items()
+        }
+        parameters = {
+            "type": "object",
+            "properties": properties,
+            "additionalProperties": False,  # Disallow extra parameters
+            "required": json_schema.get("required", []),
+        }
+        if "$defs" in json_schema:
+            # Nested models (e.g. backtest conditions) are referenced from here
+            parameters["$defs"] = json_schema["$defs"]
+        return {
+            "type": "function",
+            "name": self.name,
+            "description": self.description,
+            "strict": self.strict,
+            "parameters": parameters,
+        }
+
+
+def _register(spec):
+    if spec.name in _registry:
+        raise ValueError(f"Tool already registered: {spec.name}")
+    _registry[spec.name] = spec
+    return spec
+
+
+def register_tool(
+    name,
+    *,
+    description,
+    params,
+    cacheable=False,
+    mutating=False,
+    per_session=False,
+    symbols=None,
+    strict=False,
+):
+    """
+    Register an async handler that receives the validated argument dict.
+
+    Example:
+        @register_tool("getStockPrice", description="...", params=GetStockPriceParams)
+        async def get_stock_price_tool(function_arguments):
+            ...
+    """
+
+    def decorator(handler):
+        _register(
+            ToolSpec(
+                name=name,
+                description=description,
+                params=params,
+                handler=handler,
+                cacheable=cacheable,
+                mutating=mutating,
+                per_session=per_session,
+                symbols=symbols,
+                strict=strict,
+            )
+        )
+        return handler
+
+    return decorator
+
+
+def register_indicator(
+    name, *, description, params, lookback=None, series=None, cacheable=True, cpu_heavy=False
+):
+    """
+    Register a pure indicator function ``compute(stock_data, function_arguments)``.
+
+    The registry loads the newest ``lookback(arguments)`` bars of the requested
+    symbol (or the whole history when ``lookback`` is None) and passes them,
+    sorted newest first, to the function. With ``cpu_heavy``, the function
+    runs on the compute process pool (see ``compute_indicator``). ``series``
+    optionally computes the indicator for every bar at once (see
+    ``compute_indicator_series``).
+    """
+
+    def decorator(compute):
+        spec = None
+
+        async def handler(function_arguments):
+            # Imported lazily: the data layer pulls in the database driver
+            from app.utils.stock_information import get_stock_data
+
+            stock_symbol = function_arguments["stockSymbol"]
+            logger.debug("Calculating %s for stock: %s", name, stock_symbol)
+            stock_data = await get_stock_data(
+                stock_symbol,
+                spec.bars_needed(function_arguments),
+                function_arguments.get("timeframe", "daily"),
+                function_arguments.get("adjusted", True),
+            )
+            output = await compute_indicator(spec, stock_data, function_arguments)
+            logger.debug("%s calculated successfully for stock: %s", name, stock_symbol)
+            return output
+
+        spec = _register(
+            ToolSpec(
+                name=name,
+                description=description,
+                params=params,
+                handler=handler,
+                compute=compute,
+                lookback=lookback,
+                series=series,
+                cacheable=cacheable,
+                cpu_heavy=cpu_heavy,
+            )
+        )
+        return compute
+
+    return decorator
+
+
+def _compute_in_worker(name, bars, function_arguments):
+    # Runs on a compute worker, which has its own registry
+    from app.core.bar_store import bars_to_records
+
+    return get_tool(name).compute(bars_to_records(bars), function_arguments)
+
+
+async def compute_indicator(spec, stock_data, function_arguments):
+    """
+    Run an indicator's compute function on bars sorted newest first.
+
+    CPU-heavy indicators run on the compute process pool, with the bars
+    passed through shared memory, so they do not block the event loop;
+    the others run inline.
+
+    Raises:
+        ComputeOverloadedError: If the compute pool has too many pending calls.
+        TimeoutError: If the calculation does not finish in time.
+    """
+    if not spec.cpu_heavy:
+        return spec.compute(stock_data, function_arguments)
+    # Imported lazily: the bar store and compute pool pull in NumPy
+    from app.core.bar_store import BarRecords, records_to_bars
+    from app.core.compute import get_compute_executor
+
+    bars = (
+        stock_data.to_bars()
+        if isinstance(stock_data, BarRecords)
+        else records_to_bars(stock_data)
+    )
+    return await get_compute_executor().run(
+        _compute_in_worker, spec.name, bars, function_arguments
+    )
+
+
+def _series_in_worker(name, bars, function_arguments):
+    # Runs on a compute worker, which has its own registry
+    return get_tool(name).series(bars, function_arguments)
+
+
+async def compute_indicator_series(spec, stock_data, function_arguments):
+    """
+    Run an indicator's vectorized ``series`` function on stored bars.
+
+    Like ``compute_indicator``, CPU-heavy indicators run on the compute
+    process pool in a single call, with the bars passed through shared memory.
+
+    Returns:
+        tuple: The chronological bar array and the series of every output
+        field, aligned with its bars.
+
+    Raises:
+        ComputeOverloadedError: If the compute pool has too many pending calls.
+        TimeoutError: If the calculation does not finish in time.
+    """
+    # Imported lazily: the bar store and compute pool pull in NumPy
+    from app.core.bar_store import BarRecords, records_to_bars
+    from app.core.compute import get_compute_executor
+
+    bars = (
+        stock_data.to_bars()
+        if isinstance(stock_data, BarRecords)
+        else records_to_bars(stock_data)
+    )
+    if not spec.cpu_heavy:
+        return bars, spec.series(bars, function_arguments)
+    return bars, await get_compute_executor().run(
+        _series_in_worker, spec.name, bars, function_arguments
+    )
+
+
+def _load():
+    global _loaded
+    if not _loaded:
+        for module in TOOL_MODULES:
+            import_module(module)
+        _loaded = True
+
+
+def get_tool(name):
+    """
+    Return the spec of a registered tool, or None if there is no such tool.
+    """
+    _load()
+    return _registry.get(name)
+
+
+def all_tools():
+    """
+    Return every registered tool spec in registration order.
+    """
+    _load()
+    return list(_registry.values())
+
+
+@lru_cache
+def tool_schemas():
+    """
+    Return the OpenAI tool definitions of every registered tool.
+
+    Generated once per process from the parameter models.
+    """
+    return [spec.schema() for spec in all_tools()]
+
+
+def call_key(name, function_arguments):
+    """
+    Return the canonical key of a validated tool call.
+    """
+    return f"{name}:{json.dumps(function_arguments, sort_keys=True, default=str)}"
+
+
+async def dispatch(spec, function_arguments, run=None):
+    """
+    Run a validated tool call.
+
+    Calls of cacheable tools are coalesced: while a call is in flight,
+    identical calls (same tool and canonical arguments) await its result
+    instead of loading bars and computing again.
+
+    Args:
+        spec (ToolSpec): The tool.
+        function_arguments (dict): Arguments returned by ``spec.validate``.
+        run (callable, optional): Produces the output from the arguments.
+            Defaults to the tool's handler.
+    """
+    run = run or spec.handler
+    if not spec.cacheable:
+        return await run(function_arguments)
+    return await _flights.do(
+        call_key(spec.name, function_arguments), lambda: run(function_arguments)
+    )
+
+
+def tool_call_stats():
+    """
+    Return how many cacheable tool calls ran and how many were coalesced.
+    """
+    return _flights.stats()
+
+
+async def call_tool(name, function_arguments):
+    """
+    Validate the arguments of a tool call and run its handler.
+
+    Raises:
+        ValueError: If the tool does not exist or the arguments are invalid.
+    """
+    spec = get_tool(name)
+    if spec is None:
+        raise ValueError(f"Unsupported function: {name}")
+    return await dispatch(spec, spec.validate(function_arguments))
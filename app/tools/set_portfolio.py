@@ -0,0 +1,16 @@
+from typing import List
+from pydantic import Field
+from app.schemas.base import CamelCaseModel
+
+
+class Holding(CamelCaseModel):
+    symbol: str = Field(description="The stock symbol (e.g., WIPRO for WIPRO LTD.)")
+    quantity: float = Field(gt=0, description="Number of shares held.")
+    cost_basis: float = Field(gt=0, description="Average purchase price per share.")
+
+
+class SetPortfolioParams(CamelCaseModel):
+    holdings: List[Holding] = Field(
+        min_length=1,
+        description="Every position of the user's portfolio; replaces any portfolio registered before.",
+    )
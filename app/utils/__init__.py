@@ -1,19 +1,24 @@
-from .calculate_stock_MA import calculate_stock_ma
-from .calculate_stock_RSI import calculate_stock_rsi
-from .calculate_stock_MACD import calculate_stock_macd
-from .calculate_stock_ADX import calculate_stock_adx
-from .calculate_stock_BollingerBands import calculate_stock_bollinger_bands
-from .calculate_stock_VWAP import calculate_vwap
-from .calculate_stock_stochastic_oscillator import calculate_stochastic_oscillator
-from .function_handlers import handle_tool_outputs  # Added import
+from importlib import import_module
 
-__all__ = [
-    "calculate_stock_adx",
-    "calculate_stock_ma",
-    "calculate_stock_rsi",
-    "calculate_stock_macd",
-    "calculate_stock_bollinger_bands",
-    "calculate_vwap",
-    "calculate_stochastic_oscillator",
-    "handle_tool_outputs",  # Added to __all__
-]
+# Public name -> defining module. Calculators are imported on first attribute
+# access instead of when the package is imported.
+_LAZY_EXPORTS = {
+    "calculate_stock_adx": ".calculate_stock_ADX",
+    "calculate_stock_ma": ".calculate_stock_MA",
+    "calculate_stock_rsi": ".calculate_stock_RSI",
+    "calculate_stock_macd": ".calculate_stock_MACD",
+    "calculate_stock_bollinger_bands": ".calculate_stock_BollingerBands",
+    "calculate_vwap": ".calculate_stock_VWAP",
+    "calculate_stochastic_oscillator": ".calculate_stock_stochastic_oscillator",
+    "handle_tool_outputs": ".function_handlers",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
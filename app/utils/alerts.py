@@ -0,0 +1,547 @@
+import asyncio
+import ipaddress
+import math
+import socket
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+import httpx
+import numpy as np
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+from pymongo.errors import BulkWriteError
+from app.core.bar_store import DATE
+from app.core.database import ensure_index, get_database
+from app.core.encoding import dumps_json
+from app.core.logger import logging
+from app.core.session_store import current_session_id
+from app.tools.create_alert import CreateAlertParams
+from app.tools.registry import register_tool
+from app.utils.backtest import compute_series, series_params
+from app.utils.stock_information import get_bar_history
+
+logger = logging.getLogger(__name__)
+
+ALERT_RULES_COLLECTION = "alert_rules"
+ALERTS_OUTBOX_COLLECTION = "alerts_outbox"
+
+OPERATORS = ["<", "<=", ">", ">=", "crossesAbove", "crossesBelow"]
+
+# Webhook delivery: timeout of one POST, attempts before an alert is marked
+# failed, base delay of the exponential backoff between attempts, and how
+# long a dispatcher holds an alert it is sending
+WEBHOOK_TIMEOUT_SECONDS = 5.0
+WEBHOOK_MAX_ATTEMPTS = 5
+WEBHOOK_RETRY_SECONDS = 30
+WEBHOOK_LEASE_SECONDS = 60
+
+# Fields of a rule the evaluator needs
+RULE_PROJECTION = {
+    "symbol": 1,
+    "series": 1,
+    "params": 1,
+    "series_key": 1,
+    "operator": 1,
+    "threshold": 1,
+    "condition": 1,
+    "session_id": 1,
+    "webhook_url": 1,
+}
+
+
+def _ema_warmup(period):
+    # Bars after which the weight of an EMA's seed falls below 1e-16: older
+    # bars no longer change its value at floating-point precision
+    keep = 1 - 2 / (period + 1)
+    return 1 if keep <= 0 else math.ceil(math.log(1e-16) / math.log(keep))
+
+
+def bars_needed(series, params):
+    """
+    Return how many of the newest bars give a series' latest two values as
+    computed over the whole history (None when all bars are needed).
+
+    Windowed series need their period. EMAs (and MACD) depend on every bar,
+    but bars older than their warm-up no longer change the result.
+    """
+    if series == "close":
+        return 2
+    if series == "ema":
+        return _ema_warmup(params["period"]) + 1
+    if series.startswith("macd"):
+        return _ema_warmup(params["longPeriod"]) + _ema_warmup(params["signalPeriod"]) + 1
+    if "period" in params:
+        return params["period"] + 2
+    return None  # OBV accumulates over the whole history
+
+
+def series_key(series, params):
+    """
+    Return the key shared by every rule on the same series and parameters.
+    """
+    return series + "".join(f":{key}={params[key]}" for key in sorted(params))
+
+
+def describe_condition(series, params, operator, threshold):
+    """
+    Describe a condition for people, e.g. ``rsi(14) < 30``.
+    """
+    arguments = ", ".join(f"{params[key]:g}" for key in params)
+    label = f"{series}({arguments})" if arguments else series
+    return f"{label} {operator} {threshold:g}"
+
+
+def check_webhook_url(url):
+    """
+    Check that a webhook URL points to a public host.
+
+    The host is resolved and every address it resolves to must be globally
+    routable, so webhooks cannot be aimed at the API's own network
+    (loopback, private, link-local, reserved or multicast addresses).
+
+    Args:
+        url (str): The webhook URL.
+
+    Returns:
+        str: The first address the host resolved to.
+
+    Raises:
+        ValueError: If the host is missing, cannot be resolved or is not public.
+    """
+    host = urlsplit(url).hostname
+    if not host:
+        raise ValueError(f"Webhook URL has no host: {url}")
+    try:
+        addresses = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError) as e:
+        raise ValueError(f"Cannot resolve webhook host {host}: {e}")
+    addresses = [ipaddress.ip_address(sockaddr[0].split("%")[0]) for *_, sockaddr in addresses]
+    for address in addresses:
+        if not address.is_global or address.is_multicast:
+            raise ValueError(f"Webhook host {host} is not a public address")
+    return str(addresses[0])
+
+
+def post_webhook(client, url, content):
+    """
+    Post a JSON body to a webhook at the address its host was checked at.
+
+    The host is resolved once, by ``check_webhook_url``, and the request is
+    sent to that address with the ``Host`` header and TLS server name (used
+    for SNI and certificate verification) set to the host. Resolving it again
+    on connect would let a DNS record re-pointed in between (DNS rebinding)
+    aim the post at a private address.
+
+    Args:
+        client (httpx.Client): The client to send the request with.
+        url (str): The webhook URL.
+        content (bytes): The JSON body.
+
+    Returns:
+        httpx.Response: The response of the webhook.
+
+    Raises:
+        ValueError: If the host is missing, cannot be resolved or is not public.
+        httpx.HTTPError: If the request fails.
+    """
+    address = check_webhook_url(url)
+    url = httpx.URL(url)
+    extensions = {}
+    if url.scheme == "https":
+        extensions["sni_hostname"] = url.raw_host.decode("ascii")
+    return client.post(
+        url.copy_with(host=address),
+        content=content,
+        headers={"Host": url.netloc.decode("ascii"), "Content-Type": "application/json"},
+        extensions=extensions,
+    )
+
+
+def build_rule(stock_symbol, indicator, operator, threshold, webhook_url=None, session_id=None):
+    """
+    Build an alert rule document.
+
+    Args:
+        stock_symbol (str): The stock symbol.
+        indicator (dict): A validated ``SeriesOperand``.
+        operator (str): One of ``OPERATORS``.
+        threshold (float): The level the series is compared with.
+        webhook_url (str, optional): URL the triggered alert is posted to.
+        session_id (str, optional): The chat session that created the rule.
+
+    Returns:
+        dict: The rule, with the series parameters filled in.
+    """
+    series = indicator["series"]
+    params = series_params(indicator)
+    return {
+        "symbol": stock_symbol,
+        "series": series,
+        "params": params,
+        "series_key": series_key(series, params),
+        "operator": operator,
+        "threshold": float(threshold),
+        "condition": describe_condition(series, params, operator, threshold),
+        "webhook_url": webhook_url,
+        "session_id": session_id,
+        "active": True,
+        "created_at": datetime.now(timezone.utc),
+        "triggered_at": None,
+    }
+
+
+def triggered_rules(rules, histories):
+    """
+    Evaluate alert rules on the latest bar of each symbol.
+
+    Rules are grouped by series key and symbol: each series is computed once
+    per group, over only the newest bars it needs (see ``bars_needed``), and
+    the thresholds and operators of all rules are then compared with the
+    series' latest two values in a few array operations. Warm-up (NaN)
+    values never trigger.
+
+    Args:
+        rules (list): Rule documents from ``build_rule``.
+        histories (dict): Chronological bar arrays by symbol, from
+            ``get_bar_history``.
+
+    Returns:
+        tuple: A boolean array marking the triggered rules, and the latest
+        series value of every rule.
+    """
+    count = len(rules)
+    thresholds = np.fromiter((rule["threshold"] for rule in rules), float, count)
+    operators = np.fromiter(
+        (OPERATORS.index(rule["operator"]) for rule in rules), np.int8, count
+    )
+    groups = {}
+    for index, rule in enumerate(rules):
+        groups.setdefault((rule["series_key"], rule["symbol"]), []).append(index)
+
+    latest = np.full(count, np.nan)
+    previous = np.full(count, np.nan)
+    for (_, symbol), indices in groups.items():
+        bars = histories.get(symbol)
+        if bars is None or bars.shape[1] < 2:
+            continue
+        rule = rules[indices[0]]
+        needed = bars_needed(rule["series"], rule["params"])
+        if needed is not None:
+            bars = bars[:, -needed:]
+        values = compute_series(bars, rule["series"], rule["params"])
+        latest[indices] = values[-1]
+        previous[indices] = values[-2]
+
+    with np.errstate(invalid="ignore"):
+        above = latest > thresholds
+        below = latest < thresholds
+        outcomes = [
+            below,
+            latest <= thresholds,
+            above,
+            latest >= thresholds,
+            above & (previous <= thresholds),
+            below & (previous >= thresholds),
+        ]
+    triggered = np.select(
+        [operators == code for code in range(len(OPERATORS))], outcomes, False
+    )
+    return triggered, latest
+
+
+def _insert_outbox(db, alerts):
+    # The outbox holds one alert per rule, so a rule triggered again after an
+    # interrupted evaluation is not sent twice
+    ensure_index(db, ALERTS_OUTBOX_COLLECTION, "rule_id", unique=True)
+    try:
+        db[ALERTS_OUTBOX_COLLECTION].insert_many(alerts, ordered=False)
+    except BulkWriteError as e:
+        if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+            raise
+
+
+def evaluate_alerts(symbols=None):
+    """
+    Evaluate the active alert rules on the latest stored bars.
+
+    Runs after ingestion. Each alert fires once: triggered rules are written
+    to the alerts outbox and deactivated. Alerts with a webhook are left
+    ``pending`` for ``dispatch_webhooks``; the others are only ``stored``.
+
+    Args:
+        symbols (list, optional): Only evaluate the rules of these symbols.
+            Defaults to every symbol.
+
+    Returns:
+        int: The number of triggered alerts.
+    """
+    db = get_database()
+    ensure_index(db, ALERT_RULES_COLLECTION, [("symbol", ASCENDING), ("active", ASCENDING)])
+    query = {"active": True}
+    if symbols is not None:
+        query["symbol"] = {"$in": list(symbols)}
+    rules = list(db[ALERT_RULES_COLLECTION].find(query, RULE_PROJECTION))
+    if not rules:
+        return 0
+
+    histories = {
+        symbol: get_bar_history(symbol) for symbol in {rule["symbol"] for rule in rules}
+    }
+    triggered, latest = triggered_rules(rules, histories)
+    indices = np.flatnonzero(triggered)
+    if not len(indices):
+        return 0
+
+    now = datetime.now(timezone.utc)
+    alerts = []
+    for index in indices:
+        rule = rules[index]
+        alerts.append(
+            {
+                "rule_id": rule["_id"],
+                "session_id": rule.get("session_id"),
+                "symbol": rule["symbol"],
+                "condition": rule["condition"],
+                "value": float(latest[index]),
+                "bar_date": datetime.fromtimestamp(
+                    histories[rule["symbol"]][DATE][-1], timezone.utc
+                ),
+                "webhook_url": rule.get("webhook_url"),
+                "status": "pending" if rule.get("webhook_url") else "stored",
+                "attempts": 0,
+                "next_attempt_at": now,
+                "created_at": now,
+            }
+        )
+    _insert_outbox(db, alerts)
+    db[ALERT_RULES_COLLECTION].update_many(
+        {"_id": {"$in": [alert["rule_id"] for alert in alerts]}},
+        {"$set": {"active": False, "triggered_at": now}},
+    )
+    logger.info("%d of %d alert rule(s) triggered", len(alerts), len(rules))
+    return len(alerts)
+
+
+def webhook_payload(alert):
+    """
+    Build the JSON body posted to an alert's webhook.
+    """
+    return {
+        "alertId": str(alert["rule_id"]),
+        "symbol": alert["symbol"],
+        "condition": alert["condition"],
+        "value": alert["value"],
+        "date": alert["bar_date"],
+        "triggeredAt": alert["created_at"],
+    }
+
+
+def dispatch_webhooks(limit=100):
+    """
+    Post pending alerts from the outbox to their webhooks.
+
+    Each alert is claimed before it is sent, by pushing its next attempt
+    back by a lease, so concurrent dispatchers do not send it twice and an
+    alert held by a crashed dispatcher is picked up again later. Failed posts
+    are retried with exponential backoff; after ``WEBHOOK_MAX_ATTEMPTS`` the
+    alert is marked ``failed``. Hosts that no longer resolve to a public
+    address count as failed posts, posts go to the address that was checked,
+    and redirects are not followed.
+
+    Args:
+        limit (int): Maximum number of alerts to send.
+
+    Returns:
+        int: The number of alerts delivered.
+    """
+    db = get_database()
+    outbox = db[ALERTS_OUTBOX_COLLECTION]
+    ensure_index(
+        db, ALERTS_OUTBOX_COLLECTION, [("status", ASCENDING), ("next_attempt_at", ASCENDING)]
+    )
+    delivered = 0
+    with httpx.Client(timeout=WEBHOOK_TIMEOUT_SECONDS) as client:
+        for _ in range(limit):
+            now = datetime.now(timezone.utc)
+            alert = outbox.find_one_and_update(
+                {"status": "pending", "next_attempt_at": {"$lte": now}},
+                {
+                    "$set": {"next_attempt_at": now + timedelta(seconds=WEBHOOK_LEASE_SECONDS)},
+                    "$inc": {"attempts": 1},
+                },
+                sort=[("next_attempt_at", ASCENDING)],
+                return_document=ReturnDocument.AFTER,
+            )
+            if alert is None:
+                break
+            try:
+                # Checked again on every attempt: the host may have been
+                # re-pointed since the rule was created
+                response = post_webhook(
+                    client, alert["webhook_url"], dumps_json(webhook_payload(alert))
+                )
+                response.raise_for_status()
+            except (httpx.HTTPError, ValueError) as e:
+                failed = alert["attempts"] >= WEBHOOK_MAX_ATTEMPTS
+                logger.warning(
+                    "Webhook for alert %s failed (attempt %d): %s",
+                    alert["rule_id"],
+                    alert["attempts"],
+                    e,
+                )
+                delay = WEBHOOK_RETRY_SECONDS * 2 ** (alert["attempts"] - 1)
+                outbox.update_one(
+                    {"_id": alert["_id"]},
+                    {
+                        "$set": {
+                            "status": "failed" if failed else "pending",
+                            "last_error": str(e),
+                            "next_attempt_at": now + timedelta(seconds=delay),
+                        }
+                    },
+                )
+                continue
+            outbox.update_one(
+                {"_id": alert["_id"]},
+                {"$set": {"status": "delivered", "delivered_at": datetime.now(timezone.utc)}},
+            )
+            delivered += 1
+    return delivered
+
+
+async def run_webhook_dispatcher(interval):
+    """
+    Send pending webhooks every ``interval`` seconds until cancelled.
+
+    Runs in the background of each API worker (see ``main.lifespan``), so
+    deliveries never hold up ingestion and backed-off alerts are retried
+    when they are due. Workers claim alerts with a lease, so several
+    dispatchers can run side by side.
+
+    Args:
+        interval (float): Seconds to wait after a round that emptied the queue.
+    """
+    limit = 100
+    while True:
+        try:
+            delivered = await asyncio.to_thread(dispatch_webhooks, limit)
+        except Exception as e:
+            logger.error("Failed to dispatch webhooks: %s", e, exc_info=True)
+            delivered = 0
+        if delivered < limit:
+            await asyncio.sleep(interval)
+
+
+def create_alert(alert, session_id=None):
+    """
+    Store an alert rule.
+
+    Args:
+        alert (dict): Validated ``CreateAlertParams`` arguments.
+        session_id (str, optional): The chat session that created the rule.
+
+    Returns:
+        dict: The stored rule and the current value of its series.
+
+    Raises:
+        ValueError: If the webhook URL is not public or there is no stock
+            data for the symbol.
+    """
+    stock_symbol = alert["stockSymbol"]
+    webhook_url = alert.get("webhookUrl")
+    if webhook_url is not None:
+        webhook_url = str(webhook_url)
+        check_webhook_url(webhook_url)
+    bars = get_bar_history(stock_symbol)
+    if not bars.shape[1]:
+        raise ValueError(f"No stock data found for symbol: {stock_symbol}")
+    rule = build_rule(
+        stock_symbol,
+        alert["indicator"],
+        alert["operator"],
+        alert["threshold"],
+        webhook_url,
+        session_id,
+    )
+    values = compute_series(bars, rule["series"], rule["params"])
+
+    db = get_database()
+    ensure_index(
+        db, ALERT_RULES_COLLECTION, [("session_id", ASCENDING), ("created_at", DESCENDING)]
+    )
+    db[ALERT_RULES_COLLECTION].insert_one(rule)
+    logger.info("Created alert %s on %s: %s", rule["_id"], stock_symbol, rule["condition"])
+    current = values[-1]
+    return {**rule, "current_value": None if np.isnan(current) else float(current)}
+
+
+def list_alerts(session_id=None, active=None, limit=100):
+    """
+    Return alert rules, newest first.
+
+    Args:
+        session_id (str, optional): Only the rules of this session.
+        active (bool, optional): Only active (True) or triggered (False) rules.
+        limit (int): Maximum number of rules.
+    """
+    query = {}
+    if session_id is not None:
+        query["session_id"] = session_id
+    if active is not None:
+        query["active"] = active
+    cursor = get_database()[ALERT_RULES_COLLECTION].find(query)
+    return list(cursor.sort("created_at", DESCENDING).limit(limit))
+
+
+def list_triggered_alerts(session_id=None, limit=100):
+    """
+    Return triggered alerts from the outbox, newest first.
+    """
+    db = get_database()
+    ensure_index(
+        db, ALERTS_OUTBOX_COLLECTION, [("session_id", ASCENDING), ("created_at", DESCENDING)]
+    )
+    query = {} if session_id is None else {"session_id": session_id}
+    cursor = db[ALERTS_OUTBOX_COLLECTION].find(query)
+    return list(cursor.sort("created_at", DESCENDING).limit(limit))
+
+
+def delete_alert(alert_id):
+    """
+    Delete an alert rule.
+
+    Returns:
+        bool: Whether the rule existed.
+
+    Raises:
+        ValueError: If the id is not a valid alert id.
+    """
+    try:
+        rule_id = ObjectId(alert_id)
+    except InvalidId as e:
+        raise ValueError(f"Invalid alert id: {alert_id}") from e
+    result = get_database()[ALERT_RULES_COLLECTION].delete_one({"_id": rule_id})
+    return result.deleted_count > 0
+
+
+@register_tool(
+    "createAlert",
+    description="Create an alert that fires once when a stock's indicator meets a "
+    "condition at a daily close (e.g. RSI(14) below 30, or the close crossing above "
+    "its 200-day SMA). Alerts are checked each time new bars are ingested; triggered "
+    "alerts are stored for the session and posted to the webhook, if one is given. "
+    "Returns the alert id and the indicator's current value.",
+    params=CreateAlertParams,
+    mutating=True,
+)
+async def create_alert_tool(function_arguments):
+    rule = await asyncio.to_thread(
+        create_alert, function_arguments, current_session_id.get()
+    )
+    return {
+        "alertId": str(rule["_id"]),
+        "symbol": rule["symbol"],
+        "condition": rule["condition"],
+        "currentValue": rule["current_value"],
+        "webhookUrl": rule["webhook_url"],
+    }
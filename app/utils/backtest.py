@@ -0,0 +1,295 @@
+import asyncio
+from datetime import datetime, time, timezone
+import numpy as np
+from app.core.bar_store import CLOSE, DATE, HIGH, LOW, VOLUME
+from app.core.compute import get_compute_executor
+from app.core.database import get_database
+from app.core.logger import logging
+from app.tools.backtest_strategy import BacktestStrategyParams
+from app.tools.registry import register_tool
+from app.utils import indicator_series
+from app.utils.indicator_materializer import NIFTY50_COLLECTION
+from app.utils.stock_information import get_bar_history
+from app.utils.universe import requested_symbols
+
+logger = logging.getLogger(__name__)
+
+# Default parameters of each series, matching the defaults of the indicator tools
+SERIES_DEFAULTS = {
+    "sma": {"period": 50},
+    "ema": {"period": 20},
+    "rsi": {"period": 14},
+    "macd": {"shortPeriod": 12, "longPeriod": 26, "signalPeriod": 9},
+    "macdSignal": {"shortPeriod": 12, "longPeriod": 26, "signalPeriod": 9},
+    "macdHistogram": {"shortPeriod": 12, "longPeriod": 26, "signalPeriod": 9},
+    "bollingerUpper": {"period": 20, "multiplier": 2},
+    "bollingerMiddle": {"period": 20, "multiplier": 2},
+    "bollingerLower": {"period": 20, "multiplier": 2},
+    "stochasticK": {"period": 14},
+}
+
+_MACD_PARTS = {"macd": 0, "macdSignal": 1, "macdHistogram": 2}
+_BOLLINGER_PARTS = {"bollingerMiddle": 0, "bollingerUpper": 1, "bollingerLower": 2}
+
+
+def series_params(operand):
+    """
+    Return the full parameters of a series operand, with defaults filled in.
+
+    Args:
+        operand (dict): A validated ``SeriesOperand`` (``series`` and its
+            camelCase parameters; None for the defaults).
+
+    Returns:
+        dict: The parameters the series is computed with.
+    """
+    name = operand["series"]
+    params = dict(SERIES_DEFAULTS.get(name, {}))
+    params.update(
+        (key, value)
+        for key, value in operand.items()
+        if key in params and value is not None
+    )
+    return params
+
+
+def compute_series(bars, name, params):
+    """
+    Compute a series on every bar of a chronological bar array.
+
+    Returns:
+        numpy.ndarray: One value per bar, NaN during the indicator warm-up.
+    """
+    close = bars[CLOSE]
+    if name == "close":
+        return close
+    if name == "sma":
+        return indicator_series.sma(close, params["period"])
+    if name == "ema":
+        return indicator_series.ema(close, params["period"])
+    if name == "rsi":
+        return indicator_series.rsi(close, params["period"])
+    if name in _MACD_PARTS:
+        parts = indicator_series.macd(
+            close, params["shortPeriod"], params["longPeriod"], params["signalPeriod"]
+        )
+        return parts[_MACD_PARTS[name]]
+    if name in _BOLLINGER_PARTS:
+        parts = indicator_series.bollinger_bands(close, params["period"], params["multiplier"])
+        return parts[_BOLLINGER_PARTS[name]]
+    if name == "stochasticK":
+        return indicator_series.stochastic_k(bars[HIGH], bars[LOW], close, params["period"])
+    if name == "obv":
+        return indicator_series.obv(close, bars[VOLUME])
+    raise ValueError(f"Unknown series: {name}")
+
+
+def _series(bars, operand, cache):
+    if not isinstance(operand, dict):
+        return np.full(bars.shape[1], float(operand))
+    name = operand["series"]
+    params = series_params(operand)
+    # Conditions often share a series (e.g. RSI in both entry and exit)
+    key = (name, tuple(sorted(params.items())))
+    if key not in cache:
+        cache[key] = compute_series(bars, name, params)
+    return cache[key]
+
+
+def _evaluate(bars, condition, cache):
+    left = _series(bars, condition["left"], cache)
+    right = _series(bars, condition["right"], cache)
+    operator = condition["operator"]
+    # Comparisons with NaN (indicator warm-up) are False
+    with np.errstate(invalid="ignore"):
+        if operator == "<":
+            return left < right
+        if operator == "<=":
+            return left <= right
+        if operator == ">":
+            return left > right
+        if operator == ">=":
+            return left >= right
+        # A cross needs both sides known on the previous bar
+        known = np.concatenate(([False], ~np.isnan(left[:-1]) & ~np.isnan(right[:-1])))
+        if operator == "crossesAbove":
+            above = left > right
+            return above & known & ~np.concatenate(([False], above[:-1]))
+        if operator == "crossesBelow":
+            below = left < right
+            return below & known & ~np.concatenate(([False], below[:-1]))
+    raise ValueError(f"Unknown operator: {operator}")
+
+
+def _timestamp(value):
+    return datetime.combine(value, time(), tzinfo=timezone.utc).timestamp()
+
+
+def positions(entry, exit_):
+    """
+    Turn entry and exit signals into the position held after each close.
+
+    An entry opens a long position, an exit closes it and the position is
+    otherwise unchanged (entries win when both fire). Works along the last
+    axis, so many signal rows can be resolved at once.
+
+    Returns:
+        numpy.ndarray: 1.0 while long and 0.0 while flat.
+    """
+    events = np.full(entry.shape, np.nan)
+    events[exit_] = 0.0
+    events[entry] = 1.0
+    events[..., 0] = np.where(np.isnan(events[..., 0]), 0.0, events[..., 0])
+    index = np.broadcast_to(np.arange(entry.shape[-1]), entry.shape)
+    last_event = np.maximum.accumulate(np.where(np.isnan(events), 0, index), axis=-1)
+    return np.take_along_axis(events, last_event, axis=-1)
+
+
+def simulate(bars, strategy):
+    """
+    Simulate a long-only strategy on one symbol's bars.
+
+    Signals are evaluated at each daily close and the position is held from
+    the next bar, so there is no look-ahead. Indicators are computed over the
+    whole history so that they are warmed up at the start of the test window.
+
+    Args:
+        bars (numpy.ndarray): Chronological bars from ``get_bar_history``.
+        strategy (dict): Validated ``BacktestStrategyParams`` arguments.
+
+    Returns:
+        dict: Returns, drawdown, trade count and hit rate, or None when there
+        are not enough bars in the test window.
+    """
+    cache = {}
+    entry = np.logical_and.reduce([_evaluate(bars, c, cache) for c in strategy["entry"]])
+    exit_ = np.logical_or.reduce([_evaluate(bars, c, cache) for c in strategy["exit"]])
+
+    window = np.ones(bars.shape[1], dtype=bool)
+    if strategy.get("startDate"):
+        window &= bars[DATE] >= _timestamp(strategy["startDate"])
+    if strategy.get("endDate"):
+        window &= bars[DATE] < _timestamp(strategy["endDate"]) + 86400
+    close = bars[CLOSE][window]
+    if len(close) < 2:
+        return None
+    entry, exit_ = entry[window], exit_[window]
+
+    position = positions(entry, exit_)
+
+    turnover = np.abs(np.diff(position, prepend=0.0))
+    returns = (
+        position[:-1] * (close[1:] / close[:-1] - 1)
+        - turnover[:-1] * strategy.get("costBps", 0) / 10_000
+    )
+    equity = np.concatenate(([1.0], np.cumprod(1 + returns)))
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+
+    changes = np.diff(position, prepend=0.0)
+    entries = np.flatnonzero(changes > 0)
+    exits = np.flatnonzero(changes < 0)
+    if len(exits) < len(entries):
+        exits = np.append(exits, len(close) - 1)  # Still open at the end
+    trade_returns = equity[exits] / equity[entries] - 1
+    return {
+        "bars": int(len(close)),
+        "trades": int(len(entries)),
+        "wins": int((trade_returns > 0).sum()),
+        "totalReturn": float(equity[-1] - 1),
+        "buyAndHoldReturn": float(close[-1] / close[0] - 1),
+        "maxDrawdown": float(drawdown.min()),
+        "hitRate": float((trade_returns > 0).mean()) if len(entries) else None,
+        "exposure": float(position[:-1].mean()),
+    }
+
+
+def backtest_symbols(strategy, stock_symbols, *bars):
+    """
+    Simulate the strategy on several symbols, one after the other.
+
+    Runs on a compute worker. The bars are loaded by the API process and
+    passed as separate arrays, so they arrive through shared memory and the
+    worker never reads the bar store or MongoDB.
+    """
+    return [
+        (stock_symbol, simulate(history, strategy) if history.shape[1] else None)
+        for stock_symbol, history in zip(stock_symbols, bars)
+    ]
+
+
+async def run_backtest(strategy):
+    """
+    Simulate a strategy on every requested symbol in parallel.
+
+    The bars are loaded here and the symbols are split into one batch per
+    compute worker, so a backtest takes as few slots of the compute queue as
+    there are workers.
+
+    Args:
+        strategy (dict): Validated ``BacktestStrategyParams`` arguments.
+
+    Returns:
+        dict: Per-symbol results, best total return first, and a summary.
+    """
+    symbols = strategy.get("symbols") or await asyncio.to_thread(
+        get_database()[NIFTY50_COLLECTION].distinct, "Symbol"
+    )
+    histories = await asyncio.gather(
+        *(asyncio.to_thread(get_bar_history, symbol) for symbol in symbols)
+    )
+    executor = get_compute_executor()
+    batches = [
+        (symbols[index :: executor.max_workers], histories[index :: executor.max_workers])
+        for index in range(executor.max_workers)
+    ]
+    outcomes = [
+        outcome
+        for batch in await asyncio.gather(
+            *(
+                executor.run(backtest_symbols, strategy, batch, *bars)
+                for batch, bars in batches
+                if batch
+            )
+        )
+        for outcome in batch
+    ]
+
+    results = []
+    for symbol, result in outcomes:
+        if result is None:
+            logger.warning("Not enough data to backtest %s", symbol)
+            continue
+        results.append({"symbol": symbol, **result})
+    results.sort(key=lambda result: result["totalReturn"], reverse=True)
+
+    trades = sum(result["trades"] for result in results)
+    wins = sum(result["wins"] for result in results)
+    total_returns = [result["totalReturn"] for result in results]
+    summary = {
+        "symbols": len(results),
+        "trades": trades,
+        "hitRate": wins / trades if trades else None,
+        "averageReturn": float(np.mean(total_returns)) if results else None,
+        "medianReturn": float(np.median(total_returns)) if results else None,
+        "averageBuyAndHoldReturn": (
+            float(np.mean([result["buyAndHoldReturn"] for result in results]))
+            if results
+            else None
+        ),
+        "worstDrawdown": min((result["maxDrawdown"] for result in results), default=None),
+    }
+    return {"summary": summary, "results": results}
+
+
+@register_tool(
+    "backtestStrategy",
+    description="Backtest a long-only trading strategy defined by indicator rules "
+    "(e.g. enter when RSI < 30, exit when MACD crosses below its signal) on the "
+    "stored daily history of Nifty 50 stocks. Returns total return, maximum "
+    "drawdown and hit rate per stock and overall.",
+    params=BacktestStrategyParams,
+    cacheable=True,
+    symbols=requested_symbols,
+)
+async def backtest_strategy_tool(function_arguments):
+    return await run_backtest(function_arguments)
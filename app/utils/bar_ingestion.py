@@ -0,0 +1,176 @@
+from datetime import datetime, timezone
+from pymongo import ASCENDING, UpdateOne
+from app.core.bar_store import records_to_bars, write_bars
+from app.core.data_version import (
+    ADJUSTMENT_FACTORS_COLLECTION,
+    BAR_REVISIONS_COLLECTION,
+    bump_bar_revision,
+    fetch_data_version,
+    get_data_version,
+    latest_bar_date,
+    read_adjustment_factors,
+    set_data_version,
+)
+from app.core.database import ensure_index, get_database
+from app.core.logger import logging
+from app.utils.alerts import evaluate_alerts
+from app.utils.price_adjustment import CORPORATE_ACTIONS_COLLECTION, adjustment_factors
+
+logger = logging.getLogger(__name__)
+
+
+def ingest_bars(stock_symbol, bars):
+    """
+    Store new or corrected daily bars of a symbol.
+
+    The bars are upserted into the symbol's MongoDB collection by ``Date``.
+    When this changes stored bars rather than only appending newer ones (a
+    corrected historical or same-day bar, or a filled gap), the symbol's bar
+    revision is bumped, so its data version changes although its latest date
+    does not. Then the full history is written to the bar store, stamped with
+    the new data version, so workers can serve indicators from the mapped file
+    without reading MongoDB. Finally the symbol's alert rules are evaluated on
+    the new bars; triggered alerts are queued in the outbox, from which the
+    webhook dispatcher sends them.
+
+    Args:
+        stock_symbol (str): The stock symbol, which is also its collection name.
+        bars (list): Bar dicts with ``Date``, ``Open``, ``High``, ``Low``,
+            ``Close`` and ``Volume`` keys.
+
+    Returns:
+        int: The number of bars stored for the symbol after ingestion.
+    """
+    db = get_database()
+    collection = db[stock_symbol]
+    if bars:
+        ensure_index(db, stock_symbol, [("Date", ASCENDING)])
+        latest = latest_bar_date(db, stock_symbol)
+        result = collection.bulk_write(
+            [UpdateOne({"Date": bar["Date"]}, {"$set": bar}, upsert=True) for bar in bars],
+            ordered=False,
+        )
+        if rewrites_history(bars, result, latest):
+            ensure_index(db, BAR_REVISIONS_COLLECTION, [("symbol", ASCENDING)], unique=True)
+            revision = bump_bar_revision(db, stock_symbol)
+            logger.info("Stored bars of %s were rewritten, bar revision %d", stock_symbol, revision)
+
+    stored = _publish(db, stock_symbol)
+    logger.info(
+        "Ingested %d bar(s) for %s, now at version %s",
+        len(bars),
+        stock_symbol,
+        get_data_version(db, stock_symbol),
+    )
+    if stored:
+        try:
+            evaluate_alerts([stock_symbol])
+        except Exception as e:
+            # The bars are stored; alerts are evaluated again on the next ingestion
+            logger.error("Failed to evaluate alerts for %s: %s", stock_symbol, e, exc_info=True)
+    return stored
+
+
+def rewrites_history(bars, result, latest):
+    """
+    Tell whether an upsert of bars changed the symbol's stored history rather
+    than only appending bars after it.
+
+    Args:
+        bars (list): The upserted bar dicts, in the order they were written.
+        result (BulkWriteResult): The result of the upsert.
+        latest (datetime): The date of the latest bar before the upsert, or
+            None if there was none.
+
+    Returns:
+        bool: True if an existing bar was modified or a bar was inserted on
+        or before ``latest``.
+    """
+    if result.modified_count:
+        return True
+    return latest is not None and any(
+        bars[index]["Date"] <= latest for index in result.upserted_ids
+    )
+
+
+def ingest_corporate_actions(stock_symbol, actions):
+    """
+    Store splits and dividends of a symbol and rebuild its adjustment factors.
+
+    The factors are derived once from all of the symbol's corporate actions
+    and stored with a new revision, which is part of the symbol's data
+    version: cached results of this symbol become stale, while every other
+    symbol's caches are untouched.
+
+    Args:
+        stock_symbol (str): The stock symbol.
+        actions (list): Dicts with ``date`` (the ex-date), ``type`` (``split``
+            or ``dividend``) and ``ratio`` (new shares per share) or
+            ``amount`` (dividend per share).
+
+    Returns:
+        dict: The stored adjustment factors.
+
+    Raises:
+        ValueError: If an action has an unknown type or no ratio/amount.
+    """
+    for action in actions:
+        field = {"split": "ratio", "dividend": "amount"}.get(action.get("type"))
+        if field is None or not action.get(field):
+            raise ValueError(f"Invalid corporate action for {stock_symbol}: {action}")
+
+    db = get_database()
+    collection = db[CORPORATE_ACTIONS_COLLECTION]
+    ensure_index(
+        db,
+        CORPORATE_ACTIONS_COLLECTION,
+        [("symbol", ASCENDING), ("date", ASCENDING), ("type", ASCENDING)],
+        unique=True,
+    )
+    if actions:
+        collection.bulk_write(
+            [
+                UpdateOne(
+                    {"symbol": stock_symbol, "date": action["date"], "type": action["type"]},
+                    {"$set": {**action, "symbol": stock_symbol}},
+                    upsert=True,
+                )
+                for action in actions
+            ],
+            ordered=False,
+        )
+
+    bars = records_to_bars(list(db[stock_symbol].find({}, {"_id": 0})))
+    factors = adjustment_factors(
+        bars, list(collection.find({"symbol": stock_symbol}, {"_id": 0}))
+    )
+    previous = read_adjustment_factors(db, stock_symbol)
+    factors["revision"] = (previous["revision"] if previous else 0) + 1
+    ensure_index(db, ADJUSTMENT_FACTORS_COLLECTION, [("symbol", ASCENDING)], unique=True)
+    db[ADJUSTMENT_FACTORS_COLLECTION].replace_one(
+        {"symbol": stock_symbol},
+        {"symbol": stock_symbol, **factors, "updated_at": datetime.now(timezone.utc)},
+        upsert=True,
+    )
+
+    _publish(db, stock_symbol)
+    logger.info(
+        "Ingested %d corporate action(s) for %s, adjustment revision %d",
+        len(actions),
+        stock_symbol,
+        factors["revision"],
+    )
+    return factors
+
+
+def _publish(db, stock_symbol):
+    # Rewrite the bar store and record the new data version of a symbol
+    stock_data = list(db[stock_symbol].find({}, {"_id": 0}).sort("Date", -1))
+    if not stock_data:
+        logger.warning("No stock data found for symbol: %s", stock_symbol)
+        return 0
+
+    version = fetch_data_version(db, stock_symbol)
+    write_bars(stock_symbol, stock_data, version, read_adjustment_factors(db, stock_symbol))
+    set_data_version(stock_symbol, version)
+    return len(stock_data)
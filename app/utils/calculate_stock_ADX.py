@@ -1,4 +1,5 @@
-from app.utils.stock_information import stock_collection
+from app.tools.get_stock_adx import GetStockADXParams
+from app.tools.registry import call_tool, register_indicator
 from app.core.logger import logging
 
 logger = logging.getLogger(__name__)
@@ -15,7 +16,7 @@ def calculate_adx(data, period=14):
     """
     Calculate ADX for given stock data over specified period
     """
-    logger.info("Starting ADX calculation for period: %s", period)
+    logger.debug("Starting ADX calculation for period: %s", period)
     if len(data) < period + 1:
         logger.warning("Not enough data to calculate ADX. Data length: %s", len(data))
         return "Not enough data to calculate ADX"
@@ -72,39 +73,27 @@ def calculate_adx(data, period=14):
     )
     adx = dx  # For this simplified version, ADX equals DX for the initial period
 
-    logger.info("ADX calculation completed. ADX: %s", adx)
+    logger.debug("ADX calculation completed. ADX: %s", adx)
     return adx
 
 
-async def calculate_stock_adx(function_arguments):
+@register_indicator(
+    "getStockADX",
+    description="The Average Directional Index (ADX) is a technical analysis indicator used to quantify the strength of a trend.",
+    params=GetStockADXParams,
+    lookback=lambda arguments: arguments["period"] + 1,
+)
+def compute_stock_adx(stock_data, function_arguments):
     """
-    Calculate ADX for a given stock symbol
+    Build the ADX output from stock data sorted newest first
     """
-    try:
-        logger.info("Calculating ADX... %s", function_arguments)
-        stock_symbol = function_arguments["stockSymbol"]
-        period = function_arguments.get("period", 14)
-
-        logger.info(
-            "Calculating ADX for stock: %s with period: %s", stock_symbol, period
-        )
-
-        # Get stock collection
-        collection = await stock_collection(stock_symbol)
-        logger.info("Collection for stock %s: %s", stock_symbol, collection.name)
-
-        # Get stock data sorted by date in descending order
-        stock_data = list(collection.find().sort("Date", -1))
+    period = function_arguments.get("period", 14)
+    adx_value = calculate_adx(stock_data, period)
+    return {"adxValue": adx_value, "period": period, "description": DESCRIPTION}
 
-        # Calculate ADX
-        adx_value = calculate_adx(stock_data, period)
 
-        logger.info("ADX calculated successfully for stock: %s", stock_symbol)
-        return {"adxValue": adx_value, "period": period, "description": DESCRIPTION}
-
-    except KeyError as e:
-        logger.error("Missing key in function_arguments: %s", str(e))
-        raise Exception(f"Missing key in function_arguments: {str(e)}")
-    except Exception as e:
-        logger.error("Error calculating ADX: %s", str(e))
-        raise Exception(f"Error calculating ADX: {str(e)}")
+async def calculate_stock_adx(function_arguments):
+    """
+    Calculate ADX for a given stock symbol
+    """
+    return await call_tool("getStockADX", function_arguments)
@@ -1,5 +1,8 @@
-from app.utils.stock_information import stock_collection
+from app.tools.get_stock_bollinger_bands import GetStockBollingerBandsParams
+from app.tools.registry import call_tool, register_indicator
+from app.core.bar_store import CLOSE
 from app.core.logger import logging
+from app.utils import indicator_series
 import math
 
 logger = logging.getLogger(__name__)
@@ -20,74 +23,57 @@ def calculate_bollinger_bands(data, period=20, multiplier=2):
     if len(data) < period:
         return "Not enough data to calculate Bollinger Bands"
 
-    moving_averages = []
-    standard_deviations = []
-    upper_bands = []
-    lower_bands = []
+    # Only the newest window is reported, so it is the only one computed
+    window = data[:period]
 
-    # Calculate SMA, std dev, and bands for each window
-    for i in range(len(data) - period + 1):
-        # Calculate Simple Moving Average
-        window = data[i:i + period]
-        sma = sum(item["Close"] for item in window) / period
-        moving_averages.append(sma)
+    # Calculate Simple Moving Average
+    sma = sum(item["Close"] for item in window) / period
 
-        # Calculate variance and standard deviation
-        squared_differences = [(item["Close"] - sma) ** 2 for item in window]
-        variance = sum(squared_differences) / period
-        std_dev = math.sqrt(variance)
-        standard_deviations.append(std_dev)
-
-        # Calculate upper and lower bands
-        upper_bands.append(sma + multiplier * std_dev)
-        lower_bands.append(sma - multiplier * std_dev)
+    # Calculate variance and standard deviation
+    squared_differences = [(item["Close"] - sma) ** 2 for item in window]
+    variance = sum(squared_differences) / period
+    std_dev = math.sqrt(variance)
 
     # Return the latest values
-    latest_index = len(moving_averages) - 1
     return {
-        "movingAverage": moving_averages[latest_index],
-        "upperBand": upper_bands[latest_index],
-        "lowerBand": lower_bands[latest_index]
+        "movingAverage": sma,
+        "upperBand": sma + multiplier * std_dev,
+        "lowerBand": sma - multiplier * std_dev
     }
 
-async def calculate_stock_bollinger_bands(function_arguments):
+def bollinger_bands_series(bars, function_arguments):
     """
-    Calculate Bollinger Bands for a given stock symbol
+    Build the Bollinger Bands of every bar, oldest first
     """
-    try:
-        logger.info("Calculating Bollinger Bands... %s", function_arguments)
-        stock_symbol = function_arguments["stockSymbol"]
-        period = function_arguments.get("period", 20)
-        multiplier = function_arguments.get("multiplier", 2)
-
-        logger.info(
-            "Calculating Bollinger Bands for stock: %s with period: %s and multiplier: %s",
-            stock_symbol,
-            period,
-            multiplier
-        )
-
-        # Get stock collection
-        collection = await stock_collection(stock_symbol)
-        logger.info("Collection for stock %s: %s", stock_symbol, collection.name)
-
-        # Get stock data sorted by date in descending order
-        stock_data = list(collection.find().sort("Date", -1))
-
-        # Calculate Bollinger Bands
-        bollinger_bands_data = calculate_bollinger_bands(stock_data, period, multiplier)
+    middle, upper, lower = indicator_series.bollinger_bands(
+        bars[CLOSE], function_arguments.get("period", 20), function_arguments.get("multiplier", 2)
+    )
+    return {"movingAverage": middle, "upperBand": upper, "lowerBand": lower}
+
+@register_indicator(
+    "getStockBollingerBands",
+    description="Get the Bollinger Bands of the stock based on the symbol and period.",
+    params=GetStockBollingerBandsParams,
+    lookback=lambda arguments: arguments["period"],
+    series=bollinger_bands_series,
+)
+def compute_stock_bollinger_bands(stock_data, function_arguments):
+    """
+    Build the Bollinger Bands output from stock data sorted newest first
+    """
+    period = function_arguments.get("period", 20)
+    multiplier = function_arguments.get("multiplier", 2)
+    bollinger_bands_data = calculate_bollinger_bands(stock_data, period, multiplier)
+    return {
+        "bollingerBandsData": bollinger_bands_data,
+        "period": period,
+        "multiplier": multiplier,
+        "description": DESCRIPTION
+    }
 
-        logger.info("Bollinger Bands calculated successfully for stock: %s", stock_symbol)
-        return {
-            "bollingerBandsData": bollinger_bands_data,
-            "period": period,
-            "multiplier": multiplier,
-            "description": DESCRIPTION
-        }
 
-    except KeyError as e:
-        logger.error("Missing key in function_arguments: %s", str(e))
-        raise Exception(f"Missing key in function_arguments: {str(e)}")
-    except Exception as e:
-        logger.error("Error calculating Bollinger Bands: %s", str(e))
-        raise Exception(f"Error calculating Bollinger Bands: {str(e)}")
\ No newline at end of file
+async def calculate_stock_bollinger_bands(function_arguments):
+    """
+    Calculate Bollinger Bands for a given stock symbol
+    """
+    return await call_tool("getStockBollingerBands", function_arguments)
@@ -1,5 +1,8 @@
-from app.utils.stock_information import stock_collection
+from app.tools.get_stock_ma import GetStockMAParams
+from app.tools.registry import call_tool, register_indicator
+from app.core.bar_store import CLOSE
 from app.core.logger import logging
+from app.utils import indicator_series
 
 
 logger = logging.getLogger(__name__)
@@ -24,41 +27,30 @@ def calculate_moving_average(data, period):
     return sum_prices / period
 
 
-async def calculate_stock_ma(function_arguments):
+@register_indicator(
+    "getStockMA",
+    description="Get the Moving Average (MA) of the stock based on the symbol and period. The period is optional and defaults to 50 days.",
+    params=GetStockMAParams,
+    lookback=lambda arguments: arguments["period"],
+    series=lambda bars, arguments: {
+        "moving_average": indicator_series.sma(bars[CLOSE], arguments["period"])
+    },
+)
+def compute_stock_ma(stock_data, function_arguments):
     """
-    Calculate moving average for a given stock symbol
+    Build the moving average output from stock data sorted newest first
     """
-    try:
-        logger.info("Calculating moving average... %s", function_arguments)
-        # Access as dictionary keys
-        stock_symbol = function_arguments["stockSymbol"]
-        period = function_arguments.get("period", 50)
-
-        logger.info(
-            "Calculating moving average for stock: %s with period: %s",
-            stock_symbol,
-            period,
-        )
-
-        collection = await stock_collection(stock_symbol)
-        logger.info("Collection for stock %s: %s", stock_symbol, collection.name)
-        # Get stock data sorted by date in descending order
-        stock_data = list(collection.find().sort("Date", -1))
+    period = function_arguments.get("period", 50)
+    moving_average = calculate_moving_average(stock_data, period)
+    return {
+        "moving_average": moving_average,
+        "period": period,
+        "description": DESCRIPTION,
+    }
 
-        # Calculate moving average
-        moving_average = calculate_moving_average(stock_data, period)
 
-        logger.info(
-            "Moving average calculated successfully for stock: %s", stock_symbol
-        )
-        return {
-            "moving_average": moving_average,
-            "period": period,
-            "description": DESCRIPTION,
-        }
-    except KeyError as e:
-        logger.error("Missing key in function_arguments: %s", str(e))
-        raise Exception(f"Missing key in function_arguments: {str(e)}")
-    except Exception as e:
-        logger.error("Error calculating stock MA: %s", str(e))
-        raise Exception(f"Error calculating stock MA: {str(e)}")
+async def calculate_stock_ma(function_arguments):
+    """
+    Calculate moving average for a given stock symbol
+    """
+    return await call_tool("getStockMA", function_arguments)
@@ -1,5 +1,9 @@
-from app.utils.stock_information import stock_collection
+from app.tools.get_stock_macd import GetStockMACDParams
+from app.tools.registry import call_tool, register_indicator
+import numpy as np
+from app.core.bar_store import CLOSE, BarRecords, records_to_bars
 from app.core.logger import logging
+from app.utils import indicator_series
 
 logger = logging.getLogger(__name__)
 
@@ -13,88 +17,46 @@ Additionally, the distance between the MACD line and the signal line can provide
 """
 
 
-def calculate_ema(data, period):
+def macd_series(bars, function_arguments):
     """
-    Calculate Exponential Moving Average for given data and period
+    Build the MACD line, signal line and histogram of every bar, oldest first
     """
-    k = 2 / (period + 1)
-    ema_array = [data[0]["Close"]]  # Start with the first closing price
-
-    for i in range(1, len(data)):
-        ema = data[i]["Close"] * k + ema_array[i - 1] * (1 - k)
-        ema_array.append(ema)
-
-    return ema_array
+    macd_line, signal_line, macd_histogram = indicator_series.macd(
+        bars[CLOSE],
+        function_arguments.get("shortPeriod", 12),
+        function_arguments.get("longPeriod", 26),
+        function_arguments.get("signalPeriod", 9),
+    )
+    return {"macdLine": macd_line, "signalLine": signal_line, "macdHistogram": macd_histogram}
 
 
-def calculate_macd(data, short_period=12, long_period=26, signal_period=9):
+@register_indicator(
+    "getStockMACD",
+    description="Get the MACD of the stock based on the symbol and the short, long, and signal periods.",
+    params=GetStockMACDParams,
+    series=macd_series,
+    cpu_heavy=True,
+)
+def compute_stock_macd(stock_data, function_arguments):
     """
-    Calculate MACD components for given stock data
+    Build the MACD output from stock data sorted newest first
     """
-    if len(data) < long_period:
-        return "Not enough data to calculate MACD"
-
-    # Calculate short and long EMAs
-    short_ema = calculate_ema(data, short_period)
-    long_ema = calculate_ema(data, long_period)
-
-    # Calculate MACD line
-    macd_line = [short - long for short, long in zip(short_ema, long_ema)]
-
-    # Calculate signal line using the MACD line
-    signal_start_index = long_period - short_period
-    signal_line = calculate_ema(
-        [{"Close": x} for x in macd_line[signal_start_index:]], signal_period
+    bars = (
+        stock_data.to_bars()
+        if isinstance(stock_data, BarRecords)
+        else records_to_bars(stock_data)
     )
-
-    # Calculate MACD histogram
-    macd_histogram = [
-        macd - signal
-        for macd, signal in zip(macd_line[signal_start_index:], signal_line)
-    ]
-
-    return {
-        "macdLine": macd_line[signal_start_index:],
-        "signalLine": signal_line,
-        "macdHistogram": macd_histogram,
-    }
+    # The EMAs run oldest first, exactly as the REST series does
+    series = macd_series(bars, function_arguments)
+    known = ~np.isnan(series["signalLine"])
+    if not known.any():
+        return {"macd": "Not enough data to calculate MACD", "description": DESCRIPTION}
+    macd = {field: values[known][::-1].tolist() for field, values in series.items()}
+    return {"macd": macd, "description": DESCRIPTION}
 
 
 async def calculate_stock_macd(function_arguments):
     """
     Calculate MACD for a given stock symbol
     """
-    try:
-        logger.info("Calculating MACD... %s", function_arguments)
-        stock_symbol = function_arguments["stockSymbol"]
-        short_period = function_arguments.get("shortPeriod", 12)
-        long_period = function_arguments.get("longPeriod", 26)
-        signal_period = function_arguments.get("signalPeriod", 9)
-
-        logger.info(
-            "Calculating MACD for stock: %s with periods: %s, %s, %s",
-            stock_symbol,
-            short_period,
-            long_period,
-            signal_period,
-        )
-
-        # Get stock collection
-        collection = await stock_collection(stock_symbol)
-        logger.info("Collection for stock %s: %s", stock_symbol, collection.name)
-
-        # Get stock data sorted by date in descending order
-        stock_data = list(collection.find().sort("Date", -1))
-
-        # Calculate MACD
-        macd = calculate_macd(stock_data, short_period, long_period, signal_period)
-
-        logger.info("MACD calculated successfully for stock: %s", stock_symbol)
-        return {"macd": macd, "description": DESCRIPTION}
-
-    except KeyError as e:
-        logger.error("Missing key in function_arguments: %s", str(e))
-        raise Exception(f"Missing key in function_arguments: {str(e)}")
-    except Exception as e:
-        logger.error("Error calculating stock MACD: %s", str(e))
-        raise Exception(f"Error calculating stock MACD: {str(e)}")
+    return await call_tool("getStockMACD", function_arguments)
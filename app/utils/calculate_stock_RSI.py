@@ -1,5 +1,8 @@
-from app.utils.stock_information import stock_collection
+from app.tools.get_stock_rsi import GetStockRSIParams
+from app.tools.registry import call_tool, register_indicator
+from app.core.bar_store import CLOSE
 from app.core.logger import logging
+from app.utils import indicator_series
 
 logger = logging.getLogger(__name__)
 
@@ -14,12 +17,15 @@ RSI is calculated using the average gains and losses over a specified period, co
 def calculate_average_gain_loss(stock_data, period):
     """
     Calculate average gain and loss over the specified period
+
+    The data is sorted newest first, so each change is the newer close minus
+    the one before it.
     """
     gains = 0
     losses = 0
 
     for i in range(1, period + 1):
-        change = stock_data[i]["Close"] - stock_data[i - 1]["Close"]
+        change = stock_data[i - 1]["Close"] - stock_data[i]["Close"]
         if change > 0:
             gains += change
         else:
@@ -31,64 +37,36 @@ def calculate_average_gain_loss(stock_data, period):
     return {"averageGain": average_gain, "averageLoss": average_loss}
 
 
-async def calculate_stock_rsi(function_arguments):
+@register_indicator(
+    "getStockRSI",
+    description="Get the RSI of the stock based on the symbol and period. The period is optional and defaults to 14.",
+    params=GetStockRSIParams,
+    lookback=lambda arguments: arguments["period"] + 1,
+    series=lambda bars, arguments: {
+        "rsi": indicator_series.rsi(bars[CLOSE], arguments["period"])
+    },
+)
+def compute_stock_rsi(stock_data, function_arguments):
     """
-    Calculate RSI for a given stock symbol
+    Build the RSI output from stock data sorted newest first
     """
-    try:
-        logger.info("Calculating RSI... %s", function_arguments)
-        stock_symbol = function_arguments["stockSymbol"]
-        period = function_arguments.get("period", 14)
-
-        logger.info(
-            "Calculating RSI for stock: %s with period: %s", stock_symbol, period
-        )
-
-        # Get stock collection
-        collection = await stock_collection(stock_symbol)
-        logger.info("Collection for stock %s: %s", stock_symbol, collection.name)
-
-        # Get stock data sorted by date in descending order
-        stock_data = list(collection.find().sort("Date", -1))
-
-        if len(stock_data) < period:
-            raise Exception("Not enough data points to calculate RSI")
+    period = function_arguments.get("period", 14)
+    if len(stock_data) < period + 1:
+        raise Exception("Not enough data points to calculate RSI")
 
-        # Calculate initial RSI
-        averages = calculate_average_gain_loss(stock_data, period)
-        rs = (
-            averages["averageGain"] / averages["averageLoss"]
-            if averages["averageLoss"] != 0
-            else float("inf")
-        )
-        rsi = 100 - (100 / (1 + rs)) if rs != float("inf") else 100
+    # Calculate initial RSI
+    averages = calculate_average_gain_loss(stock_data, period)
+    rs = (
+        averages["averageGain"] / averages["averageLoss"]
+        if averages["averageLoss"] != 0
+        else float("inf")
+    )
+    rsi = 100 - (100 / (1 + rs)) if rs != float("inf") else 100
+    return {"rsi": rsi, "description": DESCRIPTION, "period": period}
 
-        # Uncomment and adapt this section if you want to calculate RSI for all periods
-        """
-        rsi_array = []
-        avg_gain = averages["averageGain"]
-        avg_loss = averages["averageLoss"]
 
-        for i in range(period + 1, len(stock_data)):
-            change = stock_data[i]["Close"] - stock_data[i - 1]["Close"]
-            if change > 0:
-                avg_gain = (avg_gain * (period - 1) + change) / period
-                avg_loss = (avg_loss * (period - 1)) / period
-            else:
-                avg_gain = (avg_gain * (period - 1)) / period
-                avg_loss = (avg_loss * (period - 1) - change) / period
-            
-            rs = avg_gain / avg_loss if avg_loss != 0 else float('inf')
-            current_rsi = 100 - (100 / (1 + rs)) if rs != float('inf') else 100
-            rsi_array.append({"Date": stock_data[i]["Date"], "RSI": current_rsi})
-        """
-
-        logger.info("RSI calculated successfully for stock: %s", stock_symbol)
-        return {"rsi": rsi, "description": DESCRIPTION, "period": period}
-
-    except KeyError as e:
-        logger.error("Missing key in function_arguments: %s", str(e))
-        raise Exception(f"Missing key in function_arguments: {str(e)}")
-    except Exception as e:
-        logger.error("Error calculating RSI: %s", str(e))
-        raise Exception(f"Error calculating RSI: {str(e)}")
+async def calculate_stock_rsi(function_arguments):
+    """
+    Calculate RSI for a given stock symbol
+    """
+    return await call_tool("getStockRSI", function_arguments)
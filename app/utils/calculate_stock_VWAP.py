@@ -1,4 +1,5 @@
-from app.utils.stock_information import stock_collection
+from app.tools.get_stock_vwap import GetStockVWAPParams
+from app.tools.registry import call_tool, register_indicator
 from app.core.logger import logging
 
 logger = logging.getLogger(__name__)
@@ -32,32 +33,22 @@ def calculate_vwap(data):
     return vwap
 
 
-async def calculate_stock_vwap(function_arguments):
+@register_indicator(
+    "getStockVWAP",
+    description="Get the Volume Weighted Average Price (VWAP) of the stock based on the symbol.",
+    params=GetStockVWAPParams,
+    lookback=lambda arguments: 1,
+)
+def compute_stock_vwap(stock_data, function_arguments):
     """
-    Calculate VWAP for a given stock symbol
+    Build the VWAP output from stock data sorted newest first
     """
-    try:
-        logger.info("Calculating VWAP... %s", function_arguments)
-        stock_symbol = function_arguments["stockSymbol"]
-
-        logger.info("Calculating VWAP for stock: %s", stock_symbol)
-
-        # Get stock collection
-        collection = await stock_collection(stock_symbol)
-        logger.info("Collection for stock %s: %s", stock_symbol, collection.name)
-
-        # Get stock data sorted by date in descending order
-        stock_data = list(collection.find().sort("Date", -1))
+    vwap_value = calculate_vwap(stock_data)
+    return {"vwapValue": vwap_value, "description": DESCRIPTION}
 
-        # Calculate VWAP
-        vwap_value = calculate_vwap(stock_data)
 
-        logger.info("VWAP calculated successfully for stock: %s", stock_symbol)
-        return {"vwapValue": vwap_value, "description": DESCRIPTION}
-
-    except KeyError as e:
-        logger.error("Missing key in function_arguments: %s", str(e))
-        raise Exception(f"Missing key in function_arguments: {str(e)}")
-    except Exception as e:
-        logger.error("Error calculating VWAP: %s", str(e))
-        raise Exception(f"Error calculating VWAP: {str(e)}")
+async def calculate_stock_vwap(function_arguments):
+    """
+    Calculate VWAP for a given stock symbol
+    """
+    return await call_tool("getStockVWAP", function_arguments)
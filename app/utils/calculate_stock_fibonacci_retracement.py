@@ -1,4 +1,5 @@
-from app.utils.stock_information import stock_collection
+from app.tools.get_stock_fibonacci_retracement import GetStockFibonacciRetracementParams
+from app.tools.registry import call_tool, register_indicator
 from app.core.logger import logging
 
 logger = logging.getLogger(__name__)
@@ -40,38 +41,24 @@ def calculate_fibonacci_retracement(data):
 
     return retracement_levels
 
+@register_indicator(
+    "getStockFibonacciRetracement",
+    description="Get the Fibonacci Retracement levels of the stock based on the symbol.",
+    params=GetStockFibonacciRetracementParams,
+    cpu_heavy=True,
+)
+def compute_stock_fibonacci_retracement(stock_data, function_arguments):
+    """
+    Build the Fibonacci Retracement output from stock data sorted newest first
+    """
+    retracement_levels = calculate_fibonacci_retracement(stock_data)
+    return {
+        "retracementLevels": retracement_levels,
+        "description": DESCRIPTION
+    }
+
 async def calculate_stock_fibonacci_retracement(function_arguments):
     """
     Calculate Fibonacci Retracement levels for a given stock symbol
     """
-    try:
-        logger.info("Calculating Fibonacci Retracement... %s", function_arguments)
-        stock_symbol = function_arguments["stockSymbol"]
-
-        logger.info(
-            "Calculating Fibonacci Retracement for stock: %s",
-            stock_symbol
-        )
-
-        # Get stock collection
-        collection = await stock_collection(stock_symbol)
-        logger.info("Collection for stock %s: %s", stock_symbol, collection.name)
-
-        # Get stock data sorted by date in descending order
-        stock_data = list(collection.find().sort("Date", -1))
-
-        # Calculate Fibonacci Retracement levels
-        retracement_levels = calculate_fibonacci_retracement(stock_data)
-
-        logger.info("Fibonacci Retracement calculated successfully for stock: %s", stock_symbol)
-        return {
-            "retracementLevels": retracement_levels,
-            "description": DESCRIPTION
-        }
-
-    except KeyError as e:
-        logger.error("Missing key in function_arguments: %s", str(e))
-        raise Exception(f"Missing key in function_arguments: {str(e)}")
-    except Exception as e:
-        logger.error("Error calculating Fibonacci Retracement: %s", str(e))
-        raise Exception(f"Error calculating Fibonacci Retracement: {str(e)}")
\ No newline at end of file
+    return await call_tool("getStockFibonacciRetracement", function_arguments)
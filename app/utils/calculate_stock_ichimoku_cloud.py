@@ -1,4 +1,5 @@
-from app.utils.stock_information import stock_collection
+from app.tools.get_stock_ichimoku_cloud import GetStockIchimokuCloudParams
+from app.tools.registry import call_tool, register_indicator
 from app.core.logger import logging
 
 logger = logging.getLogger(__name__)
@@ -61,34 +62,22 @@ def calculate_ichimoku_cloud(data):
     }
 
 
-async def calculate_stock_ichimoku_cloud(function_arguments):
+@register_indicator(
+    "getStockIchimokuCloud",
+    description="Get the Ichimoku Cloud values of the stock based on the symbol.",
+    params=GetStockIchimokuCloudParams,
+    lookback=lambda arguments: 52,
+)
+def compute_stock_ichimoku_cloud(stock_data, function_arguments):
     """
-    Calculate Ichimoku Cloud for a given stock symbol
+    Build the Ichimoku Cloud output from stock data sorted newest first
     """
-    try:
-        logger.info("Calculating Ichimoku Cloud... %s", function_arguments)
-        stock_symbol = function_arguments["stockSymbol"]
-
-        logger.info("Calculating Ichimoku Cloud for stock: %s", stock_symbol)
-
-        # Get stock collection
-        collection = await stock_collection(stock_symbol)
-        logger.info("Collection for stock %s: %s", stock_symbol, collection.name)
-
-        # Get stock data sorted by date in descending order
-        stock_data = list(collection.find().sort("Date", -1))
+    ichimoku_cloud = calculate_ichimoku_cloud(stock_data)
+    return {"ichimokuCloud": ichimoku_cloud, "description": DESCRIPTION}
 
-        # Calculate Ichimoku Cloud
-        ichimoku_cloud = calculate_ichimoku_cloud(stock_data)
 
-        logger.info(
-            "Ichimoku Cloud calculated successfully for stock: %s", stock_symbol
-        )
-        return {"ichimokuCloud": ichimoku_cloud, "description": DESCRIPTION}
-
-    except KeyError as e:
-        logger.error("Missing key in function_arguments: %s", str(e))
-        raise Exception(f"Missing key in function_arguments: {str(e)}")
-    except Exception as e:
-        logger.error("Error calculating Ichimoku Cloud: %s", str(e))
-        raise Exception(f"Error calculating Ichimoku Cloud: {str(e)}")
+async def calculate_stock_ichimoku_cloud(function_arguments):
+    """
+    Calculate Ichimoku Cloud for a given stock symbol
+    """
+    return await call_tool("getStockIchimokuCloud", function_arguments)
@@ -1,4 +1,5 @@
-from app.utils.stock_information import stock_collection
+from app.tools.get_stock_obv import GetStockOBVParams
+from app.tools.registry import call_tool, register_indicator
 from app.core.logger import logging
 
 logger = logging.getLogger(__name__)
@@ -30,35 +31,24 @@ def calculate_obv(data):
 
     return obv
 
+@register_indicator(
+    "getStockOBV",
+    description="Get the On-Balance Volume (OBV) of the stock based on the symbol.",
+    params=GetStockOBVParams,
+    lookback=lambda arguments: 2,
+)
+def compute_stock_obv(stock_data, function_arguments):
+    """
+    Build the OBV output from stock data sorted newest first
+    """
+    obv_values = calculate_obv(stock_data)
+    return {
+        "obvValues": obv_values,
+        "description": DESCRIPTION
+    }
+
 async def calculate_stock_obv(function_arguments):
     """
     Calculate OBV for a given stock symbol
     """
-    try:
-        logger.info("Calculating OBV... %s", function_arguments)
-        stock_symbol = function_arguments["stockSymbol"]
-
-        logger.info("Calculating OBV for stock: %s", stock_symbol)
-
-        # Get stock collection
-        collection = await stock_collection(stock_symbol)
-        logger.info("Collection for stock %s: %s", stock_symbol, collection.name)
-
-        # Get stock data sorted by date in descending order
-        stock_data = list(collection.find().sort("Date", -1))
-
-        # Calculate OBV
-        obv_values = calculate_obv(stock_data)
-
-        logger.info("OBV calculated successfully for stock: %s", stock_symbol)
-        return {
-            "obvValues": obv_values,
-            "description": DESCRIPTION
-        }
-
-    except KeyError as e:
-        logger.error("Missing key in function_arguments: %s", str(e))
-        raise Exception(f"Missing key in function_arguments: {str(e)}")
-    except Exception as e:
-        logger.error("Error calculating OBV: %s", str(e))
-        raise Exception(f"Error calculating OBV: {str(e)}")
\ No newline at end of file
+    return await call_tool("getStockOBV", function_arguments)
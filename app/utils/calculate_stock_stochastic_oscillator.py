@@ -1,4 +1,5 @@
-from app.utils.stock_information import stock_collection
+from app.tools.get_stock_stochastic_oscillator import GetStockStochasticOscillatorParams
+from app.tools.registry import call_tool, register_indicator
 from app.core.logger import logging
 
 logger = logging.getLogger(__name__)
@@ -33,34 +34,22 @@ def calculate_stochastic_oscillator(data):
     return percent_k
 
 
-async def calculate_stock_stochastic_oscillator(function_arguments):
+@register_indicator(
+    "getStockStochasticOscillator",
+    description="Get the Stochastic Oscillator of the stock based on the symbol and period.",
+    params=GetStockStochasticOscillatorParams,
+    cpu_heavy=True,
+)
+def compute_stock_stochastic_oscillator(stock_data, function_arguments):
     """
-    Calculate Stochastic Oscillator %K for a given stock symbol
+    Build the Stochastic Oscillator output from stock data sorted newest first
     """
-    try:
-        logger.info("Calculating Stochastic Oscillator... %s", function_arguments)
-        stock_symbol = function_arguments["stockSymbol"]
-
-        logger.info("Calculating Stochastic Oscillator for stock: %s", stock_symbol)
-
-        # Get stock collection
-        collection = await stock_collection(stock_symbol)
-        logger.info("Collection for stock %s: %s", stock_symbol, collection.name)
-
-        # Get stock data sorted by date in descending order
-        stock_data = list(collection.find().sort("Date", -1))
+    percent_k = calculate_stochastic_oscillator(stock_data)
+    return {"percentK": percent_k, "description": DESCRIPTION}
 
-        # Calculate Stochastic Oscillator %K
-        percent_k = calculate_stochastic_oscillator(stock_data)
 
-        logger.info(
-            "Stochastic Oscillator calculated successfully for stock: %s", stock_symbol
-        )
-        return {"percentK": percent_k, "description": DESCRIPTION}
-
-    except KeyError as e:
-        logger.error("Missing key in function_arguments: %s", str(e))
-        raise Exception(f"Missing key in function_arguments: {str(e)}")
-    except Exception as e:
-        logger.error("Error calculating Stochastic Oscillator: %s", str(e))
-        raise Exception(f"Error calculating Stochastic Oscillator: {str(e)}")
+async def calculate_stock_stochastic_oscillator(function_arguments):
+    """
+    Calculate Stochastic Oscillator %K for a given stock symbol
+    """
+    return await call_tool("getStockStochasticOscillator", function_arguments)
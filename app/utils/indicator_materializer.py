@@ -0,0 +1,141 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pymongo import ASCENDING, ReplaceOne
+from app.core.bar_store import bars_to_records, records_to_bars
+from app.core.data_version import fetch_data_version, get_data_version, read_adjustment_factors
+from app.core.database import ensure_index, get_database
+from app.core.logger import logging
+from app.tools.registry import all_tools
+from app.utils.price_adjustment import apply_adjustments
+
+logger = logging.getLogger(__name__)
+
+INDICATORS_LATEST_COLLECTION = "indicators_latest"
+NIFTY50_COLLECTION = "nifty50"
+
+
+def is_default_call(spec, function_arguments):
+    """
+    Check whether a validated tool call only uses default parameters of a
+    cacheable indicator.
+    """
+    if spec.compute is None or not spec.cacheable:
+        return False
+    defaults = spec.default_arguments()
+    return all(
+        key == "stockSymbol" or value == defaults.get(key)
+        for key, value in function_arguments.items()
+    )
+
+
+def get_materialized_output(db, func_name, stock_symbol):
+    """
+    Read a precomputed indicator output if it is still current.
+
+    Args:
+        db (Database): The MongoDB database instance.
+        func_name (str): The tool name, e.g. ``getStockRSI``.
+        stock_symbol (str): The stock symbol.
+
+    Returns:
+        dict: The stored tool output, or None when it is missing or stale.
+    """
+    document = db[INDICATORS_LATEST_COLLECTION].find_one(
+        {"symbol": stock_symbol, "tool": func_name},
+        {"_id": 0, "version": 1, "output": 1},
+    )
+    if not document or document["version"] != get_data_version(db, stock_symbol):
+        return None
+    return document["output"]
+
+
+def materialize_symbol(stock_symbol):
+    """
+    Compute every indicator with default parameters for one symbol and store
+    the outputs in the ``indicators_latest`` collection.
+
+    The bars are read once and shared by every indicator, and all outputs are
+    written with a single bulk write.
+
+    Returns:
+        int: The number of indicators stored.
+    """
+    db = get_database()
+    stock_data = list(db[stock_symbol].find({}, {"_id": 0}).sort("Date", -1))
+    if not stock_data:
+        logger.warning("No stock data found for symbol: %s", stock_symbol)
+        return 0
+
+    version = fetch_data_version(db, stock_symbol)
+    adjustments = read_adjustment_factors(db, stock_symbol)
+    if adjustments and adjustments["dates"]:
+        # Default arguments use prices adjusted for splits and dividends
+        stock_data = bars_to_records(apply_adjustments(records_to_bars(stock_data), adjustments))
+    computed_at = datetime.now(timezone.utc)
+    operations = []
+    for spec in all_tools():
+        if spec.compute is None or not spec.cacheable:
+            continue
+        try:
+            output = spec.compute(stock_data, spec.default_arguments())
+        except Exception as e:
+            logger.error("Error materializing %s for %s: %s", spec.name, stock_symbol, e)
+            continue
+        operations.append(
+            ReplaceOne(
+                {"symbol": stock_symbol, "tool": spec.name},
+                {
+                    "symbol": stock_symbol,
+                    "tool": spec.name,
+                    "version": version,
+                    "computed_at": computed_at,
+                    "output": output,
+                },
+                upsert=True,
+            )
+        )
+
+    if operations:
+        ensure_index(
+            db,
+            INDICATORS_LATEST_COLLECTION,
+            [("symbol", ASCENDING), ("tool", ASCENDING)],
+            unique=True,
+        )
+        db[INDICATORS_LATEST_COLLECTION].bulk_write(operations, ordered=False)
+    logger.info(
+        "Materialized %d indicator(s) for %s at version %s",
+        len(operations),
+        stock_symbol,
+        version,
+    )
+    return len(operations)
+
+
+def materialize_all(symbols=None, max_workers=None):
+    """
+    Materialize default indicators for every Nifty 50 symbol on a process pool.
+
+    Args:
+        symbols (list, optional): Symbols to process. Defaults to every symbol
+            in the ``nifty50`` collection.
+        max_workers (int, optional): Pool size. Defaults to the CPU count.
+
+    Returns:
+        dict: The number of indicators stored per symbol.
+    """
+    if symbols is None:
+        symbols = get_database()[NIFTY50_COLLECTION].distinct("Symbol")
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        futures = {pool.submit(materialize_symbol, symbol): symbol for symbol in symbols}
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                results[symbol] = future.result()
+            except Exception as e:
+                logger.error("Error materializing indicators for %s: %s", symbol, e)
+                results[symbol] = 0
+    return results
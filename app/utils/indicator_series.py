@@ -0,0 +1,210 @@
+"""
+Vectorized indicator series over chronological bar arrays.
+
+Unlike the ``calculate_*`` functions, which compute one value from bars sorted
+newest first, these functions return one value per bar (oldest first) using
+the standard textbook definitions, with NaN until enough bars are available.
+They are used where the whole history of an indicator is needed at once, e.g.
+for backtests.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _prefix_sums(values):
+    return np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+
+
+def _window_sums(prefix, period):
+    result = np.full(len(prefix) - 1, np.nan)
+    if 0 < period < len(prefix):
+        result[period - 1 :] = prefix[period:] - prefix[:-period]
+    return result
+
+
+def sma_bank(values, periods):
+    """
+    Simple moving averages for several periods, sharing one prefix sum.
+
+    Returns:
+        numpy.ndarray: One row per period.
+    """
+    prefix = _prefix_sums(values)
+    return np.array([_window_sums(prefix, period) / period for period in periods]).reshape(
+        len(periods), len(values)
+    )
+
+
+def sma(values, period):
+    """
+    Simple moving average.
+    """
+    return sma_bank(values, [period])[0]
+
+
+def ema_bank(values, periods):
+    """
+    Exponential moving averages for several periods in one pass over the bars.
+
+    Args:
+        values: A series shared by every period, or one row per period. Rows
+            may only have leading NaNs that are shared by every row.
+        periods: The EMA period of each row.
+
+    Returns:
+        numpy.ndarray: One row per period, seeded like ``ema``.
+    """
+    k = 2 / (np.asarray(periods, dtype=np.float64) + 1)
+    rows = np.broadcast_to(np.asarray(values, dtype=np.float64), (len(k), np.shape(values)[-1]))
+    result = np.full(rows.shape, np.nan)
+    known = np.flatnonzero(~np.isnan(rows).any(axis=0))
+    if len(known) == 0:
+        return result
+    start = known[0]
+    scaled = rows * k[:, None]
+    keep = 1 - k
+    current = rows[:, start].copy()
+    result[:, start] = current
+    for index in range(start + 1, rows.shape[1]):
+        current *= keep
+        current += scaled[:, index]
+        result[:, index] = current
+    return result
+
+
+def ema(values, period):
+    """
+    Exponential moving average, seeded with the first value.
+    """
+    k = 2 / (period + 1)
+    result = np.empty(len(values))
+    current = np.nan
+    for index, value in enumerate(np.asarray(values, dtype=np.float64).tolist()):
+        # Leading NaNs (e.g. of another series) restart the seed
+        if current != current:
+            current = value
+        else:
+            current = value * k + current * (1 - k)
+        result[index] = current
+    return result
+
+
+def rsi_bank(close, periods):
+    """
+    RSI for several periods, sharing the prefix sums of gains and losses.
+
+    Returns:
+        numpy.ndarray: One row per period.
+    """
+    change = np.diff(close, prepend=np.nan)
+    gain_prefix = _prefix_sums(np.where(change > 0, change, 0.0))
+    loss_prefix = _prefix_sums(np.where(change < 0, -change, 0.0))
+    result = np.empty((len(periods), len(close)))
+    for row, period in enumerate(periods):
+        gains = _window_sums(gain_prefix, period)
+        losses = _window_sums(loss_prefix, period)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result[row] = np.where(losses == 0, 100.0, 100 - 100 / (1 + gains / losses))
+        # The first change is only known on the second bar
+        result[row, :period] = np.nan
+    return result
+
+
+def rsi(close, period=14):
+    """
+    Relative Strength Index from simple averages of gains and losses.
+    """
+    return rsi_bank(close, [period])[0]
+
+
+def macd_bank(close, short_periods, long_periods, signal_periods):
+    """
+    MACD for every combination of periods.
+
+    The EMA of each distinct period is computed once and shared by every
+    combination, and all signal lines are computed in a single pass.
+
+    Returns:
+        tuple: The MACD lines, shaped ``(short, long, bars)``, and the signal
+        lines, shaped ``(short, long, signal, bars)``. Combinations where the
+        short period is not below the long period are NaN.
+    """
+    distinct = sorted(set(short_periods) | set(long_periods))
+    emas = dict(zip(distinct, ema_bank(close, distinct)))
+    lines = np.array(
+        [[emas[short] - emas[long] for long in long_periods] for short in short_periods]
+    ).reshape(len(short_periods), len(long_periods), len(close))
+
+    rows = np.repeat(lines.reshape(-1, len(close)), len(signal_periods), axis=0)
+    signals = ema_bank(rows, np.tile(signal_periods, lines.shape[0] * lines.shape[1]))
+    signals = signals.reshape(*lines.shape[:2], len(signal_periods), len(close))
+
+    for i, short in enumerate(short_periods):
+        for j, long in enumerate(long_periods):
+            if short >= long:
+                lines[i, j] = np.nan
+                signals[i, j] = np.nan
+                continue
+            lines[i, j, : long - 1] = np.nan
+            for g, signal in enumerate(signal_periods):
+                signals[i, j, g, : long + signal - 2] = np.nan
+    return lines, signals
+
+
+def macd(close, short_period=12, long_period=26, signal_period=9):
+    """
+    MACD line, signal line and histogram.
+    """
+    line = ema(close, short_period) - ema(close, long_period)
+    signal = ema(line, signal_period)
+    line[: long_period - 1] = np.nan
+    signal[: long_period + signal_period - 2] = np.nan
+    return line, signal, line - signal
+
+
+def bollinger_bank(close, periods):
+    """
+    Middle band and standard deviation for several periods, sharing the
+    prefix sums of prices and squared prices.
+
+    Returns:
+        tuple: The middle bands and deviations, one row per period. The bands
+        are ``middle +/- multiplier * deviation``.
+    """
+    middle = sma_bank(close, periods)
+    variance = sma_bank(np.square(close), periods) - np.square(middle)
+    return middle, np.sqrt(np.maximum(variance, 0.0))
+
+
+def bollinger_bands(close, period=20, multiplier=2):
+    """
+    Middle, upper and lower Bollinger Bands (population standard deviation).
+    """
+    middle, deviation = bollinger_bank(close, [period])
+    middle, deviation = middle[0], deviation[0]
+    return middle, middle + multiplier * deviation, middle - multiplier * deviation
+
+
+def stochastic_k(high, low, close, period=14):
+    """
+    Stochastic Oscillator %K.
+    """
+    result = np.full(len(close), np.nan)
+    if 0 < period <= len(close):
+        highest = sliding_window_view(high, period).max(axis=1)
+        lowest = sliding_window_view(low, period).min(axis=1)
+        price_range = highest - lowest
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result[period - 1 :] = np.where(
+                price_range != 0, (close[period - 1 :] - lowest) / price_range * 100, 0.0
+            )
+    return result
+
+
+def obv(close, volume):
+    """
+    On-Balance Volume.
+    """
+    direction = np.sign(np.diff(close, prepend=close[:1]))
+    return np.cumsum(direction * volume)
@@ -0,0 +1,227 @@
+import asyncio
+import warnings
+from datetime import datetime, timezone
+from functools import lru_cache
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from app.core.logger import logging
+from app.tools.get_market_correlation import GetMarketCorrelationParams
+from app.tools.registry import register_tool
+from app.utils.universe import get_universe, requested_symbols
+
+logger = logging.getLogger(__name__)
+
+# Horizons (in trading days) of the relative-strength ranking: 1, 3, 6 and 12 months
+RELATIVE_STRENGTH_HORIZONS = (21, 63, 126, 252)
+# Values of the return windows standardized at once (8 MB of float64)
+CHUNK_ELEMENTS = 1 << 20
+
+
+def index_returns(returns):
+    """
+    Daily returns of an equal-weighted index of the symbols that traded.
+    """
+    with np.errstate(invalid="ignore"):
+        counts = (~np.isnan(returns)).sum(axis=1)
+        totals = np.nansum(returns, axis=1)
+        return np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+
+
+def _standardized_correlation(windows):
+    # Correlation matrices of a (t, symbols, window) stack of return windows
+    centered = windows - windows.mean(axis=2, keepdims=True)
+    norms = np.sqrt(np.einsum("tiw,tiw->ti", centered, centered))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        standardized = centered / norms[:, :, None]
+    standardized = np.where(np.isfinite(standardized), standardized, np.nan)
+    return np.einsum("tiw,tjw->tij", standardized, standardized)
+
+
+def rolling_correlation(returns, window):
+    """
+    Correlation matrix of every window of daily returns.
+
+    A symbol needs a return on every day of a window; otherwise its row and
+    column are NaN for that window. The windows are standardized in chunks of
+    at most ``CHUNK_ELEMENTS`` values, so memory does not grow with
+    ``window`` times the number of windows.
+
+    Args:
+        returns (numpy.ndarray): ``(days, symbols)`` daily returns.
+        window (int): Window length in days.
+
+    Returns:
+        numpy.ndarray: ``(days - window + 1, symbols, symbols)`` matrices, the
+        last one covering the most recent window.
+    """
+    windows = sliding_window_view(returns, window, axis=0)  # A view: (t, symbols, window)
+    days, symbols = windows.shape[:2]
+    chunk = max(1, CHUNK_ELEMENTS // (symbols * window))
+    correlations = np.empty((days, symbols, symbols))
+    for start in range(0, days, chunk):
+        correlations[start : start + chunk] = _standardized_correlation(
+            windows[start : start + chunk]
+        )
+    return correlations
+
+
+def betas(returns, market, lookback):
+    """
+    Beta of every symbol against the market over the last ``lookback`` days.
+    """
+    returns, market = returns[-lookback:], market[-lookback:, None]
+    valid = ~np.isnan(returns) & ~np.isnan(market)
+    count = valid.sum(axis=0)
+    x = np.where(valid, market, 0.0)
+    y = np.where(valid, returns, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_x = x.sum(axis=0) / count
+        mean_y = y.sum(axis=0) / count
+        covariance = (x * y).sum(axis=0) / count - mean_x * mean_y
+        variance = (x * x).sum(axis=0) / count - mean_x**2
+        return np.where(count > 1, covariance / variance, np.nan)
+
+
+def relative_strength(close, market_level, horizons=RELATIVE_STRENGTH_HORIZONS):
+    """
+    Return of every symbol relative to the market over several horizons.
+
+    Returns:
+        numpy.ndarray: ``(len(horizons), symbols)`` relative returns,
+        ``(1 + stock return) / (1 + market return) - 1``.
+    """
+    latest = close[-1]
+    result = np.full((len(horizons), close.shape[1]), np.nan)
+    for row, horizon in enumerate(horizons):
+        if horizon < len(close):
+            with np.errstate(invalid="ignore", divide="ignore"):
+                stock = latest / close[-1 - horizon]
+                market = market_level[-1] / market_level[-1 - horizon]
+                result[row] = stock / market - 1
+    return result
+
+
+def _nullable(array):
+    return np.where(np.isnan(array), None, array).tolist()
+
+
+@lru_cache(maxsize=16)
+def _analyze(universe, window, lookback):
+    returns = universe.returns()
+    market = index_returns(returns)
+    market_level = np.cumprod(1 + np.nan_to_num(market))
+    if len(returns) < window:
+        raise ValueError(f"Not enough history for a {window}-day window")
+    correlations = rolling_correlation(returns[-(lookback + window - 1) :], window)
+    off_diagonal = correlations[:, ~np.eye(len(universe.symbols), dtype=bool)]
+    strength = relative_strength(universe.filled_close(), market_level)
+    with warnings.catch_warnings():
+        # All-NaN rows (e.g. symbols without enough history) average to NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        average = np.nanmean(off_diagonal, axis=1)
+        score = np.nanmean(strength, axis=0)
+    order = np.argsort(np.where(np.isnan(score), np.inf, -score))
+    ranks = np.empty(len(order), dtype=int)
+    ranks[order] = np.arange(1, len(order) + 1)
+
+    dates = [
+        datetime.fromtimestamp(value, timezone.utc) for value in universe.dates[-len(average) :]
+    ]
+    return {
+        "symbols": list(universe.symbols),
+        "asOf": dates[-1] if dates else None,
+        "window": window,
+        "lookback": lookback,
+        "correlation": _nullable(correlations[-1]) if len(correlations) else [],
+        "averageCorrelation": [
+            {"date": date, "value": value} for date, value in zip(dates, _nullable(average))
+        ],
+        "stocks": [
+            {
+                "symbol": symbol,
+                "beta": beta,
+                "relativeStrength": dict(
+                    zip((f"{h}d" for h in RELATIVE_STRENGTH_HORIZONS), strength_values)
+                ),
+                "relativeStrengthScore": score_value,
+                "relativeStrengthRank": int(rank),
+            }
+            for symbol, beta, strength_values, score_value, rank in zip(
+                universe.symbols,
+                _nullable(betas(returns, market, lookback)),
+                np.array(_nullable(strength), dtype=object).T.tolist(),
+                _nullable(score),
+                ranks,
+            )
+        ],
+    }
+
+
+def market_correlation(symbols=None, window=60, lookback=250):
+    """
+    Correlation, beta and relative strength across the Nifty 50.
+
+    Daily returns of every symbol are aligned on common dates, and an
+    equal-weighted index built from them serves as the market. Results are
+    cached per data version of the symbols.
+
+    Args:
+        symbols (list, optional): Symbols to compare. Defaults to the Nifty 50.
+        window (int): Days per rolling correlation window.
+        lookback (int): Days of rolling correlations and of the beta estimate.
+
+    Returns:
+        dict: The latest correlation matrix, the average pairwise correlation
+        per day, and the beta and relative-strength rank of every symbol.
+    """
+    return _analyze(get_universe(symbols), window, lookback)
+
+
+def summarize(analysis, top):
+    """
+    Condense an analysis for the model: the most and least correlated pairs
+    and the strongest and weakest stocks.
+    """
+    symbols = analysis["symbols"]
+    pairs = [
+        (analysis["correlation"][i][j], symbols[i], symbols[j])
+        for i in range(len(symbols))
+        for j in range(i + 1, len(symbols))
+        if analysis["correlation"][i][j] is not None
+    ]
+    pairs.sort(reverse=True)
+    ranked = sorted(analysis["stocks"], key=lambda stock: stock["relativeStrengthRank"])
+
+    def pair(entry):
+        return {"pair": [entry[1], entry[2]], "correlation": entry[0]}
+
+    return {
+        "asOf": analysis["asOf"].isoformat() if analysis["asOf"] else None,
+        "window": analysis["window"],
+        "averageCorrelation": analysis["averageCorrelation"][-1]["value"]
+        if analysis["averageCorrelation"]
+        else None,
+        "mostCorrelated": [pair(entry) for entry in pairs[:top]],
+        "leastCorrelated": [pair(entry) for entry in pairs[-top:][::-1]],
+        "strongest": ranked[:top],
+        "weakest": ranked[-top:][::-1],
+    }
+
+
+@register_tool(
+    "getMarketCorrelation",
+    description="Compare Nifty 50 stocks against each other: rolling return "
+    "correlations, beta against an equal-weighted Nifty 50 index, and "
+    "relative-strength rankings over 1, 3, 6 and 12 months.",
+    params=GetMarketCorrelationParams,
+    cacheable=True,
+    symbols=requested_symbols,
+)
+async def get_market_correlation_tool(function_arguments):
+    analysis = await asyncio.to_thread(
+        market_correlation,
+        function_arguments.get("symbols"),
+        function_arguments["window"],
+        function_arguments["lookback"],
+    )
+    return summarize(analysis, function_arguments["top"])
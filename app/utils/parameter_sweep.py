@@ -0,0 +1,137 @@
+import itertools
+from datetime import datetime, time, timezone
+import numpy as np
+from app.core.bar_store import CLOSE, DATE
+from app.utils import indicator_series
+from app.utils.backtest import positions
+
+# Grids used for the parameters a sweep request leaves out
+DEFAULT_GRIDS = {
+    "ma": {"period": [5, 10, 20, 50, 100, 200]},
+    "rsi": {"period": [7, 9, 14, 21, 28]},
+    "macd": {
+        "shortPeriod": [8, 10, 12, 15],
+        "longPeriod": [21, 26, 30, 35],
+        "signalPeriod": [5, 7, 9, 11],
+    },
+    "bollinger-bands": {"period": [10, 15, 20, 30, 50], "multiplier": [1.5, 2, 2.5, 3]},
+}
+MAX_CONFIGURATIONS = 2000
+
+
+def _ma(close, axes):
+    averages = indicator_series.sma_bank(close, axes["period"])
+    # Long while the close is above the moving average
+    return averages, positions(close > averages, close < averages)
+
+
+def _rsi(close, axes):
+    values = indicator_series.rsi_bank(close, axes["period"])
+    # Long from oversold (< 30) until overbought (> 70)
+    return values, positions(values < 30, values > 70)
+
+
+def _macd(close, axes):
+    lines, signals = indicator_series.macd_bank(
+        close, axes["shortPeriod"], axes["longPeriod"], axes["signalPeriod"]
+    )
+    lines = lines[:, :, None, :]
+    histogram = lines - signals
+    # Long while the MACD line is above its signal line
+    return histogram, positions(lines > signals, lines < signals)
+
+
+def _bollinger_bands(close, axes):
+    middle, deviation = indicator_series.bollinger_bank(close, axes["period"])
+    multipliers = np.asarray(axes["multiplier"], dtype=np.float64)[None, :, None]
+    middle, deviation = middle[:, None, :], deviation[:, None, :]
+    lower = middle - multipliers * deviation
+    upper = middle + multipliers * deviation
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent_b = (close - lower) / (upper - lower)
+    # Long from a close below the lower band until a close above the middle band
+    return percent_b, positions(close < lower, np.broadcast_to(close > middle, lower.shape))
+
+
+# Value reported per configuration (at the latest bar) and the rule scored
+SWEEPS = {
+    "ma": ("movingAverage", _ma),
+    "rsi": ("rsi", _rsi),
+    "macd": ("macdHistogram", _macd),
+    "bollinger-bands": ("percentB", _bollinger_bands),
+}
+
+
+def _nested(array):
+    # NaN (invalid combination or not enough data) becomes null
+    return np.where(np.isnan(array), None, array).tolist()
+
+
+def sweep(bars, indicator, grid=None, start_date=None):
+    """
+    Evaluate an indicator for every combination of the parameter grid in one
+    vectorized pass over a symbol's history.
+
+    Each configuration reports the indicator at the latest bar and the total
+    return of a standard long-only rule for that indicator (e.g. close above
+    the moving average), so periods can be compared at a glance.
+
+    Args:
+        bars (numpy.ndarray): Chronological bars from ``get_bar_history``.
+        indicator (str): ``ma``, ``rsi``, ``macd`` or ``bollinger-bands``.
+        grid (dict, optional): Values to try per parameter; missing parameters
+            use ``DEFAULT_GRIDS``.
+        start_date (date, optional): Only score returns from this date.
+
+    Returns:
+        dict: The parameter axes, one table row per configuration, and
+        heatmap-ready matrices shaped like the axes.
+
+    Raises:
+        ValueError: If the indicator is not supported or the grid is too large.
+    """
+    if indicator not in SWEEPS:
+        raise ValueError(
+            f"Sweeps are available for: {', '.join(SWEEPS)} (got {indicator})"
+        )
+    axes = {
+        name: sorted(set((grid or {}).get(name) or values))
+        for name, values in DEFAULT_GRIDS[indicator].items()
+    }
+    size = int(np.prod([len(values) for values in axes.values()]))
+    if size > MAX_CONFIGURATIONS:
+        raise ValueError(f"Too many configurations: {size} (max {MAX_CONFIGURATIONS})")
+
+    close = np.asarray(bars[CLOSE])
+    value_name, evaluate = SWEEPS[indicator]
+    values, position = evaluate(close, axes)
+    values = values.reshape(*(len(v) for v in axes.values()), len(close))
+    position = position.reshape(values.shape)
+
+    start = 0
+    if start_date:
+        timestamp = datetime.combine(start_date, time(), tzinfo=timezone.utc).timestamp()
+        start = int(np.searchsorted(bars[DATE], timestamp))
+    returns = np.diff(close[start:]) / close[start:-1]
+    held = position[..., start:-1]
+    total_returns = np.expm1(np.log1p(held * returns).sum(axis=-1))
+    # Configurations that never produce a value are not scored
+    total_returns[np.isnan(values).all(axis=-1)] = np.nan
+    latest = values[..., -1]
+
+    table = []
+    for indexes in itertools.product(*(range(len(v)) for v in axes.values())):
+        row = {name: axes[name][i] for name, i in zip(axes, indexes)}
+        row[value_name] = None if np.isnan(latest[indexes]) else float(latest[indexes])
+        row["totalReturn"] = (
+            None if np.isnan(total_returns[indexes]) else float(total_returns[indexes])
+        )
+        row["exposure"] = float(held[indexes].mean()) if held.shape[-1] else 0.0
+        table.append(row)
+
+    return {
+        "indicator": indicator,
+        "axes": axes,
+        "table": table,
+        "matrix": {value_name: _nested(latest), "totalReturn": _nested(total_returns)},
+    }
@@ -0,0 +1,326 @@
+import asyncio
+from datetime import datetime, timezone
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from app.core.bar_store import CLOSE, DATE, FIELDS, HIGH, LOW, OPEN
+from app.core.data_version import get_data_version
+from app.core.logger import logging
+from app.tools.get_chart_patterns import GetChartPatternsParams
+from app.tools.registry import register_tool
+from app.utils.stock_information import get_bar_history
+from app.utils.universe import nifty50_symbols, requested_symbols
+
+logger = logging.getLogger(__name__)
+
+# Bars on each side of a swing high (low); a pivot is only known this many bars later
+PIVOT_ORDER = 5
+# Bars before the candle over which a hammer (shooting star) needs a falling (rising) close
+TREND_BARS = 5
+# Double tops/bottoms: peaks within 3% of each other, at least 10 bars apart, with a
+# retracement of at least 3% between them, confirmed by a close through the neckline
+# within 40 bars of the second peak
+DOUBLE_TOLERANCE = 0.03
+DOUBLE_MIN_GAP = 10
+DOUBLE_DEPTH = 0.03
+DOUBLE_CONFIRM_BARS = 40
+# Support and resistance come from the pivots of the last year, merged into one level
+# when within 1.5% of each other
+LEVEL_LOOKBACK = 250
+LEVEL_TOLERANCE = 0.015
+LEVELS_REPORTED = 3
+
+PATTERNS = (
+    "bullishEngulfing",
+    "bearishEngulfing",
+    "doji",
+    "hammer",
+    "shootingStar",
+    "doubleTop",
+    "doubleBottom",
+    "resistanceBreakout",
+    "supportBreakdown",
+)
+
+# Latest scan per symbol: symbol -> (data version, result)
+_results = {}
+
+
+def _shift(array, periods=1):
+    shifted = np.full(array.shape, np.nan)
+    shifted[periods:] = array[:-periods]
+    return shifted
+
+
+def candlesticks(open_, high, low, close):
+    """
+    Candlestick patterns of every bar as boolean masks.
+
+    Args:
+        open_, high, low, close (numpy.ndarray): Chronological prices along
+            the first axis; further axes (e.g. symbols) are scanned at once.
+
+    Returns:
+        dict: A mask shaped like the prices per pattern.
+    """
+    body = close - open_
+    size = np.abs(body)
+    span = high - low
+    upper_shadow = high - np.maximum(open_, close)
+    lower_shadow = np.minimum(open_, close) - low
+    previous_open, previous_close = _shift(open_), _shift(close)
+    previous_body = previous_close - previous_open
+    trend = _shift(close) - _shift(close, TREND_BARS + 1)
+
+    with np.errstate(invalid="ignore"):
+        larger = size > np.abs(previous_body)
+        return {
+            "bullishEngulfing": (previous_body < 0) & (body > 0) & larger
+            & (open_ <= previous_close) & (close >= previous_open),
+            "bearishEngulfing": (previous_body > 0) & (body < 0) & larger
+            & (open_ >= previous_close) & (close <= previous_open),
+            "doji": (span > 0) & (size <= 0.1 * span),
+            "hammer": (trend < 0) & (size > 0) & (lower_shadow >= 2 * size)
+            & (upper_shadow <= 0.1 * span),
+            "shootingStar": (trend > 0) & (size > 0) & (upper_shadow >= 2 * size)
+            & (lower_shadow <= 0.1 * span),
+        }
+
+
+def pivots(high, low, order=PIVOT_ORDER):
+    """
+    Swing highs and lows: bars whose high (low) is the highest (lowest) of the
+    ``order`` bars on either side.
+
+    Returns:
+        tuple: ``(swing_highs, swing_lows)`` masks shaped like the prices.
+    """
+    swing_highs = np.zeros(high.shape, dtype=bool)
+    swing_lows = np.zeros(low.shape, dtype=bool)
+    width = 2 * order + 1
+    if len(high) >= width:
+        inner = slice(order, len(high) - order)
+        swing_highs[inner] = high[inner] == sliding_window_view(high, width, axis=0).max(axis=-1)
+        swing_lows[inner] = low[inner] == sliding_window_view(low, width, axis=0).min(axis=-1)
+    return swing_highs, swing_lows
+
+
+def _latest_pivot(values, mask, delay=PIVOT_ORDER):
+    # Price of the most recent pivot as known on each bar (pivots confirm `delay` bars late)
+    rows = np.where(mask, np.arange(len(mask)).reshape(-1, *[1] * (mask.ndim - 1)), -1)
+    known = np.full(mask.shape, -1)
+    known[delay:] = np.maximum.accumulate(rows, axis=0)[: len(mask) - delay]
+    level = np.take_along_axis(values, np.maximum(known, 0), axis=0)
+    return np.where(known >= 0, level, np.nan)
+
+
+def breakouts(high, low, close, swing_highs, swing_lows):
+    """
+    Closes through the latest confirmed swing high (resistance) or swing low
+    (support).
+    """
+    resistance = _latest_pivot(high, swing_highs)
+    support = _latest_pivot(low, swing_lows)
+    previous_close = _shift(close)
+    with np.errstate(invalid="ignore"):
+        return {
+            "resistanceBreakout": (close > resistance) & (previous_close <= resistance),
+            "supportBreakdown": (close < support) & (previous_close >= support),
+        }
+
+
+def _doubles(extreme, opposite, close, peaks, top):
+    # Marks the bar on which each double top (bottom) of one symbol is confirmed
+    confirmed = np.zeros(close.shape, dtype=bool)
+    first, second = peaks[:-1], peaks[1:]
+    candidates = np.flatnonzero(
+        (second - first >= DOUBLE_MIN_GAP)
+        & (np.abs(extreme[second] - extreme[first]) <= DOUBLE_TOLERANCE * extreme[first])
+    )
+    for a, b in zip(first[candidates], second[candidates]):
+        if top:
+            neckline = opposite[a:b].min()
+            deep = neckline <= min(extreme[a], extreme[b]) * (1 - DOUBLE_DEPTH)
+        else:
+            neckline = opposite[a:b].max()
+            deep = neckline >= max(extreme[a], extreme[b]) * (1 + DOUBLE_DEPTH)
+        if not deep:
+            continue
+        # Only from the bar the second peak is confirmed on
+        start = b + PIVOT_ORDER
+        window = close[start : start + DOUBLE_CONFIRM_BARS]
+        hits = np.flatnonzero(window < neckline if top else window > neckline)
+        if len(hits):
+            confirmed[start + hits[0]] = True
+    return confirmed
+
+
+def double_patterns(high, low, close, swing_highs, swing_lows):
+    """
+    Double tops and bottoms, marked on the bar whose close breaks the neckline.
+
+    Args:
+        high, low, close (numpy.ndarray): ``(bars, symbols)`` prices.
+        swing_highs, swing_lows (numpy.ndarray): Masks from ``pivots``.
+    """
+    tops = np.zeros(close.shape, dtype=bool)
+    bottoms = np.zeros(close.shape, dtype=bool)
+    for column in range(close.shape[1]):
+        tops[:, column] = _doubles(
+            high[:, column], low[:, column], close[:, column],
+            np.flatnonzero(swing_highs[:, column]), top=True,
+        )
+        bottoms[:, column] = _doubles(
+            low[:, column], high[:, column], close[:, column],
+            np.flatnonzero(swing_lows[:, column]), top=False,
+        )
+    return {"doubleTop": tops, "doubleBottom": bottoms}
+
+
+def _levels(prices, close):
+    # Merge nearby pivot prices into levels; the number of pivots is the level's strength
+    if not len(prices):
+        return [], []
+    prices = np.sort(prices)
+    groups = np.concatenate([[0], np.cumsum(np.diff(prices) > LEVEL_TOLERANCE * prices[:-1])])
+    touches = np.bincount(groups)
+    levels = np.bincount(groups, weights=prices) / touches
+    entries = [
+        {"level": float(level), "touches": int(count)} for level, count in zip(levels, touches)
+    ]
+    resistance = [entry for entry in entries if entry["level"] > close]
+    support = [entry for entry in entries if entry["level"] < close][::-1]
+    return support[:LEVELS_REPORTED], resistance[:LEVELS_REPORTED]
+
+
+def _stack(histories):
+    # Right-aligned (len(FIELDS), bars, symbols) array: the last row is every symbol's latest bar
+    length = max(history.shape[1] for history in histories)
+    bars = np.full((len(FIELDS), length, len(histories)), np.nan)
+    for column, history in enumerate(histories):
+        bars[:, length - history.shape[1] :, column] = history
+    return bars
+
+
+def scan(histories):
+    """
+    Detect every pattern over the full histories of several symbols at once.
+
+    Args:
+        histories (list): Chronological bars per symbol from ``get_bar_history``.
+
+    Returns:
+        list: Per symbol, the dates of each pattern and the current support
+        and resistance levels.
+    """
+    bars = _stack(histories)
+    open_, high, low, close = bars[OPEN], bars[HIGH], bars[LOW], bars[CLOSE]
+    swing_highs, swing_lows = pivots(high, low)
+    masks = {
+        **candlesticks(open_, high, low, close),
+        **double_patterns(high, low, close, swing_highs, swing_lows),
+        **breakouts(high, low, close, swing_highs, swing_lows),
+    }
+
+    results = []
+    recent = slice(-LEVEL_LOOKBACK, -PIVOT_ORDER)
+    for column, history in enumerate(histories):
+        dates = bars[DATE, :, column]
+        pivot_prices = np.concatenate([
+            high[recent, column][swing_highs[recent, column]],
+            low[recent, column][swing_lows[recent, column]],
+        ])
+        support, resistance = _levels(pivot_prices, close[-1, column])
+        results.append({
+            "dates": history[DATE][-LEVEL_LOOKBACK:],
+            "close": float(close[-1, column]),
+            "events": {name: dates[mask[:, column]] for name, mask in masks.items()},
+            "support": support,
+            "resistance": resistance,
+        })
+    return results
+
+
+def _isoformat(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def chart_patterns(symbols=None, lookback_days=5, patterns=None):
+    """
+    Candlestick and chart patterns with support and resistance levels.
+
+    Full histories are scanned in one batch; results are cached per symbol
+    and data version, so only symbols with new bars are scanned again.
+
+    Args:
+        symbols (list, optional): Symbols to scan. Defaults to the Nifty 50.
+        lookback_days (int): Report patterns from this many latest bars.
+        patterns (list, optional): Only report these patterns.
+
+    Returns:
+        dict: Per symbol, the recent patterns (newest first), how often each
+        pattern occurred over the whole history, and the nearest support and
+        resistance levels.
+
+    Raises:
+        ValueError: If none of the symbols has data.
+    """
+    symbols = list(symbols or nifty50_symbols())
+    versions = {symbol: get_data_version(None, symbol) for symbol in symbols}
+    stale = [
+        symbol
+        for symbol in symbols
+        if versions[symbol] is not None and _results.get(symbol, (None,))[0] != versions[symbol]
+    ]
+    if stale:
+        histories = {symbol: np.asarray(get_bar_history(symbol)) for symbol in stale}
+        histories = {symbol: bars for symbol, bars in histories.items() if bars.shape[1]}
+        if histories:
+            for symbol, result in zip(histories, scan(list(histories.values()))):
+                _results[symbol] = (versions[symbol], result)
+            logger.info("Scanned patterns of %d symbol(s)", len(histories))
+
+    selected = patterns or PATTERNS
+    stocks = []
+    for symbol in symbols:
+        cached = _results.get(symbol)
+        if cached is None or cached[0] != versions[symbol]:
+            continue
+        result = cached[1]
+        cutoff = result["dates"][-min(lookback_days, len(result["dates"]))]
+        recent = [
+            (date, name)
+            for name in selected
+            for date in result["events"][name][result["events"][name] >= cutoff]
+        ]
+        recent.sort(reverse=True)
+        stocks.append({
+            "symbol": symbol,
+            "asOf": _isoformat(result["dates"][-1]),
+            "close": result["close"],
+            "patterns": [{"date": _isoformat(date), "pattern": name} for date, name in recent],
+            "counts": {name: len(result["events"][name]) for name in selected},
+            "support": result["support"],
+            "resistance": result["resistance"],
+        })
+    if not stocks:
+        raise ValueError("No stock data found for the requested symbols")
+    return {"lookbackDays": lookback_days, "stocks": stocks}
+
+
+@register_tool(
+    "getChartPatterns",
+    description="Detect candlestick and chart patterns (engulfing, doji, hammer, "
+    "shooting star, double top/bottom, support/resistance breakouts) over the "
+    "recent trading days, with the nearest support and resistance levels from "
+    "swing highs and lows. Scans every Nifty 50 stock unless symbols are given.",
+    params=GetChartPatternsParams,
+    cacheable=True,
+    symbols=requested_symbols,
+)
+async def get_chart_patterns_tool(function_arguments):
+    return await asyncio.to_thread(
+        chart_patterns,
+        function_arguments.get("symbols"),
+        function_arguments["lookbackDays"],
+        function_arguments.get("patterns"),
+    )
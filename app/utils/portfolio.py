@@ -0,0 +1,325 @@
+import asyncio
+from datetime import datetime, timezone
+from statistics import NormalDist
+import numpy as np
+from app.core.database import ensure_index, get_database
+from app.core.logger import logging
+from app.core.session_store import current_session_id
+from app.tools.get_portfolio_analysis import GetPortfolioAnalysisParams
+from app.tools.registry import register_tool
+from app.tools.set_portfolio import Holding, SetPortfolioParams
+from app.utils import indicator_series
+from app.utils.indicator_materializer import NIFTY50_COLLECTION
+from app.utils.universe import get_universe
+
+logger = logging.getLogger(__name__)
+
+PORTFOLIOS_COLLECTION = "portfolios"
+
+TRADING_DAYS = 252
+# Days of the momentum reported per position (about one month)
+MOMENTUM_DAYS = 21
+
+
+def merge_holdings(holdings):
+    """
+    Combine holdings of the same symbol into one position at their average cost.
+
+    Args:
+        holdings (list): Dicts with ``symbol``, ``quantity`` and ``cost_basis``
+            (average price paid per share).
+
+    Returns:
+        list: One holding per symbol, in order of first appearance.
+    """
+    merged = {}
+    for holding in holdings:
+        symbol = holding["symbol"]
+        quantity = holding["quantity"]
+        cost = quantity * holding["cost_basis"]
+        if symbol in merged:
+            quantity += merged[symbol]["quantity"]
+            cost += merged[symbol]["quantity"] * merged[symbol]["cost_basis"]
+        merged[symbol] = {"symbol": symbol, "quantity": quantity, "cost_basis": cost / quantity}
+    return list(merged.values())
+
+
+def save_portfolio(session_id, holdings):
+    """
+    Register the portfolio of a session, replacing any earlier one.
+
+    Args:
+        session_id (str): The chat session (or assistant thread) ID.
+        holdings (list): Dicts with ``symbol``, ``quantity`` and ``cost_basis``.
+
+    Returns:
+        dict: The stored portfolio.
+    """
+    db = get_database()
+    ensure_index(db, PORTFOLIOS_COLLECTION, "session_id", unique=True)
+    portfolio = {
+        "session_id": session_id,
+        "holdings": merge_holdings(holdings),
+        "updated_at": datetime.now(timezone.utc),
+    }
+    db[PORTFOLIOS_COLLECTION].replace_one({"session_id": session_id}, portfolio, upsert=True)
+    logger.info(
+        "Registered a portfolio of %d position(s) for session %s",
+        len(portfolio["holdings"]),
+        session_id,
+    )
+    return portfolio
+
+
+def get_portfolio(session_id):
+    """
+    Return the portfolio registered for a session, or None.
+    """
+    return get_database()[PORTFOLIOS_COLLECTION].find_one({"session_id": session_id}, {"_id": 0})
+
+
+def _nullable(values):
+    return [None if np.isnan(value) else float(value) for value in values]
+
+
+def _weighted(values, weights):
+    # Weighted average over the positions where the value is known
+    known = ~np.isnan(values)
+    total = weights[known].sum()
+    return float(values[known] @ weights[known] / total) if total > 0 else None
+
+
+def _industries(symbols):
+    stocks = get_database()[NIFTY50_COLLECTION].find(
+        {"Symbol": {"$in": list(symbols)}}, {"_id": 0, "Symbol": 1, "Industry": 1}
+    )
+    return {stock["Symbol"]: stock.get("Industry") or "Unknown" for stock in stocks}
+
+
+def _indicators(close):
+    """
+    Latest RSI, distance from the 50/200-day SMAs and one-month return of
+    every column of a ``(dates, symbols)`` close matrix.
+    """
+    result = np.full((4, close.shape[1]), np.nan)
+    for column in range(close.shape[1]):
+        series = close[:, column]
+        series = series[~np.isnan(series)]
+        if len(series) < 2:
+            continue
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result[0, column] = indicator_series.rsi(series, 14)[-1]
+            result[1, column] = series[-1] / indicator_series.sma(series, 50)[-1] - 1
+            result[2, column] = series[-1] / indicator_series.sma(series, 200)[-1] - 1
+            if len(series) > MOMENTUM_DAYS:
+                result[3, column] = series[-1] / series[-1 - MOMENTUM_DAYS] - 1
+    return result
+
+
+def _risk(returns, weights, total_value, confidence, horizon_days):
+    """
+    Volatility, Value at Risk and expected shortfall of the portfolio.
+
+    Args:
+        returns (numpy.ndarray): ``(days, symbols)`` daily returns.
+        weights (numpy.ndarray): Current market-value weight of each symbol.
+
+    Returns:
+        tuple: The risk summary and each position's annualized volatility and
+        share of the portfolio variance.
+    """
+    covariance = np.atleast_2d(np.cov(returns, rowvar=False))
+    variance = float(weights @ covariance @ weights)
+    volatility = np.sqrt(variance)
+    scale = np.sqrt(horizon_days)
+
+    # Parametric VaR assumes normal, zero-mean returns; historical VaR and the
+    # expected shortfall use the empirical daily returns. Both are scaled to
+    # the horizon with the square root of time.
+    parametric = NormalDist().inv_cdf(confidence) * volatility * scale
+    portfolio_returns = returns @ weights
+    cutoff = np.quantile(portfolio_returns, 1 - confidence)
+    historical = max(-cutoff, 0.0) * scale
+    shortfall = max(-portfolio_returns[portfolio_returns <= cutoff].mean(), 0.0) * scale
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        contributions = weights * (covariance @ weights) / variance
+    risk = {
+        "returnDays": len(returns),
+        "dailyVolatility": float(volatility),
+        "annualVolatility": float(volatility * np.sqrt(TRADING_DAYS)),
+        "confidence": confidence,
+        "horizonDays": horizon_days,
+        "parametricVarPct": float(parametric),
+        "parametricVar": float(parametric * total_value),
+        "historicalVarPct": float(historical),
+        "historicalVar": float(historical * total_value),
+        "expectedShortfallPct": float(shortfall),
+        "expectedShortfall": float(shortfall * total_value),
+    }
+    return risk, np.sqrt(np.diag(covariance) * TRADING_DAYS), contributions
+
+
+def portfolio_analysis(holdings, confidence=0.95, horizon_days=1, lookback_days=250):
+    """
+    Analyze a portfolio in one batched pass over the bars of its symbols.
+
+    The bars of every held symbol are read from the bar store once and
+    aligned on a common date axis (shared with the other analytics and cached
+    per data version). From this matrix come the P&L of each position at the
+    latest close, market-value-weighted indicators, the exposure to each
+    ``Industry`` of the ``nifty50`` collection, and the portfolio volatility,
+    Value at Risk and expected shortfall from the covariance of the last
+    ``lookback_days`` daily returns at the current weights.
+
+    Args:
+        holdings (list): Dicts with ``symbol``, ``quantity`` and ``cost_basis``.
+        confidence (float): Confidence level of the Value at Risk.
+        horizon_days (int): Value at Risk horizon in trading days.
+        lookback_days (int): Days of returns used for the risk measures.
+
+    Returns:
+        dict: Totals, positions (largest first), weighted indicators, sectors
+        (largest first), risk, and the symbols without stored bars.
+
+    Raises:
+        ValueError: If none of the symbols has stored bars.
+    """
+    holdings = {holding["symbol"]: holding for holding in merge_holdings(holdings)}
+    universe = get_universe(list(holdings))
+    symbols = universe.symbols
+    quantity = np.array([holdings[symbol]["quantity"] for symbol in symbols])
+    cost_basis = np.array([holdings[symbol]["cost_basis"] for symbol in symbols])
+
+    # The last close of symbols without a bar on the latest date carries over
+    close = universe.filled_close()
+    latest = close[-1]
+    previous = close[-2] if len(close) > 1 else latest
+    market_value = quantity * latest
+    cost = quantity * cost_basis
+    pnl = market_value - cost
+    day_change = quantity * (latest - previous)
+    total_value = float(market_value.sum())
+    weights = market_value / total_value
+
+    rsi, sma50_gap, sma200_gap, momentum = _indicators(universe.close)
+
+    returns = close[1:] / close[:-1] - 1
+    # Only days on which every held symbol was already listed
+    returns = returns[~np.isnan(returns).any(axis=1)][-lookback_days:]
+    risk = None
+    volatility = contributions = np.full(len(symbols), np.nan)
+    if len(returns) >= 2:
+        risk, volatility, contributions = _risk(
+            returns, weights, total_value, confidence, horizon_days
+        )
+
+    industries = _industries(symbols)
+    columns = {
+        "rsi": _nullable(rsi),
+        "sma50GapPct": _nullable(sma50_gap),
+        "sma200GapPct": _nullable(sma200_gap),
+        "momentum1mPct": _nullable(momentum),
+        "annualVolatility": _nullable(volatility),
+        "riskContribution": _nullable(contributions),
+    }
+    positions = [
+        {
+            "symbol": symbol,
+            "industry": industries.get(symbol, "Unknown"),
+            "quantity": float(quantity[i]),
+            "costBasis": float(cost_basis[i]),
+            "close": float(latest[i]),
+            "marketValue": float(market_value[i]),
+            "unrealizedPnl": float(pnl[i]),
+            "unrealizedPnlPct": float(pnl[i] / cost[i]),
+            "dayChange": float(day_change[i]),
+            "weight": float(weights[i]),
+            **{name: values[i] for name, values in columns.items()},
+        }
+        for i, symbol in enumerate(symbols)
+    ]
+    positions.sort(key=lambda position: position["marketValue"], reverse=True)
+
+    sectors = {}
+    for position in positions:
+        sector = sectors.setdefault(
+            position["industry"],
+            {"industry": position["industry"], "marketValue": 0.0, "unrealizedPnl": 0.0, "symbols": []},
+        )
+        sector["marketValue"] += position["marketValue"]
+        sector["unrealizedPnl"] += position["unrealizedPnl"]
+        sector["symbols"].append(position["symbol"])
+    for sector in sectors.values():
+        sector["weight"] = sector["marketValue"] / total_value
+
+    total_cost = float(cost.sum())
+    total_change = float(day_change.sum())
+    return {
+        "asOf": datetime.fromtimestamp(universe.dates[-1], timezone.utc).isoformat(),
+        "totalValue": total_value,
+        "totalCost": total_cost,
+        "unrealizedPnl": total_value - total_cost,
+        "unrealizedPnlPct": (total_value - total_cost) / total_cost,
+        "dayChange": total_change,
+        "dayChangePct": total_change / (total_value - total_change),
+        "positions": positions,
+        "indicators": {
+            "rsi": _weighted(rsi, weights),
+            "sma50GapPct": _weighted(sma50_gap, weights),
+            "sma200GapPct": _weighted(sma200_gap, weights),
+            "momentum1mPct": _weighted(momentum, weights),
+            "aboveSma50Weight": float(weights[sma50_gap > 0].sum()),
+            "aboveSma200Weight": float(weights[sma200_gap > 0].sum()),
+        },
+        "sectors": sorted(sectors.values(), key=lambda sector: sector["marketValue"], reverse=True),
+        "risk": risk,
+        "missing": [symbol for symbol in holdings if symbol not in symbols],
+    }
+
+
+@register_tool(
+    "setPortfolio",
+    description="Register the user's portfolio on the chat session: the symbol, number "
+    "of shares and average purchase price of every holding. Replaces any portfolio "
+    "registered before. Use getPortfolioAnalysis to analyze it.",
+    params=SetPortfolioParams,
+    mutating=True,
+)
+async def set_portfolio_tool(function_arguments):
+    session_id = current_session_id.get()
+    if session_id is None:
+        return {"error": "There is no chat session to register the portfolio on"}
+    holdings = [
+        Holding.model_validate(holding).model_dump() for holding in function_arguments["holdings"]
+    ]
+    portfolio = await asyncio.to_thread(save_portfolio, session_id, holdings)
+    return {"positions": len(portfolio["holdings"]), "holdings": portfolio["holdings"]}
+
+
+@register_tool(
+    "getPortfolioAnalysis",
+    description="Analyze the portfolio registered on the chat session in one call: P&L "
+    "of every position and in total, market-value-weighted RSI, distance from the "
+    "50/200-day moving averages and one-month momentum, exposure per sector, and the "
+    "portfolio's volatility, Value at Risk and expected shortfall from the daily "
+    "returns of its stocks. Prefer it over per-stock tools for questions about the "
+    "user's holdings.",
+    params=GetPortfolioAnalysisParams,
+    per_session=True,
+)
+async def get_portfolio_analysis_tool(function_arguments):
+    session_id = current_session_id.get()
+    portfolio = await asyncio.to_thread(get_portfolio, session_id) if session_id else None
+    if portfolio is None:
+        return {
+            "error": "No portfolio is registered for this session. Ask the user for "
+            "their holdings and register them with setPortfolio."
+        }
+    return await asyncio.to_thread(
+        portfolio_analysis,
+        portfolio["holdings"],
+        function_arguments["confidence"],
+        function_arguments["horizonDays"],
+        function_arguments["lookbackDays"],
+    )
@@ -0,0 +1,145 @@
+import numpy as np
+from app.core.bar_store import (
+    CLOSE,
+    DATE,
+    HIGH,
+    LOW,
+    OPEN,
+    VOLUME,
+    read_adjustments,
+    to_timestamp,
+)
+from app.core.data_version import adjustment_revision
+from app.core.logger import logging
+
+logger = logging.getLogger(__name__)
+
+# Splits and dividends, one document per symbol, ex-date and type
+CORPORATE_ACTIONS_COLLECTION = "corporate_actions"
+CORPORATE_ACTION_TYPES = ("split", "dividend")
+
+# Adjusted bars per symbol: symbol -> (data version, bars)
+_adjusted = {}
+
+
+def undo_splits(stock_data, splits):
+    """
+    Restore the traded prices of split-adjusted bar dicts.
+
+    Yahoo Finance divides the prices (and multiplies the volume) of every bar
+    before a split by its ratio, even with ``auto_adjust=False``. Multiplying
+    the prices back by the ratios of all later splits gives the bars as
+    traded, to which ``adjustment_factors`` applies each split exactly once.
+
+    Args:
+        stock_data (list): Bar dicts with ``Date``, ``Open``, ``High``,
+            ``Low``, ``Close`` and ``Volume`` keys.
+        splits (list): Split actions with ``date`` (the ex-date) and
+            ``ratio`` (new shares per share).
+
+    Returns:
+        list: New bar dicts with the traded prices and volumes.
+    """
+    splits = sorted((to_timestamp(split["date"]), float(split["ratio"])) for split in splits)
+    dates = np.array([date for date, _ in splits])
+    # later[i] is the product of the ratios of splits i and after
+    later = np.append(np.cumprod([ratio for _, ratio in splits][::-1])[::-1], 1.0)
+    restored = []
+    for bar in stock_data:
+        factor = float(later[np.searchsorted(dates, to_timestamp(bar["Date"]), side="right")])
+        restored.append({
+            **bar,
+            **{field: bar[field] * factor for field in ("Open", "High", "Low", "Close")},
+            "Volume": round(bar["Volume"] / factor),
+        })
+    return restored
+
+
+def adjustment_factors(bars, actions):
+    """
+    Derive the price and volume adjustment factors of a symbol's history.
+
+    A split of ``ratio`` new shares per share scales earlier prices by
+    ``1 / ratio`` and earlier volumes by ``ratio``. A dividend of ``amount``
+    scales earlier prices by ``1 - amount / close``, using the close before
+    the ex-date. The factors of all later actions are chained with a
+    cumulative product, giving one factor per interval between ex-dates.
+
+    Args:
+        bars (numpy.ndarray): Chronological raw bars of the symbol.
+        actions (list): Corporate actions with ``date``, ``type`` and
+            ``ratio`` (splits) or ``amount`` (dividends).
+
+    Returns:
+        dict: ``dates`` (ex-dates as epoch seconds, ascending), and ``price``
+        and ``volume`` factors with one more entry than ``dates``: entry ``i``
+        applies to bars before ``dates[i]`` and on or after ``dates[i - 1]``.
+    """
+    events = {}
+    for action in actions:
+        ex_date = to_timestamp(action["date"])
+        if action["type"] == "split":
+            ratio = float(action["ratio"])
+            price, volume = 1 / ratio, ratio
+        else:
+            before = int(np.searchsorted(bars[DATE], ex_date)) - 1
+            amount = float(action["amount"])
+            if before < 0 or not 0 < amount < bars[CLOSE][before]:
+                logger.warning("Skipping dividend of %s on %s: no close to adjust", amount, action["date"])
+                continue
+            price, volume = 1 - amount / bars[CLOSE][before], 1.0
+        factors = events.setdefault(ex_date, [1.0, 1.0])
+        factors[0] *= price
+        factors[1] *= volume
+
+    dates = sorted(events)
+    steps = np.array([events[date] for date in dates]).reshape(-1, 2)
+    cumulative = np.ones((len(dates) + 1, 2))
+    # Bars before an ex-date are adjusted by that action and every later one
+    cumulative[:-1] = np.cumprod(steps[::-1], axis=0)[::-1]
+    return {
+        "dates": dates,
+        "price": cumulative[:, 0].tolist(),
+        "volume": cumulative[:, 1].tolist(),
+    }
+
+
+def apply_adjustments(bars, adjustments):
+    """
+    Return a read-only copy of raw bars with the adjustment factors applied.
+    """
+    interval = np.searchsorted(np.asarray(adjustments["dates"]), bars[DATE], side="right")
+    adjusted = np.array(bars, dtype=np.float64)
+    adjusted[[OPEN, HIGH, LOW, CLOSE]] *= np.asarray(adjustments["price"])[interval]
+    adjusted[VOLUME] *= np.asarray(adjustments["volume"])[interval]
+    adjusted.setflags(write=False)
+    return adjusted
+
+
+def adjusted_bars(stock_symbol, version, bars, adjustments=None):
+    """
+    Adjust a symbol's bars for its corporate actions, cached per data version.
+
+    Args:
+        stock_symbol (str): The stock symbol.
+        version (str): The data version the bars belong to.
+        bars (numpy.ndarray): Chronological raw bars.
+        adjustments (dict, optional): The symbol's adjustment factors.
+            Defaults to the factors stamped on the bar store.
+
+    Returns:
+        numpy.ndarray: The adjusted bars, or the raw bars themselves when the
+        symbol has no corporate actions.
+    """
+    if not adjustment_revision(version):
+        return bars
+    cached = _adjusted.get(stock_symbol)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    if adjustments is None:
+        adjustments = read_adjustments(stock_symbol)
+    if not adjustments or not adjustments["dates"]:
+        return bars
+    adjusted = apply_adjustments(bars, adjustments)
+    _adjusted[stock_symbol] = (version, adjusted)
+    return adjusted
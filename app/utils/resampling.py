@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+import numpy as np
+from app.core.bar_store import CLOSE, DATE, FIELDS, HIGH, LOW, OPEN, VOLUME
+from app.core.data_version import adjustment_revision, bar_revision, get_data_version
+from app.core.logger import logging
+from app.utils.stock_information import get_bar_history
+
+logger = logging.getLogger(__name__)
+
+TIMEFRAMES = ("daily", "weekly", "monthly")
+
+SECONDS_PER_DAY = 86400
+
+
+@dataclass(frozen=True)
+class _Aggregate:
+    # Resampled bars of a symbol and the daily bars they were built from
+    bars: np.ndarray
+    revision: tuple
+    daily_bars: int
+    last_daily_date: float
+    last_period_start: int
+
+
+_aggregates = {}
+
+
+def _period_starts(dates, timeframe):
+    # Index of the first daily bar of every week (Monday to Sunday) or calendar month
+    if timeframe not in ("weekly", "monthly"):
+        raise ValueError(f"Unsupported timeframe: {timeframe} (use one of {', '.join(TIMEFRAMES)})")
+    if not len(dates):
+        return np.empty(0, dtype=np.intp)
+    days = np.floor_divide(dates, SECONDS_PER_DAY).astype(np.int64)
+    if timeframe == "weekly":
+        keys = (days + 3) // 7  # 1970-01-01 was a Thursday
+    else:
+        keys = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    return np.concatenate([[0], np.flatnonzero(np.diff(keys)) + 1]).astype(np.intp)
+
+
+def resample(bars, timeframe):
+    """
+    Aggregate daily bars into weekly or monthly bars.
+
+    Each period takes the first open, highest high, lowest low, last close
+    and total volume of its daily bars, and is dated by its last trading day,
+    so the latest period is partial until it ends.
+
+    Args:
+        bars (numpy.ndarray): Chronological ``(len(FIELDS), n)`` daily bars.
+        timeframe (str): ``weekly`` or ``monthly``.
+
+    Returns:
+        numpy.ndarray: Chronological ``(len(FIELDS), periods)`` bars.
+
+    Raises:
+        ValueError: If the timeframe is not supported.
+    """
+    starts = _period_starts(bars[DATE], timeframe)
+    if not bars.shape[1]:
+        return np.empty((len(FIELDS), 0))
+    ends = np.append(starts[1:], bars.shape[1]) - 1
+    resampled = np.empty((len(FIELDS), len(starts)))
+    resampled[DATE] = bars[DATE][ends]
+    resampled[OPEN] = bars[OPEN][starts]
+    resampled[HIGH] = np.maximum.reduceat(bars[HIGH], starts)
+    resampled[LOW] = np.minimum.reduceat(bars[LOW], starts)
+    resampled[CLOSE] = bars[CLOSE][ends]
+    resampled[VOLUME] = np.add.reduceat(bars[VOLUME], starts)
+    return resampled
+
+
+def _aggregate(daily, timeframe, revision, offset=0, previous=None):
+    # Resample daily[:, offset:] and append it to the complete periods of `previous`
+    tail = daily[:, offset:]
+    resampled = resample(tail, timeframe)
+    if previous is not None:
+        resampled = np.concatenate([previous.bars[:, :-1], resampled], axis=1)
+    resampled.setflags(write=False)
+    return _Aggregate(
+        bars=resampled,
+        revision=revision,
+        daily_bars=daily.shape[1],
+        last_daily_date=float(daily[DATE][-1]),
+        last_period_start=offset + int(_period_starts(tail[DATE], timeframe)[-1]),
+    )
+
+
+def get_resampled_history(stock_symbol, timeframe="daily", adjusted=True):
+    """
+    Get the whole history of a stock at a timeframe as a chronological array.
+
+    Aggregates are cached per symbol. When new daily bars are appended, only
+    the last (possibly partial) period is rebuilt from the daily bars, and the
+    complete periods before it are reused; corrected bars rebuild the
+    aggregates, and so does a new corporate action for the adjusted ones.
+
+    Args:
+        stock_symbol (str): The stock symbol.
+        timeframe (str): ``daily``, ``weekly`` or ``monthly``.
+        adjusted (bool): Aggregate prices adjusted for splits and dividends.
+
+    Returns:
+        numpy.ndarray: A read-only ``(len(FIELDS), n_bars)`` array, oldest bar first.
+
+    Raises:
+        ValueError: If the timeframe is not supported.
+    """
+    daily = get_bar_history(stock_symbol, adjusted)
+    if timeframe == "daily":
+        return daily
+    if not daily.shape[1]:
+        return resample(daily, timeframe)
+
+    # Corrected bars bump the bar revision of the data version, while the
+    # count and last date of the daily bars may stay the same
+    version = get_data_version(None, stock_symbol)
+    revision = (bar_revision(version), adjustment_revision(version) if adjusted else 0)
+    key = (stock_symbol, timeframe, adjusted)
+    cached = _aggregates.get(key)
+    count = daily.shape[1]
+    if (
+        cached is not None
+        and cached.revision == revision
+        and cached.daily_bars <= count
+        and daily[DATE][cached.daily_bars - 1] == cached.last_daily_date
+    ):
+        if cached.daily_bars == count:
+            return cached.bars
+        # Appended bars: rebuild from the start of the last cached period
+        aggregate = _aggregate(daily, timeframe, revision, cached.last_period_start, cached)
+    else:
+        aggregate = _aggregate(daily, timeframe, revision)
+        logger.info("Resampled %d daily bar(s) of %s to %s", count, stock_symbol, timeframe)
+    _aggregates[key] = aggregate
+    return aggregate.bars
@@ -0,0 +1,200 @@
+import asyncio
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
+import numpy as np
+from app.core.bar_store import CLOSE, DATE, VOLUME
+from app.core.data_version import get_data_version
+from app.core.database import get_database
+from app.core.logger import logging
+from app.tools.get_sector_analysis import GetSectorAnalysisParams
+from app.tools.registry import register_tool
+from app.utils import indicator_series
+from app.utils.indicator_materializer import NIFTY50_COLLECTION
+from app.utils.market_correlation import RELATIVE_STRENGTH_HORIZONS
+from app.utils.stock_information import get_bar_history
+from app.utils.universe import requested_symbols
+
+logger = logging.getLogger(__name__)
+
+# Days of average traded value used to weight stocks in the weighted indices
+WEIGHT_DAYS = 20
+
+
+@lru_cache(maxsize=256)
+def _symbol_stats(stock_symbol, version):
+    """
+    Per-symbol inputs of the sector analytics, cached by data version so that
+    only symbols with new bars are recomputed.
+    """
+    bars = np.asarray(get_bar_history(stock_symbol))
+    close = bars[CLOSE]
+    if len(close) < 2:
+        return None
+
+    def latest(series):
+        value = series[-1]
+        return None if np.isnan(value) else float(value)
+
+    sma50 = latest(indicator_series.sma(close, 50))
+    sma200 = latest(indicator_series.sma(close, 200))
+    returns = close[1:] / close[:-1] - 1
+    dates = np.array(bars[DATE][1:])
+    # Shared by every request until the next bar, so never modified
+    returns.setflags(write=False)
+    dates.setflags(write=False)
+    return {
+        "close": float(close[-1]),
+        "aboveSma50": None if sma50 is None else bool(close[-1] > sma50),
+        "aboveSma200": None if sma200 is None else bool(close[-1] > sma200),
+        "rsi": latest(indicator_series.rsi(close, 14)),
+        "tradedValue": float(np.nanmean((close * bars[VOLUME])[-WEIGHT_DAYS:])),
+        "dates": dates,
+        "returns": returns,
+    }
+
+
+def _industries():
+    members = {}
+    for stock in get_database()[NIFTY50_COLLECTION].find(
+        {}, {"_id": 0, "Symbol": 1, "Industry": 1}
+    ):
+        members.setdefault(stock.get("Industry") or "Unknown", []).append(stock["Symbol"])
+    return members
+
+
+def _percent(flags):
+    known = [flag for flag in flags if flag is not None]
+    return 100 * sum(known) / len(known) if known else None
+
+
+def _sector_index(stats):
+    """
+    Equal- and traded-value-weighted daily index levels (base 100) of a sector.
+    """
+    dates = np.unique(np.concatenate([stock["dates"] for stock in stats]))
+    returns = np.full((len(dates), len(stats)), np.nan)
+    for column, stock in enumerate(stats):
+        returns[np.searchsorted(dates, stock["dates"]), column] = stock["returns"]
+    traded = np.array([stock["tradedValue"] for stock in stats])
+    known = ~np.isnan(returns)
+    weights = np.where(known, np.nan_to_num(traded), 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        equal = np.nansum(returns, axis=1) / known.sum(axis=1)
+        weighted = (np.nan_to_num(returns) * weights).sum(axis=1) / weights.sum(axis=1)
+    return (
+        dates,
+        100 * np.cumprod(1 + np.nan_to_num(equal)),
+        100 * np.cumprod(1 + np.nan_to_num(weighted)),
+    )
+
+
+def _momentum(levels):
+    return {
+        f"{horizon}d": float(levels[-1] / levels[-1 - horizon] - 1)
+        for horizon in RELATIVE_STRENGTH_HORIZONS
+        if horizon < len(levels)
+    }
+
+
+def sector_analysis(industry=None, history=0):
+    """
+    Sector indices, breadth and momentum for the Nifty 50 industries.
+
+    Stocks are grouped by the ``Industry`` of the ``nifty50`` collection. Each
+    sector gets an equal-weighted index and an index weighted by average
+    traded value, breadth (share of stocks above their 50/200-day moving
+    averages and with RSI above 70) and momentum over 1, 3, 6 and 12 months,
+    ranked across sectors.
+
+    Args:
+        industry (str, optional): Only return sectors matching this industry
+            (partial, case-insensitive), with a per-stock breakdown.
+        history (int): Number of most recent index levels to include.
+
+    Returns:
+        dict: The sectors, strongest momentum first.
+    """
+    sectors = []
+    for name, symbols in sorted(_industries().items()):
+        stats = {}
+        for symbol in symbols:
+            version = get_data_version(None, symbol)
+            symbol_stats = _symbol_stats(symbol, version) if version is not None else None
+            if symbol_stats is not None:
+                stats[symbol] = symbol_stats
+        if not stats:
+            continue
+
+        dates, equal, weighted = _sector_index(list(stats.values()))
+        momentum = _momentum(equal)
+        sector = {
+            "industry": name,
+            "stocks": len(stats),
+            "asOf": datetime.fromtimestamp(dates[-1], timezone.utc).isoformat(),
+            "equalWeightLevel": float(equal[-1]),
+            "valueWeightLevel": float(weighted[-1]),
+            "momentum": momentum,
+            "momentumScore": float(np.mean(list(momentum.values()))) if momentum else None,
+            "breadth": {
+                "aboveSma50Pct": _percent([s["aboveSma50"] for s in stats.values()]),
+                "aboveSma200Pct": _percent([s["aboveSma200"] for s in stats.values()]),
+                "rsiAbove70Pct": _percent(
+                    [None if s["rsi"] is None else s["rsi"] > 70 for s in stats.values()]
+                ),
+            },
+        }
+        if history:
+            sector["history"] = [
+                {
+                    "date": datetime.fromtimestamp(date, timezone.utc).isoformat(),
+                    "equalWeight": float(equal_level),
+                    "valueWeight": float(weighted_level),
+                }
+                for date, equal_level, weighted_level in zip(
+                    dates[-history:], equal[-history:], weighted[-history:]
+                )
+            ]
+        sector["_members"] = stats
+        sectors.append(sector)
+
+    sectors.sort(
+        key=lambda sector: -np.inf if sector["momentumScore"] is None else sector["momentumScore"],
+        reverse=True,
+    )
+    for rank, sector in enumerate(sectors, start=1):
+        sector["momentumRank"] = rank
+
+    pattern = re.compile(re.escape(industry), re.IGNORECASE) if industry else None
+    result = []
+    for sector in sectors:
+        members = sector.pop("_members")
+        if pattern and not pattern.search(sector["industry"]):
+            continue
+        if pattern:
+            sector["members"] = [
+                {
+                    "symbol": symbol,
+                    "close": stock["close"],
+                    "aboveSma50": stock["aboveSma50"],
+                    "aboveSma200": stock["aboveSma200"],
+                    "rsi": stock["rsi"],
+                }
+                for symbol, stock in members.items()
+            ]
+        result.append(sector)
+    return {"sectors": result}
+
+
+@register_tool(
+    "getSectorAnalysis",
+    description="Get sector-level analytics for the Nifty 50 in one call: equal- "
+    "and value-weighted sector indices, breadth (% of stocks above their "
+    "50/200-day moving averages, % with RSI above 70) and momentum rankings. "
+    "Pass an industry to get that sector with a per-stock breakdown.",
+    params=GetSectorAnalysisParams,
+    cacheable=True,
+    symbols=requested_symbols,  # Every Nifty 50 stock
+)
+async def get_sector_analysis_tool(function_arguments):
+    return await asyncio.to_thread(sector_analysis, function_arguments.get("industry"))
@@ -1,5 +1,18 @@
+import asyncio
+from app.core import bar_store
+from app.core.data_version import (
+    adjustment_revision,
+    get_data_version,
+    read_adjustment_factors,
+)
 from app.core.database import get_database
 from app.core.logger import logging
+from app.schemas.stock import NiftyStock, StockPrice
+from app.tools.get_stock_price import GetStockPriceParams
+from app.tools.get_stock_symbol import GetStockSymbolParams
+from app.tools.get_stocks_by_industry import GetStocksByIndustryParams
+from app.tools.registry import register_tool
+from app.utils.price_adjustment import adjusted_bars
 
 logger = logging.getLogger(__name__)
 
@@ -14,11 +27,11 @@ async def get_nifty_stock_symbol_info(stock_name):
 
     try:
         stock = collection.find_one(
-            {"$or": [{"Symbol": regex}, {"Company Name": regex}]}
+            {"$or": [{"Symbol": regex}, {"Company Name": regex}]}, {"_id": 0}
         )
         if stock:
-            logger.info("Stock found: %s", stock)
-            return stock
+            logger.info("Stock found: %s", stock.get("Symbol"))
+            return NiftyStock.model_validate(stock)
         else:
             logger.warning("No stock found for: %s", stock_name)
             return {"error": f"Stock not found: {stock_name}. Please try again."}
@@ -36,10 +49,10 @@ async def get_stocks_by_industry(industry):
     regex = {"$regex": industry, "$options": "i"}
 
     try:
-        stock_list = collection.find({"Industry": regex}).to_list(length=None)
+        stock_list = collection.find({"Industry": regex}, {"_id": 0}).to_list(length=None)
         if stock_list:
             logger.info("Stocks found for industry %s: %d", industry, len(stock_list))
-            return stock_list
+            return [NiftyStock.model_validate(stock) for stock in stock_list]
         else:
             logger.warning("No stocks found for industry: %s", industry)
             return f"Stock List not found for {industry} Industry. Please try again."
@@ -54,7 +67,12 @@ async def get_stock_price(stock_symbol):
         db = get_database()
         collection = db[stock_symbol]
 
-        stock_data = collection.find({}).sort("Date", -1).limit(1).to_list(length=1)
+        stock_data = (
+            collection.find({}, {"_id": 0, "Close": 1})
+            .sort("Date", -1)
+            .limit(1)
+            .to_list(length=1)
+        )
         latest_stock_price = None
         if stock_data:
             latest_stock_price = stock_data[0]["Close"]
@@ -64,7 +82,7 @@ async def get_stock_price(stock_symbol):
         else:
             logger.warning("No stock data found for symbol: %s", stock_symbol)
 
-        return {"symbol": stock_symbol, "price": latest_stock_price}
+        return StockPrice(symbol=stock_symbol, price=latest_stock_price)
     except Exception as error:
         logger.error("Error fetching stock price for %s: %s", stock_symbol, error)
         raise error
@@ -79,3 +97,110 @@ async def stock_collection(stock_symbol):
     except Exception as e:
         logger.error("Error retrieving collection for %s: %s", stock_symbol, str(e))
         raise e
+
+
+async def get_stock_data(stock_symbol, limit=None, timeframe="daily", adjusted=True):
+    """
+    Get the stored bars of a stock without blocking the event loop.
+
+    Takes the same arguments as ``read_stock_data``, which runs in a worker
+    thread: reading the data version and the bars may query MongoDB.
+    """
+    return await asyncio.to_thread(read_stock_data, stock_symbol, limit, timeframe, adjusted)
+
+
+def read_stock_data(stock_symbol, limit=None, timeframe="daily", adjusted=True):
+    """
+    Get the stored bars of a stock, sorted by date in descending order.
+
+    Bars are read zero-copy from the shared bar store when it holds the
+    current data version of the symbol, and from MongoDB otherwise.
+
+    Args:
+        stock_symbol (str): The stock symbol.
+        limit (int, optional): Only return the newest ``limit`` bars.
+        timeframe (str): ``daily``, or ``weekly``/``monthly`` for bars
+            aggregated from the daily bars.
+        adjusted (bool): Adjust prices and volumes for splits and dividends;
+            False returns the prices as traded.
+
+    Returns:
+        Sequence: The bars, newest first, as dicts (or dict-like views).
+    """
+    if timeframe != "daily":
+        # Imported lazily: resampling builds on get_bar_history below
+        from app.utils.resampling import get_resampled_history
+
+        return bar_store.bars_to_records(
+            get_resampled_history(stock_symbol, timeframe, adjusted), limit
+        )
+
+    version = get_data_version(None, stock_symbol)
+    bars = bar_store.load_bars(stock_symbol, version)
+    if bars is not None:
+        if adjusted:
+            bars = adjusted_bars(stock_symbol, version, bars)
+        return bar_store.bars_to_records(bars, limit)
+    if adjusted and adjustment_revision(version):
+        # Adjusting needs the whole history
+        return bar_store.bars_to_records(get_bar_history(stock_symbol), limit)
+
+    cursor = get_database()[stock_symbol].find({}, {"_id": 0}).sort("Date", -1)
+    if limit:
+        cursor = cursor.limit(limit)
+    return list(cursor)
+
+
+def get_bar_history(stock_symbol, adjusted=True):
+    """
+    Get the whole stored history of a stock as a chronological bar array.
+
+    Args:
+        stock_symbol (str): The stock symbol.
+        adjusted (bool): Adjust prices and volumes for splits and dividends;
+            False returns the prices as traded.
+
+    Returns:
+        numpy.ndarray: A ``(len(bar_store.FIELDS), n_bars)`` array, oldest bar
+        first (empty when the symbol has no data).
+    """
+    version = get_data_version(None, stock_symbol)
+    bars = bar_store.load_bars(stock_symbol, version)
+    adjustments = None
+    if bars is None:
+        db = get_database()
+        stock_data = list(db[stock_symbol].find({}, {"_id": 0}))
+        bars = bar_store.records_to_bars(stock_data)
+        if adjusted and adjustment_revision(version):
+            adjustments = read_adjustment_factors(db, stock_symbol) or {}
+    return adjusted_bars(stock_symbol, version, bars, adjustments) if adjusted else bars
+
+
+@register_tool(
+    "getStockSymbol",
+    description="Retrieve the stock symbol based on the provided stock name.",
+    params=GetStockSymbolParams,
+    strict=True,
+)
+async def get_stock_symbol_tool(function_arguments):
+    return await get_nifty_stock_symbol_info(function_arguments["stockName"])
+
+
+@register_tool(
+    "getStockPrice",
+    description="Retrieve the current stock price using the stock symbol.",
+    params=GetStockPriceParams,
+    strict=True,
+)
+async def get_stock_price_tool(function_arguments):
+    return await get_stock_price(function_arguments["symbol"])
+
+
+@register_tool(
+    "getStocksByIndustry",
+    description="List the Nifty 50 stocks (symbol, company name and industry) that belong to an industry.",
+    params=GetStocksByIndustryParams,
+    strict=True,
+)
+async def get_stocks_by_industry_tool(function_arguments):
+    return await get_stocks_by_industry(function_arguments["symbol"])
@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Tuple
+import numpy as np
+from app.core.bar_store import CLOSE, DATE, FIELDS
+from app.core.data_version import get_data_version
+from app.core.database import get_database
+from app.utils.indicator_materializer import NIFTY50_COLLECTION
+from app.utils.stock_information import get_bar_history
+
+
+@dataclass(frozen=True, eq=False)
+class Universe:
+    """
+    Bars of several symbols aligned on a common, chronological date axis.
+
+    Attributes:
+        symbols: The symbols, in column order.
+        versions: The data version of each symbol the bars were loaded at.
+        dates: Epoch seconds of every date any symbol traded on.
+        bars: ``(len(FIELDS), dates, symbols)`` array; NaN where a symbol has
+            no bar for a date.
+
+    Instances are shared between requests for the same data versions and
+    hash by identity, so they can key per-version caches.
+    """
+
+    symbols: Tuple[str, ...]
+    versions: Tuple[str, ...]
+    dates: np.ndarray
+    bars: np.ndarray
+
+    @property
+    def close(self):
+        return self.bars[CLOSE]
+
+    def returns(self):
+        """
+        Daily simple returns, NaN on a symbol's first bar and around gaps.
+        """
+        close = self.close
+        returns = np.full(close.shape, np.nan)
+        returns[1:] = close[1:] / close[:-1] - 1
+        return returns
+
+    def filled_close(self):
+        """
+        Closing prices with each symbol's last close carried over days on
+        which it has no bar (NaN before its first bar).
+        """
+        close = self.close
+        rows = np.where(np.isnan(close), 0, np.arange(len(close))[:, None])
+        return np.take_along_axis(close, np.maximum.accumulate(rows, axis=0), axis=0)
+
+
+def nifty50_symbols():
+    """
+    Return every symbol listed in the ``nifty50`` collection, sorted.
+    """
+    return sorted(get_database()[NIFTY50_COLLECTION].distinct("Symbol"))
+
+
+def requested_symbols(function_arguments):
+    """
+    Return the symbols a multi-symbol tool call reads: those of its
+    ``symbols`` argument, or every Nifty 50 symbol.
+    """
+    return list(function_arguments.get("symbols") or nifty50_symbols())
+
+
+@lru_cache(maxsize=4)
+def _load(symbols, versions):
+    histories = [np.asarray(get_bar_history(symbol)) for symbol in symbols]
+    dates = np.unique(np.concatenate([history[DATE] for history in histories]))
+    bars = np.full((len(FIELDS), len(dates), len(symbols)), np.nan)
+    for column, history in enumerate(histories):
+        rows = np.searchsorted(dates, history[DATE])
+        bars[:, rows, column] = history
+    bars.setflags(write=False)
+    return Universe(symbols=symbols, versions=versions, dates=dates, bars=bars)
+
+
+def get_universe(symbols=None):
+    """
+    Load the aligned bars of several symbols (every Nifty 50 stock by default).
+
+    The result is cached per data version of the symbols, so repeated
+    analytics reuse the same arrays until a new bar is stored.
+
+    Returns:
+        Universe: The aligned bars; symbols without data are left out.
+
+    Raises:
+        ValueError: If none of the symbols has data.
+    """
+    symbols = tuple(symbols or nifty50_symbols())
+    versions = tuple(get_data_version(None, symbol) for symbol in symbols)
+    known = tuple(i for i, version in enumerate(versions) if version is not None)
+    if not known:
+        raise ValueError("No stock data found for the requested symbols")
+    return _load(
+        tuple(symbols[i] for i in known), tuple(versions[i] for i in known)
+    )
@@ -0,0 +1,109 @@
+"""
+Measure how long it takes to evaluate alert rules after an ingestion.
+
+Usage:
+    python benchmarks/alert_evaluation.py [--rules 100000] [--symbols 50]
+        [--bars 5000]
+
+Builds ``--rules`` random rules (RSI, SMA, EMA, MACD, Bollinger and close
+conditions with a few distinct parameter sets each) over ``--symbols``
+synthetic histories and evaluates them with ``triggered_rules``, which
+computes each series once per symbol, over the newest bars it needs, and
+compares all rules of a group at once. For reference, the same rules are
+also evaluated one by one, computing each rule's series on its own. No MongoDB access is needed.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from worker_scaling import synthetic_bars  # noqa: E402
+
+INDICATORS = [
+    ({"series": "rsi", "period": 14}, (20, 80)),
+    ({"series": "rsi", "period": 7}, (20, 80)),
+    ({"series": "sma", "period": 50}, (50, 200)),
+    ({"series": "sma", "period": 200}, (50, 200)),
+    ({"series": "ema", "period": 20}, (50, 200)),
+    ({"series": "macdHistogram"}, (-2, 2)),
+    ({"series": "bollingerUpper", "period": 20}, (50, 200)),
+    ({"series": "close"}, (50, 200)),
+]
+
+
+def random_rules(count, symbols, seed):
+    from app.utils.alerts import OPERATORS, build_rule
+
+    rng = random.Random(seed)
+    rules = []
+    for index in range(count):
+        indicator, (low, high) = rng.choice(INDICATORS)
+        rule = build_rule(
+            rng.choice(symbols), indicator, rng.choice(OPERATORS), rng.uniform(low, high)
+        )
+        rule["_id"] = index
+        rules.append(rule)
+    return rules
+
+
+def one_by_one(rules, histories):
+    # Each rule computes its own series and is compared on its own
+    from app.utils.alerts import triggered_rules
+
+    triggered = 0
+    for rule in rules:
+        fired, _ = triggered_rules([rule], histories)
+        triggered += int(fired[0])
+    return triggered
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rules", type=int, default=100_000)
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--bars", type=int, default=5000)
+    parser.add_argument(
+        "--reference-rules",
+        type=int,
+        default=2000,
+        help="Rules evaluated one by one for the reference timing.",
+    )
+    args = parser.parse_args()
+
+    from app.core.bar_store import records_to_bars
+    from app.utils.alerts import triggered_rules
+
+    symbols = [f"SYM{index}" for index in range(args.symbols)]
+    histories = {
+        symbol: records_to_bars(synthetic_bars(args.bars, seed))
+        for seed, symbol in enumerate(symbols)
+    }
+    rules = random_rules(args.rules, symbols, 0)
+    groups = len({(rule["series_key"], rule["symbol"]) for rule in rules})
+
+    started = time.perf_counter()
+    triggered, _ = triggered_rules(rules, histories)
+    grouped = time.perf_counter() - started
+    print(
+        f"{args.rules} rules, {groups} series computed: {grouped * 1000:.0f}ms "
+        f"({int(triggered.sum())} triggered)"
+    )
+
+    sample = rules[: args.reference_rules]
+    started = time.perf_counter()
+    one_by_one(sample, histories)
+    per_rule = (time.perf_counter() - started) / len(sample)
+    print(
+        f"One by one: {per_rule * 1e6:.0f}us per rule, about "
+        f"{per_rule * args.rules:.1f}s for {args.rules} rules"
+    )
+
+
+if __name__ == "__main__":
+    main()
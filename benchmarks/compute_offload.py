@@ -0,0 +1,123 @@
+"""
+Measure the latency of light indicator requests while heavy calculations run.
+
+Usage:
+    python benchmarks/compute_offload.py [--bars 20000] [--heavy 40]
+        [--interval-ms 10] [--workers N]
+
+A stream of light requests (RSI over its lookback window, computed on the
+event loop as the API does) is issued every ``--interval-ms`` while
+``--heavy`` full-history MACD calculations run: on the event loop, on the
+default thread pool, and on the compute process pool. Their latency is
+reported for each mode next to an idle baseline. No MongoDB or OpenAI access
+is needed.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Settings are required to size the compute pool; no client is created
+for _name in ("OPENAI_API_KEY", "ASSISTANT_ID", "MONGO_DB_URI", "DB_NAME"):
+    os.environ.setdefault(_name, "benchmark")
+
+from worker_scaling import synthetic_bars  # noqa: E402
+
+
+async def light_requests(spec, bars, interval, done):
+    from app.core.bar_store import bars_to_records
+
+    arguments = {"stockSymbol": "SYM", **spec.default_arguments()}
+    latencies = []
+    while not done.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0)  # Queue behind whatever the loop is running
+        spec.compute(bars_to_records(bars, spec.bars_needed(arguments)), arguments)
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def heavy_calculations(mode, spec, bars, count):
+    from app.core.bar_store import bars_to_records
+    from app.tools.registry import compute_indicator
+
+    arguments = {"stockSymbol": "SYM", **spec.default_arguments()}
+    if mode == "idle":
+        await asyncio.sleep(1)
+    elif mode == "event loop":
+        for _ in range(count):
+            spec.compute(bars_to_records(bars), arguments)
+            await asyncio.sleep(0)
+    elif mode == "thread pool":
+        await asyncio.gather(
+            *(
+                asyncio.to_thread(spec.compute, bars_to_records(bars), arguments)
+                for _ in range(count)
+            )
+        )
+    else:
+        await asyncio.gather(
+            *(compute_indicator(spec, bars_to_records(bars), arguments) for _ in range(count))
+        )
+
+
+async def measure(mode, light, heavy, bars, count, interval):
+    done = asyncio.Event()
+    requests = asyncio.ensure_future(light_requests(light, bars, interval, done))
+    started = time.perf_counter()
+    await heavy_calculations(mode, heavy, bars, count)
+    elapsed = time.perf_counter() - started
+    done.set()
+    latencies = sorted(await requests)
+    return elapsed, latencies
+
+
+def percentile(latencies, fraction):
+    return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bars", type=int, default=20000)
+    parser.add_argument("--heavy", type=int, default=40)
+    parser.add_argument("--interval-ms", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=0)
+    args = parser.parse_args()
+    if args.workers:
+        os.environ["COMPUTE_WORKERS"] = str(args.workers)
+
+    from app.core.bar_store import records_to_bars
+    from app.core.compute import close_compute_executor, get_compute_executor
+    from app.tools.registry import get_tool
+
+    bars = records_to_bars(synthetic_bars(args.bars, 0))
+    light, heavy = get_tool("getStockRSI"), get_tool("getStockMACD")
+    executor = get_compute_executor()
+    executor.start()
+    print(
+        f"{args.heavy} x {heavy.name} over {args.bars} bars, light {light.name} "
+        f"every {args.interval_ms:g}ms, {executor.max_workers} compute worker(s)"
+    )
+    try:
+        for mode in ("idle", "event loop", "thread pool", "compute pool"):
+            elapsed, latencies = await measure(
+                mode, light, heavy, bars, args.heavy, args.interval_ms / 1000
+            )
+            print(
+                f"{mode:>12}: heavy {elapsed:6.2f}s  light p50 "
+                f"{percentile(latencies, 0.5):7.2f}ms  p95 {percentile(latencies, 0.95):7.2f}ms  "
+                f"max {latencies[-1] * 1000:7.2f}ms  ({len(latencies)} requests)"
+            )
+    finally:
+        close_compute_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+"""
+Measure application import time with ``python -X importtime``.
+
+Usage:
+    python benchmarks/import_time.py [--module main] [--budget-ms 1500]
+
+Exits with status 1 when the cumulative import time of the module exceeds the
+budget, so it can be used as a CI gate. Credentials are not required: nothing
+reads settings or creates clients at import time.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Default budget for the cumulative import time of the module
+BUDGET_MS = 1500.0
+
+
+def measure(module):
+    """
+    Import ``module`` in a fresh interpreter and parse the importtime report.
+
+    Returns:
+        tuple: Cumulative import time of ``module`` in microseconds, and the
+        (self time, name) of every imported module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        modules.append((int(self_us), name.strip()))
+        if name.strip() == module:
+            total = int(cumulative_us)
+    return total, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    total_us, modules = measure(args.module)
+    print(f"import {args.module}: {total_us / 1000:.1f} ms (budget {args.budget_ms} ms)")
+    print(f"Slowest {args.top} modules by self time:")
+    for self_us, name in sorted(modules, reverse=True)[: args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+    if total_us / 1000 > args.budget_ms:
+        print("Import time budget exceeded.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Measure the logging overhead of a tool call on the request thread.
+
+Usage:
+    python benchmarks/logging_overhead.py [--requests 2000] [--bars 5000]
+
+Replays the log calls of one getStockMACD tool call, once as they were made
+before (synchronous console and file handlers, f-strings, the whole output
+payload at INFO) and once with the current setup (queue handler, lazy
+%-formatting, the payload truncated at DEBUG). Reports the time spent on the
+calling thread per request, and the time until the log file is written.
+Console output goes to /dev/null and the log file to a temporary directory.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from worker_scaling import synthetic_bars  # noqa: E402
+
+ARGUMENTS = {"stockSymbol": "SYM", "shortPeriod": 12, "longPeriod": 26, "signalPeriod": 9}
+
+
+def reset_logging():
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+
+def before(logger, output):
+    # The log calls of a tool call before structured logging
+    name = "getStockMACD"
+    logger.info("Handling tool output for function: %s", name)
+    logger.info(f"Calling tool: {name} with args: {ARGUMENTS}")
+    logger.info("Calculating %s for stock: %s", name, ARGUMENTS["stockSymbol"])
+    logger.info("%s calculated successfully for stock: %s", name, ARGUMENTS["stockSymbol"])
+    logger.info("Output of %s: %s", name, output)
+    logger.info(f"Output of handleToolOutputs: {output}")
+
+
+def after(logger, output):
+    # The same tool call with the current log calls
+    from app.core.logger import Truncated
+
+    name = "getStockMACD"
+    logger.debug("Handling tool output for function: %s", name)
+    logger.debug("Calling tool: %s with args: %s", name, Truncated(ARGUMENTS))
+    logger.debug("Calculating %s for stock: %s", name, ARGUMENTS["stockSymbol"])
+    logger.debug("%s calculated successfully for stock: %s", name, ARGUMENTS["stockSymbol"])
+    logger.info(
+        "Tool call %s took %.1fms",
+        name,
+        1.0,
+        extra={"tool": name, "symbol": ARGUMENTS["stockSymbol"]},
+    )
+    logger.debug("Output of %s: %s", name, Truncated(output))
+    logger.debug("Output of handleToolOutputs: %s", Truncated(output))
+
+
+def measure(log_calls, logger, output, requests, drain):
+    started = time.perf_counter()
+    for _ in range(requests):
+        log_calls(logger, output)
+    caller = time.perf_counter() - started
+    drain()
+    return caller, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--bars", type=int, default=5000)
+    args = parser.parse_args()
+
+    from app.core.bar_store import bars_to_records, records_to_bars
+    from app.core.logger import configure_logging, stop_logging
+    from app.utils.calculate_stock_MACD import compute_stock_macd
+
+    bars = records_to_bars(synthetic_bars(args.bars, 0))
+    output = {"output": compute_stock_macd(bars_to_records(bars), ARGUMENTS)}
+    print(f"{args.requests} tool calls, {len(str(output)) / 1024:.0f} KiB output payload")
+
+    os.chdir(tempfile.mkdtemp(prefix="logs-"))
+    sys.stdout = open(os.devnull, "w")
+    logger = logging.getLogger("benchmark")
+    results = {}
+
+    # Before: synchronous handlers on the calling thread
+    reset_logging()
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(name)s | %(levelname)s | %(message)s",
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+            RotatingFileHandler("before.log", maxBytes=5 * 1024 * 1024, backupCount=3),
+        ],
+    )
+    results["before"] = measure(before, logger, output, args.requests, lambda: None)
+    reset_logging()
+
+    for log_format in ("text", "json"):
+        configure_logging(log_format=log_format, log_file=f"after-{log_format}.log")
+        results[f"after ({log_format})"] = measure(
+            after, logger, output, args.requests, stop_logging
+        )
+        reset_logging()
+
+    sys.stdout = sys.__stdout__
+    for label, (caller, total) in results.items():
+        print(
+            f"{label:>13}: {caller / args.requests * 1e6:9.1f}us per request on the caller, "
+            f"{total / args.requests * 1e6:9.1f}us until written"
+        )
+
+
+if __name__ == "__main__":
+    main()
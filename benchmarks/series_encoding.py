@@ -0,0 +1,103 @@
+"""
+Compare the size and serialization time of indicator series encodings.
+
+Usage:
+    python benchmarks/series_encoding.py [--points 1000] [--fields 3]
+        [--repeat 50]
+
+Builds an indicator response with a series of ``--points`` bars and
+``--fields`` values per bar (e.g. the three Bollinger Bands) and encodes it:
+the previous row layout through FastAPI's default JSON path, and the
+columnar layout as orjson JSON, MessagePack and Arrow IPC. Each body is also
+compressed with gzip and brotli. Encodings whose library is not installed
+are skipped.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def series_response(points, fields, layout):
+    from app.routers.indicators import IndicatorResponse, SeriesColumns, SeriesPoint
+
+    rng = random.Random(0)
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    dates = [start + timedelta(days=day) for day in range(points)]
+    names = [f"field{index}" for index in range(fields)]
+    rows = [{name: rng.uniform(50, 150) for name in names} for _ in dates]
+    if layout == "rows":
+        series = [SeriesPoint(date=day, values=values) for day, values in zip(dates, rows)]
+    else:
+        series = SeriesColumns(
+            date=dates, values={name: [row[name] for row in rows] for name in names}
+        )
+    return IndicatorResponse(
+        symbol="SYM",
+        indicator="bollinger-bands",
+        as_of=str(dates[-1]),
+        parameters={"period": 20, "multiplier": 2},
+        values=rows[-1],
+        series=series,
+    )
+
+
+def timed(function, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return result, (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--points", type=int, default=1000)
+    parser.add_argument("--fields", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    from fastapi.encoders import jsonable_encoder
+    from app.core.encoding import ARROW, JSON, MSGPACK, _installed, compress, encode
+
+    rows = series_response(args.points, args.fields, "rows")
+    columns = series_response(args.points, args.fields, "columns")
+    content = columns.model_dump(by_alias=True)
+    table = {"date": content["series"]["date"], **content["series"]["values"]}
+
+    encodings = {
+        "rows, json (before)": lambda: json.dumps(
+            jsonable_encoder(rows.model_dump(by_alias=True))
+        ).encode(),
+        "columns, orjson": lambda: encode(content, JSON),
+    }
+    if _installed(MSGPACK):
+        encodings["columns, msgpack"] = lambda: encode(content, MSGPACK)
+    if _installed(ARROW):
+        encodings["columns, arrow"] = lambda: encode(content, ARROW, table, "series")
+    codings = [None, "gzip"] + (["br"] if _installed("br") else [])
+
+    print(f"{args.points} points x {args.fields} fields")
+    for label, encoder in encodings.items():
+        body, seconds = timed(encoder, args.repeat)
+        line = f"{label:>20}: {len(body) / 1024:8.1f} KiB {seconds * 1000:7.2f}ms"
+        for coding in codings[1:]:
+            compressed, compress_seconds = timed(lambda: compress(body, coding), args.repeat)
+            line += (
+                f" | {coding} {len(compressed) / 1024:7.1f} KiB "
+                f"{(seconds + compress_seconds) * 1000:7.2f}ms"
+            )
+        print(line)
+    missing = [name for name in (MSGPACK, ARROW, "br") if not _installed(name)]
+    if missing:
+        print(f"Not installed, skipped: {', '.join(missing)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Measure the time and memory allocated to turn a tool output into the text
+sent back to the model.
+
+Usage:
+    python benchmarks/tool_output_serialization.py [--bars 5000] [--repeat 200]
+
+Before: the output was deep-copied by a recursive walk that stringified
+ObjectIds (``convert_objectid_to_str``) and then serialized with
+``json.dumps``. After: documents are read without ``_id`` into typed result
+models and the output is serialized once with ``dumps_json`` (orjson with a
+default hook). Compared for a MACD output and for ``getStocksByIndustry``
+documents. No MongoDB or OpenAI access is needed.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from worker_scaling import synthetic_bars  # noqa: E402
+
+STOCK = {
+    "Company Name": "Tata Consultancy Services Ltd.",
+    "Industry": "Information Technology",
+    "Symbol": "TCS",
+    "Series": "EQ",
+    "ISIN Code": "INE467B01029",
+}
+
+
+def convert_objectid_to_str(data):
+    # The recursive walk previously applied to every tool output
+    from bson import ObjectId
+
+    if isinstance(data, dict):
+        return {key: convert_objectid_to_str(value) for key, value in data.items()}
+    elif isinstance(data, list):
+        return [convert_objectid_to_str(item) for item in data]
+    elif isinstance(data, ObjectId):
+        return str(data)
+    return data
+
+
+def measure(serialize, output, repeat):
+    serialize(output)  # Warm up
+    tracemalloc.start()
+    serialize(output)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        serialize(output)
+    return peak, (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bars", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    from bson import ObjectId
+    from app.core.bar_store import bars_to_records, records_to_bars
+    from app.core.encoding import dumps_json
+    from app.schemas.stock import NiftyStock
+    from app.utils.calculate_stock_MACD import compute_stock_macd
+
+    bars = bars_to_records(records_to_bars(synthetic_bars(args.bars, 0)))
+    macd = compute_stock_macd(
+        bars, {"shortPeriod": 12, "longPeriod": 26, "signalPeriod": 9}
+    )
+    documents = [{"_id": ObjectId(), **STOCK} for _ in range(10)]
+    models = [NiftyStock.model_validate(STOCK) for _ in range(10)]
+
+    cases = {
+        "getStockMACD": ({"output": macd}, {"output": macd}),
+        "getStocksByIndustry": ({"output": documents}, {"output": models}),
+    }
+    for name, (before_output, after_output) in cases.items():
+        before = measure(
+            lambda output: json.dumps(convert_objectid_to_str(output)),
+            before_output,
+            args.repeat,
+        )
+        after = measure(dumps_json, after_output, args.repeat)
+        for label, (peak, seconds) in (("before", before), ("after", after)):
+            print(
+                f"{name:>20} {label:>6}: {peak / 1024:9.1f} KiB allocated, "
+                f"{seconds * 1e6:9.1f}us per call"
+            )
+
+
+if __name__ == "__main__":
+    main()
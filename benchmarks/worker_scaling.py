@@ -0,0 +1,111 @@
+"""
+Measure indicator throughput when requests are spread over 1..N worker processes.
+
+Usage:
+    python benchmarks/worker_scaling.py [--max-workers N] [--requests 2000]
+        [--symbols 50] [--bars 5000]
+
+Synthetic daily bars are written to a temporary bar store, then every worker
+serves indicator requests the way the API does with the default parameters:
+map the symbol's bars, convert the tool's lookback window and compute the
+indicator. No MongoDB or OpenAI access is needed.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Settings are required to build the bar store paths; no client is created
+for _name in ("OPENAI_API_KEY", "ASSISTANT_ID", "MONGO_DB_URI", "DB_NAME"):
+    os.environ.setdefault(_name, "benchmark")
+
+
+def synthetic_bars(bars, seed):
+    rng = random.Random(seed)
+    start = datetime(2000, 1, 3, tzinfo=timezone.utc)
+    close = 100.0
+    stock_data = []
+    for day in range(bars):
+        open_ = close
+        close = max(1.0, close * (1 + rng.gauss(0, 0.015)))
+        stock_data.append(
+            {
+                "Date": start + timedelta(days=day),
+                "Open": open_,
+                "High": max(open_, close) * (1 + rng.random() * 0.01),
+                "Low": min(open_, close) * (1 - rng.random() * 0.01),
+                "Close": close,
+                "Volume": rng.randint(100_000, 5_000_000),
+            }
+        )
+    return stock_data
+
+
+def serve_requests(requests):
+    from app.core.bar_store import bars_to_records, load_bars
+    from app.tools.registry import all_tools
+
+    specs = {spec.name: spec for spec in all_tools() if spec.compute is not None}
+    for symbol, tool in requests:
+        spec = specs[tool]
+        arguments = {"stockSymbol": symbol, **spec.default_arguments()}
+        stock_data = bars_to_records(load_bars(symbol), spec.bars_needed(arguments))
+        spec.compute(stock_data, arguments)
+    return len(requests)
+
+
+def run(workers, requests):
+    chunks = [requests[index::workers] for index in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Warm up each worker (imports, first mapping) outside the timing
+        list(pool.map(serve_requests, [chunk[:1] for chunk in chunks]))
+        started = time.perf_counter()
+        served = sum(pool.map(serve_requests, chunks))
+        return served / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--bars", type=int, default=5000)
+    args = parser.parse_args()
+
+    store_dir = tempfile.mkdtemp(prefix="bars-")
+    os.environ["BAR_STORE_DIR"] = store_dir
+
+    from app.core.bar_store import write_bars
+    from app.tools.registry import all_tools
+
+    symbols = [f"SYM{index}" for index in range(args.symbols)]
+    for seed, symbol in enumerate(symbols):
+        stock_data = synthetic_bars(args.bars, seed)
+        write_bars(symbol, stock_data, str(stock_data[-1]["Date"]))
+    tools = [spec.name for spec in all_tools() if spec.compute is not None]
+
+    rng = random.Random(0)
+    requests = [(rng.choice(symbols), rng.choice(tools)) for _ in range(args.requests)]
+
+    counts = sorted({1, *range(2, args.max_workers + 1, 2), args.max_workers})
+    baseline = None
+    print(f"{len(symbols)} symbols x {args.bars} bars in {store_dir}")
+    for workers in counts:
+        throughput = run(workers, requests)
+        baseline = baseline or throughput
+        print(
+            f"{workers:3d} worker(s): {throughput:9.1f} req/s  "
+            f"({throughput / baseline:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
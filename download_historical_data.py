@@ -1,26 +1,131 @@
+import argparse
 import yfinance as yf
 from datetime import datetime, timedelta
 
 
-def download_historical_data(stock_symbol: str, filename: str):
+def download_historical_data(stock_symbol: str, filename: str, days: int = 365):
     try:
         end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
+        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
 
-        stock_data = yf.download(stock_symbol, start=start_date, end=end_date)
+        # auto_adjust=False keeps dividends out of the prices, but Yahoo's
+        # Close is still split-adjusted: to_bars undoes the splits before the
+        # bars are stored (see app/utils/price_adjustment.py)
+        stock_data = yf.download(
+            stock_symbol, start=start_date, end=end_date, auto_adjust=False
+        )
 
         if stock_data.empty:
             print(f"No data found for {stock_symbol}.")
             return
 
-        stock_data.to_csv(filename)
-        print(f"Data successfully downloaded to {filename}")
+        if filename:
+            stock_data.to_csv(filename)
+            print(f"Data successfully downloaded to {filename}")
+        return stock_data
 
     except Exception as e:
         print(f"Error downloading historical data: {e}")
 
 
+def download_splits(stock_symbol):
+    """
+    Return every split Yahoo Finance reports for a symbol as corporate actions.
+    """
+    return [
+        {
+            "date": date.to_pydatetime().replace(tzinfo=None),
+            "type": "split",
+            "ratio": float(ratio),
+        }
+        for date, ratio in yf.Ticker(stock_symbol).splits.items()
+        if ratio > 0
+    ]
+
+
+def to_bars(stock_data, splits=()):
+    """
+    Convert a yfinance DataFrame to the bar dicts stored in MongoDB.
+
+    Args:
+        stock_data (DataFrame): Daily bars from ``yf.download``.
+        splits (list): The symbol's splits from ``download_splits``; the
+            split adjustment Yahoo applied to the prices is undone, so the
+            bars are stored as traded.
+    """
+    # Imported here so that downloading to CSV needs no database settings
+    from app.utils.price_adjustment import undo_splits
+
+    if stock_data.columns.nlevels > 1:
+        # Recent yfinance versions add the ticker as a second column level
+        stock_data = stock_data.droplevel(1, axis=1)
+    bars = [
+        {
+            "Date": date.to_pydatetime().replace(tzinfo=None),
+            "Open": float(row["Open"]),
+            "High": float(row["High"]),
+            "Low": float(row["Low"]),
+            "Close": float(row["Close"]),
+            "Volume": int(row["Volume"]),
+        }
+        for date, row in stock_data.iterrows()
+    ]
+    return undo_splits(bars, splits)
+
+
+def ingest_historical_data(stock_symbol: str, days: int = 365):
+    """
+    Download bars for a Yahoo Finance symbol (e.g. ``TCS.NS``) and ingest them
+    into MongoDB and the bar store.
+    """
+    # Imported here so that downloading to CSV needs no database settings
+    from app.core.database import get_database
+    from app.core.logger import configure_logging
+    from app.utils.bar_ingestion import ingest_bars, ingest_corporate_actions
+    from app.utils.price_adjustment import CORPORATE_ACTIONS_COLLECTION
+
+    configure_logging()
+    stock_data = download_historical_data(stock_symbol, None, days)
+    if stock_data is None:
+        return
+    symbol = stock_symbol.removesuffix(".NS")
+    splits = download_splits(stock_symbol)
+    bars = to_bars(stock_data, splits)
+    stored = ingest_bars(symbol, bars)
+    print(f"{stock_symbol}: {stored} bar(s) stored")
+
+    # Stored bars are as traded, so splits within the downloaded range must be
+    # known for adjusted prices; only new ones bump the adjustment revision
+    known = {
+        action["date"]
+        for action in get_database()[CORPORATE_ACTIONS_COLLECTION].find(
+            {"symbol": symbol, "type": "split"}, {"_id": 0, "date": 1}
+        )
+    }
+    new_splits = [
+        split
+        for split in splits
+        if bars[0]["Date"] < split["date"] <= bars[-1]["Date"] and split["date"] not in known
+    ]
+    if new_splits:
+        ingest_corporate_actions(symbol, new_splits)
+        print(f"{stock_symbol}: {len(new_splits)} split(s) stored")
+
+
 if __name__ == "__main__":
-    stock_symbol = "TCS.NS"
-    filename = "TCS_historical_data.csv"
-    download_historical_data(stock_symbol, filename)
+    parser = argparse.ArgumentParser(description="Download historical daily bars.")
+    parser.add_argument("symbols", nargs="*", default=["TCS.NS"])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument(
+        "--ingest",
+        action="store_true",
+        help="Store the bars in MongoDB and the bar store instead of a CSV file.",
+    )
+    args = parser.parse_args()
+
+    for stock_symbol in args.symbols:
+        if args.ingest:
+            ingest_historical_data(stock_symbol, args.days)
+        else:
+            filename = f"{stock_symbol.removesuffix('.NS')}_historical_data.csv"
+            download_historical_data(stock_symbol, filename, args.days)
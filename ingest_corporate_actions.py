@@ -0,0 +1,53 @@
+import argparse
+from datetime import datetime
+from app.core.logger import configure_logging
+from app.utils.bar_ingestion import ingest_corporate_actions
+
+
+def parse_action(action_type, field):
+    """
+    Build an argparse type for ``YYYY-MM-DD:VALUE`` corporate actions.
+    """
+
+    def parse(value):
+        try:
+            date, amount = value.split(":")
+            return {"date": datetime.strptime(date, "%Y-%m-%d"), "type": action_type, field: float(amount)}
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Expected YYYY-MM-DD:{field.upper()}, got {value!r}")
+
+    return parse
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Store splits and dividends of a symbol and rebuild its "
+        "price-adjustment factors. Without actions, the factors are rebuilt "
+        "from the stored actions."
+    )
+    parser.add_argument("symbol", help="The stock symbol (e.g. TCS).")
+    parser.add_argument(
+        "--split",
+        action="append",
+        default=[],
+        type=parse_action("split", "ratio"),
+        help="Ex-date and new shares per share, e.g. 2024-01-15:2 for a 2-for-1 split.",
+    )
+    parser.add_argument(
+        "--dividend",
+        action="append",
+        default=[],
+        type=parse_action("dividend", "amount"),
+        help="Ex-date and dividend per share, e.g. 2024-06-10:24.5.",
+    )
+    args = parser.parse_args()
+
+    configure_logging()
+    factors = ingest_corporate_actions(args.symbol, args.split + args.dividend)
+    print(
+        f"{args.symbol}: {len(factors['dates'])} adjustment(s), revision {factors['revision']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,47 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import all_routes
+from app.core.compute import close_compute_executor, get_compute_executor
+from app.core.config import get_settings
+from app.core.database import close_mongo_client
 from app.core.logger import configure_logging
+from app.core.openai import close_openai_client
 
 # Configure logging
 configure_logging()
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Clients are created on first use by their dependency providers
+    # (get_database, get_openai_client) and released on shutdown. The
+    # compute workers are started up front so that the first CPU-heavy
+    # request does not wait for them to spawn and import the calculators.
+    await asyncio.to_thread(get_compute_executor().start)
+    # Webhooks of triggered alerts are sent in the background, not by the
+    # ingestion that queued them. Imported lazily: the alert engine pulls in
+    # NumPy and the data layer.
+    dispatcher = None
+    interval = get_settings().alert_dispatch_interval_seconds
+    if interval > 0:
+        from app.utils.alerts import run_webhook_dispatcher
+
+        dispatcher = asyncio.create_task(run_webhook_dispatcher(interval))
+    yield
+    if dispatcher is not None:
+        dispatcher.cancel()
+        try:
+            await dispatcher
+        except asyncio.CancelledError:
+            pass
+    close_compute_executor()
+    close_openai_client()
+    close_mongo_client()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -17,6 +52,8 @@ app.add_middleware(
     allow_credentials=True,  # Allows sending cookies from the frontend to the backend (if applicable)
     allow_methods=["*"],  # Allows all HTTP methods (GET, POST, etc.)
     allow_headers=["*"],  # Allows all headers
+    # Lets browser clients read the pagination cursor and revalidate with ETags
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Include all routes
@@ -0,0 +1,27 @@
+import argparse
+from app.core.logger import configure_logging
+from app.utils.indicator_materializer import materialize_all
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Precompute default-parameter indicators for the Nifty 50 "
+        "into the indicators_latest collection. Run after new bars are ingested."
+    )
+    parser.add_argument(
+        "symbols", nargs="*", help="Symbols to process (defaults to all Nifty 50)."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Process pool size (default: CPU count)."
+    )
+    args = parser.parse_args()
+
+    configure_logging()
+    results = materialize_all(args.symbols or None, max_workers=args.workers)
+    print(
+        f"Materialized {sum(results.values())} indicator(s) for {len(results)} symbol(s)."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,8 @@ import os
 from app.tools.tools import tools
 from app.utils.function_handlers import handle_tool_outputs
 import asyncio
-from app.core.logger import logging
+from app.core.encoding import dumps_json
+from app.core.logger import Truncated, logging
 
 client = OpenAI(
     api_key=os.getenv("OPENAI_API_KEY"),
@@ -60,7 +61,7 @@ async def main():
             name = tool_call.name
             args = json.loads(tool_call.arguments)
 
-            logger.debug(f"Calling tool: {name} with args: {args}")
+            logger.debug("Calling tool: %s with args: %s", name, Truncated(args))
             result = await handle_tool_outputs(name, args)
 
             await asyncio.sleep(2)
@@ -70,7 +71,7 @@ async def main():
                 {
                     "type": "function_call_output",
                     "call_id": tool_call.call_id,
-                    "output": str(result),
+                    "output": dumps_json(result),
                 }
             )
 
@@ -0,0 +1,66 @@
+"""
+Production entry point: runs the API on several uvicorn worker processes.
+
+Worker model:
+    - Every worker is a separate process with its own OpenAI client, MongoDB
+      client, answer cache and data-version cache. Nothing in-process is
+      shared, so caches warm up per worker.
+    - OHLCV bars are shared. Before the workers start, every symbol's history
+      is written to the bar store (``BAR_STORE_DIR``) and each worker
+      memory-maps the same read-only files, so the bars live once in the OS
+      page cache however many workers run.
+    - The MongoDB connection budget (``MONGO_MAX_CONNECTIONS``) is split
+      between the workers: each client gets
+      ``MONGO_MAX_CONNECTIONS // WEB_CONCURRENCY`` pooled connections.
+
+Usage:
+    python serve.py [--workers N] [--host 0.0.0.0] [--port 8000] [--no-prime]
+"""
+
+import argparse
+import os
+import uvicorn
+from app.core.logger import configure_logging
+
+
+def prime_bars():
+    # Imported here so that the settings are read after WEB_CONCURRENCY is set
+    from app.core.bar_store import prime_bar_store
+    from app.core.database import close_mongo_client, get_database
+    from app.utils.indicator_materializer import NIFTY50_COLLECTION
+
+    db = get_database()
+    written = prime_bar_store(db, db[NIFTY50_COLLECTION].distinct("Symbol"))
+    # Workers open their own clients; the supervisor does not need one
+    close_mongo_client()
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        help="Number of worker processes (default: WEB_CONCURRENCY or CPU count).",
+    )
+    parser.add_argument(
+        "--no-prime",
+        action="store_true",
+        help="Do not refresh the bar store before starting the workers.",
+    )
+    args = parser.parse_args()
+
+    # Inherited by the workers, which size their MongoDB pools from it
+    os.environ["WEB_CONCURRENCY"] = str(args.workers)
+    configure_logging()
+    if not args.no_prime:
+        print(f"Primed the bar store for {prime_bars()} symbol(s).")
+
+    uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
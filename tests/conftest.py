@@ -0,0 +1,22 @@
+import pytest
+from app.utils import universe
+from tests.support import FakeDatabase
+
+
+@pytest.fixture
+def db():
+    return FakeDatabase()
+
+
+@pytest.fixture
+def universe_of(monkeypatch):
+    """
+    Build a Universe from chronological bars per symbol, aligned the way
+    get_universe aligns the bar store's histories.
+    """
+
+    def build(histories):
+        monkeypatch.setattr(universe, "get_bar_history", histories.__getitem__)
+        return universe._load.__wrapped__(tuple(histories), ("test",) * len(histories))
+
+    return build
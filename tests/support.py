@@ -0,0 +1,112 @@
+"""
+Synthetic bars and an in-memory MongoDB stand-in shared by the tests.
+"""
+
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from pymongo.errors import BulkWriteError
+from app.core.bar_store import FIELDS
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)  # A Monday
+
+
+def daily_bars(closes, start=START, volume=1000.0):
+    """
+    Build chronological bars, one per calendar day, from closing prices.
+
+    Open is the previous close, and high and low are 1% around the wider of
+    the two, like the synthetic bars of the benchmarks.
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    bars = np.empty((len(FIELDS), len(closes)))
+    bars[0] = [(start + timedelta(days=day)).timestamp() for day in range(len(closes))]
+    bars[1] = np.concatenate((closes[:1], closes[:-1]))
+    bars[2] = np.maximum(bars[1], closes) * 1.01
+    bars[3] = np.minimum(bars[1], closes) * 0.99
+    bars[4] = closes
+    bars[5] = volume
+    return bars
+
+
+def random_closes(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 * np.cumprod(1 + rng.normal(0, 0.015, count))
+
+
+class FakeCollection:
+    """
+    The subset of a PyMongo collection used by the session store.
+    """
+
+    def __init__(self):
+        self.docs = []
+
+    def create_index(self, keys, **kwargs):
+        pass
+
+    def _matches(self, doc, query):
+        for key, condition in query.items():
+            if isinstance(condition, dict):
+                (operator, value), = condition.items()
+                if operator == "$exists":
+                    matched = (key in doc) == value
+                elif operator == "$lt":
+                    matched = key in doc and doc[key] < value
+                else:
+                    matched = key in doc and doc[key] <= value
+                if not matched:
+                    return False
+            elif doc.get(key) != condition:
+                return False
+        return True
+
+    def find_one(self, query, projection=None):
+        for doc in self.docs:
+            if self._matches(doc, query):
+                return dict(doc)
+        return None
+
+    def insert_many(self, docs, ordered=True):
+        errors = []
+        ids = {doc["_id"] for doc in self.docs}
+        for index, doc in enumerate(docs):
+            if doc["_id"] in ids:
+                errors.append({"index": index, "code": 11000})
+                continue
+            ids.add(doc["_id"])
+            self.docs.append(dict(doc))
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+    def update_one(self, query, update, upsert=False):
+        for doc in self.docs:
+            if self._matches(doc, query):
+                for key in update.get("$unset", {}):
+                    doc.pop(key, None)
+                return
+        raise AssertionError("update_one is only used on existing documents here")
+
+    def aggregate(self, pipeline, batchSize=None):
+        # $match on session_id and created_at, $sort newest bucket first, then
+        # $project the last messages, optionally $filter'ed by created_at
+        match, _, project = pipeline
+        docs = [doc for doc in self.docs if self._matches(doc, match["$match"])]
+        docs.sort(key=lambda doc: (doc["created_at"], str(doc["_id"])), reverse=True)
+        messages, count = project["$project"]["messages"]["$slice"]
+        for doc in docs:
+            kept = doc["messages"]
+            if isinstance(messages, dict):
+                (operator, (_, value)), = messages["$filter"]["cond"].items()
+                kept = [
+                    message
+                    for message in kept
+                    if message["created_at"] < value
+                    or (operator == "$lte" and message["created_at"] == value)
+                ]
+            yield {"messages": kept[count:]}
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        collection = self[name] = FakeCollection()
+        return collection
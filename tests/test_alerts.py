@@ -0,0 +1,183 @@
+import socket
+import httpx
+import numpy as np
+import pytest
+from app.utils import alerts
+from app.utils.alerts import (
+    OPERATORS,
+    bars_needed,
+    build_rule,
+    check_webhook_url,
+    post_webhook,
+    triggered_rules,
+)
+from app.utils.backtest import compute_series
+from tests.support import daily_bars, random_closes
+
+
+def _rules(operator, thresholds, series="close", **params):
+    return [
+        build_rule("TEST", {"series": series, **params}, operator, threshold)
+        for threshold in thresholds
+    ]
+
+
+@pytest.mark.parametrize(
+    "operator, expected",
+    [
+        ("<", [False, False, True]),
+        ("<=", [False, True, True]),
+        (">", [True, False, False]),
+        (">=", [True, True, False]),
+    ],
+)
+def test_comparisons_use_the_latest_close(operator, expected):
+    histories = {"TEST": daily_bars([10, 20, 30])}
+    triggered, latest = triggered_rules(_rules(operator, [29, 30, 31]), histories)
+
+    assert triggered.tolist() == expected
+    assert latest.tolist() == [30, 30, 30]
+
+
+def test_crosses_above_fires_only_on_the_day_of_the_cross():
+    rules = _rules("crossesAbove", [15, 25, 35])
+
+    triggered, _ = triggered_rules(rules, {"TEST": daily_bars([10, 20, 30])})
+    # 20 -> 30 crosses 25; it was already above 15 and is still below 35
+    assert triggered.tolist() == [False, True, False]
+
+    triggered, _ = triggered_rules(rules, {"TEST": daily_bars([10, 25, 30])})
+    # Touching the threshold the day before still counts as a cross
+    assert triggered.tolist() == [False, True, False]
+
+
+def test_crosses_below_fires_only_on_the_day_of_the_cross():
+    rules = _rules("crossesBelow", [15, 25, 35])
+
+    triggered, _ = triggered_rules(rules, {"TEST": daily_bars([40, 30, 20])})
+    assert triggered.tolist() == [False, True, False]
+
+
+def test_rules_are_grouped_per_symbol_and_series():
+    histories = {"UP": daily_bars([10, 20, 30]), "DOWN": daily_bars([30, 20, 10])}
+    rules = [
+        build_rule("UP", {"series": "close"}, ">", 25),
+        build_rule("DOWN", {"series": "close"}, ">", 25),
+        build_rule("DOWN", {"series": "close"}, "crossesBelow", 15),
+        build_rule("UP", {"series": "sma", "period": 2}, ">=", 25),
+    ]
+    triggered, latest = triggered_rules(rules, histories)
+
+    assert triggered.tolist() == [True, False, True, True]
+    assert latest.tolist() == [30, 10, 10, 25]
+
+
+def test_warm_up_and_missing_symbols_never_trigger():
+    rules = [
+        build_rule("TEST", {"series": "rsi", "period": 14}, "<", 101),
+        build_rule("MISSING", {"series": "close"}, ">", 0),
+    ]
+    triggered, latest = triggered_rules(rules, {"TEST": daily_bars(random_closes(10))})
+
+    assert not triggered.any()
+    assert np.isnan(latest).all()
+
+
+@pytest.mark.parametrize(
+    "indicator",
+    [
+        {"series": "rsi", "period": 14},
+        {"series": "sma", "period": 50},
+        {"series": "ema", "period": 20},
+        {"series": "macdHistogram"},
+        {"series": "bollingerLower", "period": 20},
+        {"series": "stochasticK", "period": 14},
+    ],
+)
+def test_tail_window_gives_the_full_history_values(indicator):
+    # Alerts compute series over only the newest bars_needed bars
+    bars = daily_bars(random_closes(3000, seed=7))
+    rule = build_rule("TEST", indicator, ">", 0)
+
+    needed = bars_needed(rule["series"], rule["params"])
+    full = compute_series(bars, rule["series"], rule["params"])
+    tail = compute_series(bars[:, -needed:], rule["series"], rule["params"])
+    # Prefix sums over different lengths round differently
+    np.testing.assert_allclose(tail[-2:], full[-2:], rtol=1e-9)
+
+
+def test_every_operator_is_evaluated():
+    closes = [10, 20, 30]
+    rules = [build_rule("TEST", {"series": "close"}, operator, 25) for operator in OPERATORS]
+    triggered, _ = triggered_rules(rules, {"TEST": daily_bars(closes)})
+
+    assert dict(zip(OPERATORS, triggered.tolist())) == {
+        "<": False,
+        "<=": False,
+        ">": True,
+        ">=": True,
+        "crossesAbove": True,
+        "crossesBelow": False,
+    }
+
+
+@pytest.fixture
+def resolve(monkeypatch):
+    """
+    Resolve webhook hosts to the given addresses, one list per lookup.
+    """
+
+    def answers(*lookups):
+        lookups = list(lookups)
+
+        def getaddrinfo(host, port, type=0):
+            return [
+                (socket.AF_INET6 if ":" in ip else socket.AF_INET, type, 6, "", (ip, 0))
+                for ip in lookups.pop(0)
+            ]
+
+        monkeypatch.setattr(alerts.socket, "getaddrinfo", getaddrinfo)
+
+    return answers
+
+
+@pytest.mark.parametrize("address", ["127.0.0.1", "10.0.0.5", "169.254.169.254", "::1"])
+def test_webhooks_to_private_addresses_are_rejected(resolve, address):
+    resolve(["93.184.215.14", address])
+
+    with pytest.raises(ValueError, match="not a public address"):
+        check_webhook_url("https://hooks.example.com/alert")
+
+
+def _recording_client(requests):
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(204)
+
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+def test_webhook_is_posted_to_the_checked_address(resolve):
+    # A second lookup would return a private address (DNS rebinding)
+    resolve(["93.184.215.14"], ["127.0.0.1"])
+    requests = []
+    with _recording_client(requests) as client:
+        post_webhook(client, "https://hooks.example.com:8443/alert?id=1", b"{}")
+
+    (request,) = requests
+    assert str(request.url) == "https://93.184.215.14:8443/alert?id=1"
+    assert request.headers["Host"] == "hooks.example.com:8443"
+    assert request.extensions["sni_hostname"] == "hooks.example.com"
+    assert request.headers["Content-Type"] == "application/json"
+
+
+def test_plain_http_webhooks_to_ipv6_hosts(resolve):
+    resolve(["2606:4700::1111"])
+    requests = []
+    with _recording_client(requests) as client:
+        post_webhook(client, "http://hooks.example.com/alert", b"{}")
+
+    (request,) = requests
+    assert request.url.host == "2606:4700::1111"
+    assert request.headers["Host"] == "hooks.example.com"
+    assert "sni_hostname" not in request.extensions
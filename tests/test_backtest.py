@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+import numpy as np
+import pytest
+from app.core.bar_store import DATE
+from app.tools.backtest_strategy import BacktestStrategyParams
+from app.utils.backtest import positions, simulate
+from tests.support import daily_bars, random_closes
+
+
+def _strategy(entry, exit_, **options):
+    params = BacktestStrategyParams(entry=entry, exit=exit_, **options)
+    return params.model_dump(by_alias=True)
+
+
+def _close(operator, value):
+    return {"left": {"series": "close"}, "operator": operator, "right": value}
+
+
+def test_position_is_held_from_the_bar_after_the_signal():
+    # Entering on the 50 close earns the rebound, not the fall before it
+    bars = daily_bars([100, 100, 50, 100, 100])
+    result = simulate(bars, _strategy([_close("<", 60)], [_close(">", 1000)]))
+
+    assert result["totalReturn"] == pytest.approx(1.0)
+    assert result["buyAndHoldReturn"] == pytest.approx(0.0)
+    assert result["trades"] == 1
+    assert result["exposure"] == pytest.approx(0.5)
+
+
+def test_signal_on_the_last_bar_earns_nothing():
+    bars = daily_bars([100, 100, 100, 200])
+    result = simulate(bars, _strategy([_close(">", 150)], [_close("<", 0)]))
+
+    assert result["totalReturn"] == 0
+    assert result["trades"] == 1
+    assert result["exposure"] == 0
+
+
+def test_results_do_not_depend_on_later_bars():
+    bars = daily_bars(random_closes(300, seed=5))
+    entry = [{"left": {"series": "rsi", "period": 7}, "operator": "<", "right": 40}]
+    exit_ = [
+        {"left": {"series": "macd"}, "operator": "crossesBelow", "right": {"series": "macdSignal"}}
+    ]
+
+    for end in (120, 200, 260):
+        # Ending the test on a bar gives the same result as not having the later bars
+        last_day = datetime.fromtimestamp(bars[DATE][end - 1], timezone.utc).date()
+        windowed = simulate(bars, _strategy(entry, exit_, endDate=last_day))
+        truncated = simulate(bars[:, :end], _strategy(entry, exit_))
+
+        assert windowed["trades"] > 0
+        assert windowed == pytest.approx(truncated, rel=1e-9)
+
+
+def test_costs_are_charged_on_entry_and_exit():
+    bars = daily_bars([100, 50, 50, 100, 100])
+    entry, exit_ = [_close("<", 60)], [_close(">", 90)]
+    free = simulate(bars, _strategy(entry, exit_))
+    charged = simulate(bars, _strategy(entry, exit_, costBps=100))
+
+    # One round trip pays 1% of the equity twice
+    assert free["totalReturn"] == pytest.approx(1.0)
+    assert charged["totalReturn"] == pytest.approx(0.99 * 2 * 0.99 - 1)
+
+
+@pytest.mark.parametrize("cost_bps", [-10, 1001])
+def test_costs_are_bounded(cost_bps):
+    # A negative cost would turn every trade into a profit
+    with pytest.raises(ValueError):
+        _strategy([_close("<", 60)], [_close(">", 90)], costBps=cost_bps)
+
+
+def test_positions_prefer_entries_when_both_fire():
+    entry = np.array([False, True, False, True, False])
+    exit_ = np.array([True, True, True, False, True])
+
+    assert positions(entry, exit_).tolist() == [0, 1, 0, 1, 0]
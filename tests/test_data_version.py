@@ -0,0 +1,49 @@
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from app.core.data_version import adjustment_revision, bar_revision, format_data_version
+from app.utils.bar_ingestion import rewrites_history
+
+LATEST = datetime(2024, 6, 28)
+
+
+@pytest.mark.parametrize(
+    "revisions, version",
+    [
+        ((0, 0), "2024-06-28 00:00:00"),
+        ((2, 0), "2024-06-28 00:00:00#adj2"),
+        ((0, 3), "2024-06-28 00:00:00#rev3"),
+        ((2, 13), "2024-06-28 00:00:00#rev13#adj2"),
+    ],
+)
+def test_revisions_round_trip(revisions, version):
+    adjustment, bars = revisions
+
+    assert format_data_version(LATEST, adjustment, bars) == version
+    assert adjustment_revision(version) == adjustment
+    assert bar_revision(version) == bars
+
+
+def _result(modified=0, upserted=()):
+    # The fields of a pymongo BulkWriteResult that are read
+    return SimpleNamespace(
+        modified_count=modified, upserted_ids={index: None for index in upserted}
+    )
+
+
+def _bars(*days):
+    return [{"Date": datetime(2024, 6, day), "Close": 100.0} for day in days]
+
+
+def test_appending_newer_bars_keeps_the_history():
+    assert not rewrites_history(_bars(29, 30), _result(upserted=[0, 1]), LATEST)
+    assert not rewrites_history(_bars(1, 2), _result(upserted=[0, 1]), None)
+    # Re-sending a stored bar unchanged matches it without modifying it
+    assert not rewrites_history(_bars(28, 29), _result(upserted=[1]), LATEST)
+
+
+def test_corrected_or_inserted_old_bars_rewrite_the_history():
+    # A corrected same-day (or older) bar
+    assert rewrites_history(_bars(28), _result(modified=1), LATEST)
+    # A gap filled before the latest bar
+    assert rewrites_history(_bars(3, 29), _result(upserted=[0, 1]), LATEST)
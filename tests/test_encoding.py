@@ -0,0 +1,104 @@
+import gzip
+from types import SimpleNamespace
+import orjson
+import pytest
+from app.core import encoding
+from app.core.encoding import (
+    ARROW,
+    COMPRESSION_MIN_BYTES,
+    JSON,
+    MSGPACK,
+    negotiate_encoding,
+    negotiate_media_type,
+    negotiated_response,
+)
+
+
+@pytest.fixture
+def installed(monkeypatch):
+    """
+    Pretend the optional encoders are (or are not) installed.
+    """
+
+    def install(*names):
+        def _installed(name):
+            return name not in encoding.OPTIONAL_MODULES or name in names
+
+        monkeypatch.setattr(encoding, "_installed", _installed)
+
+    return install
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, JSON),
+        ("application/msgpack", MSGPACK),
+        ("application/x-msgpack", MSGPACK),
+        ("application/msgpack;q=0.5, application/json", JSON),
+        ("application/json;q=0.5, application/msgpack", MSGPACK),
+        ("text/html, application/vnd.apache.arrow.stream", ARROW),
+        ("text/html", JSON),
+        ("*/*", JSON),
+        ("application/json;q=0, */*", MSGPACK),
+    ],
+)
+def test_media_type_follows_the_accept_header(installed, accept, expected):
+    installed(MSGPACK, ARROW)
+
+    assert negotiate_media_type(accept, [JSON, MSGPACK, ARROW]) == expected
+
+
+def test_missing_encoders_and_tables_are_not_offered(installed):
+    installed()
+    assert negotiate_media_type("application/msgpack", [JSON, MSGPACK]) == JSON
+
+    installed(MSGPACK, ARROW)
+    # Without a table the endpoint does not offer Arrow
+    assert negotiate_media_type(f"{ARROW}, {MSGPACK};q=0.1", [JSON, MSGPACK]) == MSGPACK
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, brotli, expected",
+    [
+        (None, True, None),
+        ("gzip, deflate", True, "gzip"),
+        ("gzip, br", True, "br"),
+        ("gzip, br", False, "gzip"),
+        ("br;q=0, *", True, "gzip"),
+        ("*;q=0.5", True, "br"),
+        ("gzip;q=0", True, None),
+        ("identity", True, None),
+    ],
+)
+def test_content_coding_follows_accept_encoding(installed, accept_encoding, brotli, expected):
+    installed(*(["br"] if brotli else []))
+
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+def _request(**headers):
+    # Only the lower-case headers of a request are read
+    return SimpleNamespace(
+        headers={name.replace("_", "-"): value for name, value in headers.items()}
+    )
+
+
+def test_large_bodies_are_compressed(installed):
+    installed()
+    content = {"values": list(range(COMPRESSION_MIN_BYTES))}
+    response = negotiated_response(_request(accept_encoding="gzip"), content, {"ETag": '"1"'})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == '"1"'
+    assert response.headers["vary"] == "Accept, Accept-Encoding"
+    assert response.media_type == JSON
+    assert orjson.loads(gzip.decompress(response.body)) == content
+
+
+def test_small_bodies_are_sent_as_is(installed):
+    installed()
+    response = negotiated_response(_request(accept_encoding="gzip"), {"value": 1})
+
+    assert "content-encoding" not in response.headers
+    assert orjson.loads(response.body) == {"value": 1}
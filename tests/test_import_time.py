@@ -0,0 +1,9 @@
+from benchmarks.import_time import BUDGET_MS, measure
+
+
+def test_main_imports_within_budget():
+    # measure() imports the module in a fresh interpreter
+    total_us, modules = measure("main")
+
+    slowest = sorted(modules, reverse=True)[:5]
+    assert total_us / 1000 <= BUDGET_MS, f"Slowest modules by self time: {slowest}"
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from app.core.bar_store import CLOSE, bars_to_records
+from app.tools.get_stock_macd import GetStockMACDParams
+from app.tools.get_stock_rsi import GetStockRSIParams
+from app.utils import indicator_series
+from app.utils.calculate_stock_BollingerBands import calculate_bollinger_bands
+from app.utils.calculate_stock_MA import calculate_moving_average
+from app.utils.calculate_stock_MACD import compute_stock_macd
+from app.utils.calculate_stock_RSI import compute_stock_rsi
+from tests.support import daily_bars, random_closes
+
+
+@pytest.fixture
+def bars():
+    return daily_bars(random_closes(300, seed=11))
+
+
+@pytest.mark.parametrize("period", [2, 7, 14, 21])
+def test_rsi_calculator_matches_the_series(bars, period):
+    # The calculator reads bars newest first, the series oldest first
+    records = bars_to_records(bars, period + 1)
+    latest = compute_stock_rsi(records, {"period": period})["rsi"]
+
+    assert latest == pytest.approx(indicator_series.rsi(bars[CLOSE], period)[-1], rel=1e-12)
+
+
+def test_rsi_of_rising_closes_is_100():
+    bars = daily_bars(np.arange(1, 20, dtype=float))
+
+    assert compute_stock_rsi(bars_to_records(bars), {"period": 14})["rsi"] == 100
+    assert indicator_series.rsi(bars[CLOSE], 14)[-1] == 100
+
+
+def test_rsi_needs_one_more_bar_than_its_period(bars):
+    with pytest.raises(Exception, match="Not enough data"):
+        compute_stock_rsi(bars_to_records(bars, 14), {"period": 14})
+
+
+def test_moving_average_matches_the_series(bars):
+    latest = calculate_moving_average(bars_to_records(bars), 50)
+
+    assert latest == pytest.approx(indicator_series.sma(bars[CLOSE], 50)[-1], rel=1e-12)
+
+
+def test_bollinger_bands_use_the_newest_window(bars):
+    latest = calculate_bollinger_bands(bars_to_records(bars), 20, 2)
+    middle, upper, lower = indicator_series.bollinger_bands(bars[CLOSE], 20, 2)
+
+    assert latest["movingAverage"] == pytest.approx(middle[-1], rel=1e-12)
+    assert latest["upperBand"] == pytest.approx(upper[-1], rel=1e-9)
+    assert latest["lowerBand"] == pytest.approx(lower[-1], rel=1e-9)
+
+
+@pytest.mark.parametrize("as_records", [bars_to_records, lambda bars: list(bars_to_records(bars))])
+def test_macd_tool_matches_the_series(bars, as_records):
+    arguments = {"shortPeriod": 8, "longPeriod": 21, "signalPeriod": 5}
+    macd = compute_stock_macd(as_records(bars), arguments)["macd"]
+    line, signal, histogram = indicator_series.macd(bars[CLOSE], 8, 21, 5)
+
+    # Newest first, down to the first bar with a signal line
+    assert macd["macdLine"][0] == pytest.approx(line[-1], rel=1e-12)
+    assert macd["signalLine"][0] == pytest.approx(signal[-1], rel=1e-12)
+    assert macd["macdHistogram"][0] == pytest.approx(histogram[-1], rel=1e-12)
+    assert len(macd["signalLine"]) == bars.shape[1] - (21 + 5 - 2)
+
+
+def test_macd_needs_the_long_and_signal_periods(bars):
+    records = bars_to_records(bars, 26 + 9 - 2)
+
+    assert compute_stock_macd(records, {})["macd"] == "Not enough data to calculate MACD"
+    assert len(compute_stock_macd(bars_to_records(bars, 26 + 9 - 1), {})["macd"]["macdLine"]) == 1
+
+
+@pytest.mark.parametrize(
+    "params, arguments",
+    [(GetStockRSIParams, {"period": 0}), (GetStockMACDParams, {"signalPeriod": -1})],
+)
+def test_indicator_periods_must_be_positive(params, arguments):
+    with pytest.raises(ValueError):
+        params.model_validate({"stockSymbol": "TCS", **arguments})
@@ -0,0 +1,112 @@
+import asyncio
+import time
+import pytest
+from app.core.llm_scheduler import LLMScheduler, TokenBucket
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after=None):
+        super().__init__("Too many requests")
+        headers = {"retry-after": retry_after} if retry_after else {}
+        self.response = type("Response", (), {"headers": headers})()
+
+
+def _scheduler(**options):
+    limits = {"requests_per_minute": 10_000, "tokens_per_minute": 1_000_000, "max_concurrency": 1}
+    return LLMScheduler(**{**limits, **options})
+
+
+def _run_all(scheduler, calls):
+    # Queue every call before the first one finishes; return the order they ran in
+    order = []
+
+    async def main():
+        await asyncio.gather(
+            *(
+                scheduler.run(order.append, name, session_id=session, interactive=interactive)
+                for name, session, interactive in calls
+            )
+        )
+
+    asyncio.run(main())
+    return order
+
+
+def test_sessions_are_served_round_robin():
+    calls = [("a1", "A", False), ("a2", "A", False), ("a3", "A", False), ("b1", "B", False)]
+
+    # The first call starts at once; the rest alternate between the sessions
+    assert _run_all(_scheduler(), calls) == ["a1", "a2", "b1", "a3"]
+
+
+def test_interactive_calls_go_first():
+    calls = [("s1", "A", False), ("s2", "B", False), ("i1", "C", True)]
+
+    assert _run_all(_scheduler(), calls) == ["s1", "i1", "s2"]
+
+
+def test_rate_limited_calls_are_retried_with_backoff():
+    scheduler = _scheduler(backoff_seconds=0.001)
+    attempts = []
+
+    def call():
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise RateLimitError(retry_after="0.05" if len(attempts) == 2 else None)
+        return "done"
+
+    assert asyncio.run(scheduler.run(call)) == "done"
+    assert scheduler.retries == 2 and scheduler.completed == 1
+    # The second retry waits at least as long as the server asked
+    assert attempts[2] - attempts[1] >= 0.05
+
+
+def test_retries_stop_after_max_retries():
+    scheduler = _scheduler(max_retries=2, backoff_seconds=0.001)
+    attempts = []
+
+    def call():
+        attempts.append(None)
+        raise RateLimitError()
+
+    with pytest.raises(RateLimitError):
+        asyncio.run(scheduler.run(call))
+    assert len(attempts) == 3 and scheduler.failed == 1
+
+
+def test_other_errors_are_not_retried():
+    scheduler = _scheduler()
+
+    with pytest.raises(ZeroDivisionError):
+        asyncio.run(scheduler.run(lambda: 1 / 0))
+    assert scheduler.retries == 0 and scheduler.stats()["inFlight"] == 0
+
+
+def test_calls_wait_for_the_token_bucket():
+    scheduler = _scheduler(tokens_per_minute=6_000, max_concurrency=2)  # 100 tokens per second
+    started = []
+
+    async def main():
+        await asyncio.gather(
+            *(
+                scheduler.run(lambda: started.append(time.monotonic()), estimated_tokens=tokens)
+                for tokens in (6_000, 10)
+            )
+        )
+
+    asyncio.run(main())
+    # The first call empties the bucket; 10 tokens are back after 0.1 s
+    assert started[1] - started[0] >= 0.09
+
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(per_minute=60)
+    bucket.take(60)
+
+    assert bucket.wait_time(1) == pytest.approx(1, abs=0.01)
+    # Amounts above the capacity only wait for a full bucket
+    assert bucket.wait_time(1_000) == pytest.approx(60, abs=0.01)
+    bucket.take(-30)  # Returned after a call used fewer tokens than estimated
+    assert bucket.wait_time(30) == 0
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+from app.tools.get_market_correlation import GetMarketCorrelationParams
+from app.utils import market_correlation
+from app.utils.market_correlation import (
+    _analyze,
+    betas,
+    index_returns,
+    relative_strength,
+    rolling_correlation,
+)
+from tests.support import daily_bars, random_closes
+
+
+def test_rolling_correlation_matches_each_window():
+    rng = np.random.default_rng(1)
+    returns = rng.normal(0, 0.01, (40, 3))
+    returns[:, 2] += returns[:, 0]
+    returns[25, 1] = np.nan  # A gap in the second symbol
+    correlations = rolling_correlation(returns, 10)
+
+    assert correlations.shape == (31, 3, 3)
+    for start in (0, 15, 30):
+        window = returns[start : start + 10]
+        if np.isnan(window[:, 1]).any():
+            assert np.isnan(correlations[start, 1]).all()
+            assert np.isnan(correlations[start, :, 1]).all()
+            expected = np.corrcoef(window[:, [0, 2]], rowvar=False)
+            np.testing.assert_allclose(correlations[start][np.ix_([0, 2], [0, 2])], expected)
+        else:
+            np.testing.assert_allclose(correlations[start], np.corrcoef(window, rowvar=False))
+
+
+def test_beta_of_a_leveraged_symbol():
+    rng = np.random.default_rng(2)
+    market = rng.normal(0, 0.01, 100)
+    returns = np.column_stack([market, 2 * market, -market + 0.001])
+    returns[:10, 1] = np.nan  # Listed later: beta over the days it traded
+
+    np.testing.assert_allclose(betas(returns, market, 60), [1, 2, -1])
+    np.testing.assert_allclose(betas(returns, market, 95), [1, 2, -1])
+
+
+def test_index_returns_average_the_symbols_that_traded():
+    returns = np.array([[0.01, np.nan], [0.02, 0.04], [np.nan, np.nan]])
+    result = index_returns(returns)
+
+    np.testing.assert_allclose(result[:2], [0.01, 0.03])
+    assert np.isnan(result[2])
+
+
+def test_relative_strength_against_the_market():
+    close = np.array([[100.0, 100.0], [110.0, 99.0], [121.0, 102.0]])
+    market = np.array([1.0, 1.0, 1.1])
+
+    strength = relative_strength(close, market, horizons=(1, 2, 5))
+
+    np.testing.assert_allclose(strength[0], [121 / 110 / 1.1 - 1, 102 / 99 / 1.1 - 1], atol=1e-12)
+    np.testing.assert_allclose(strength[1], [1.21 / 1.1 - 1, 1.02 / 1.1 - 1])
+    assert np.isnan(strength[2]).all()  # Longer than the history
+
+
+def test_analysis_ranks_the_strongest_symbol_first(universe_of):
+    closes = random_closes(300, seed=4)
+    universe = universe_of({
+        "FLAT": daily_bars(np.full(300, 100.0)),
+        "UP": daily_bars(closes * np.linspace(1, 2, 300)),
+        "SAME": daily_bars(closes),
+    })
+    analysis = _analyze(universe, 20, 50)
+
+    assert analysis["symbols"] == ["FLAT", "UP", "SAME"]
+    assert len(analysis["averageCorrelation"]) == 50
+    # A constant price has no correlation with anything
+    assert analysis["correlation"][0] == [None, None, None]
+    assert analysis["correlation"][1][1] == pytest.approx(1.0)
+    ranks = {stock["symbol"]: stock["relativeStrengthRank"] for stock in analysis["stocks"]}
+    assert ranks["UP"] == 1
+
+
+def test_analysis_needs_a_full_window(universe_of):
+    universe = universe_of({"TEST": daily_bars(random_closes(10))})
+
+    with pytest.raises(ValueError, match="Not enough history"):
+        _analyze(universe, 20, 50)
+
+
+def test_chunks_give_the_same_correlations(monkeypatch):
+    returns = np.random.default_rng(3).normal(0, 0.01, (120, 4))
+    whole = rolling_correlation(returns, 30)
+    # Three windows of 4 symbols x 30 days per chunk
+    monkeypatch.setattr(market_correlation, "CHUNK_ELEMENTS", 3 * 4 * 30)
+
+    np.testing.assert_array_equal(rolling_correlation(returns, 30), whole)
+
+
+@pytest.mark.parametrize("arguments", [{"window": 251}, {"lookback": 1001}, {"window": 1}])
+def test_tool_windows_are_bounded(arguments):
+    with pytest.raises(ValidationError):
+        GetMarketCorrelationParams(**arguments)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from app.core.bar_store import CLOSE
+from app.tools.backtest_strategy import BacktestStrategyParams
+from app.utils import indicator_series
+from app.utils.backtest import simulate
+from app.utils.parameter_sweep import MAX_CONFIGURATIONS, sweep
+from tests.support import daily_bars, random_closes
+
+
+@pytest.fixture
+def bars():
+    return daily_bars(random_closes(400, seed=3))
+
+
+def _rule(series, entry_operator, exit_operator, entry_right, exit_right):
+    strategy = BacktestStrategyParams(
+        entry=[{"left": series, "operator": entry_operator, "right": entry_right}],
+        exit=[{"left": series, "operator": exit_operator, "right": exit_right}],
+    )
+    return strategy.model_dump(by_alias=True)
+
+
+def test_ma_sweep_matches_a_backtest_of_each_period(bars):
+    result = sweep(bars, "ma", {"period": [10, 20, 50]})
+
+    assert result["axes"] == {"period": [10, 20, 50]}
+    for row in result["table"]:
+        period = row["period"]
+        close, average = {"series": "close"}, {"series": "sma", "period": period}
+        backtest = simulate(bars, _rule(close, ">", "<", average, average))
+
+        assert row["movingAverage"] == pytest.approx(
+            indicator_series.sma(bars[CLOSE], period)[-1], rel=1e-12
+        )
+        assert row["totalReturn"] == pytest.approx(backtest["totalReturn"], rel=1e-9)
+        assert row["exposure"] == pytest.approx(backtest["exposure"])
+
+
+def test_rsi_sweep_matches_a_backtest_of_each_period(bars):
+    result = sweep(bars, "rsi", {"period": [7, 14]})
+
+    for row in result["table"]:
+        rsi = {"series": "rsi", "period": row["period"]}
+        backtest = simulate(bars, _rule(rsi, "<", ">", 30, 70))
+
+        assert row["rsi"] == pytest.approx(
+            indicator_series.rsi(bars[CLOSE], row["period"])[-1], rel=1e-12
+        )
+        assert row["totalReturn"] == pytest.approx(backtest["totalReturn"], rel=1e-9)
+
+
+def test_matrices_are_shaped_like_the_axes(bars):
+    result = sweep(bars, "bollinger-bands", {"period": [10, 20, 30], "multiplier": [2, 1.5]})
+
+    assert result["axes"] == {"period": [10, 20, 30], "multiplier": [1.5, 2]}
+    assert np.shape(result["matrix"]["percentB"]) == (3, 2)
+    assert np.shape(result["matrix"]["totalReturn"]) == (3, 2)
+    assert len(result["table"]) == 6
+
+
+def test_periods_longer_than_the_history_are_not_scored():
+    result = sweep(daily_bars(random_closes(30)), "ma", {"period": [5, 50]})
+
+    short, long = result["table"]
+    assert short["totalReturn"] is not None
+    assert long["movingAverage"] is None and long["totalReturn"] is None
+
+
+def test_invalid_sweeps_are_rejected(bars):
+    with pytest.raises(ValueError, match="Sweeps are available"):
+        sweep(bars, "adx")
+    with pytest.raises(ValueError, match="Too many configurations"):
+        sweep(bars, "ma", {"period": list(range(1, MAX_CONFIGURATIONS + 2))})
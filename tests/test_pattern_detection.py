@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+from app.core.bar_store import CLOSE, DATE, HIGH, LOW, OPEN
+from app.utils.pattern_detection import PATTERNS, PIVOT_ORDER, candlesticks, pivots, scan
+from tests.support import daily_bars, random_closes
+
+
+def _candles(*candles):
+    # (open, high, low, close) per bar
+    return [np.array(prices, dtype=float) for prices in zip(*candles)]
+
+
+def test_engulfing_candles():
+    open_, high, low, close = _candles(
+        (10, 10.5, 8.5, 9),  # Falling
+        (8.8, 10.6, 8.6, 10.2),  # Opens below and closes above it
+        (10.3, 10.4, 9.9, 10.1),  # Small falling candle
+    )
+    masks = candlesticks(open_, high, low, close)
+
+    assert masks["bullishEngulfing"].tolist() == [False, True, False]
+    assert not masks["bearishEngulfing"].any()
+
+
+def test_hammer_needs_a_falling_trend():
+    # A long lower shadow after five falling closes, and the same candle in a rise
+    falling = [(20 - i, 20.1 - i, 19.4 - i, 19.5 - i) for i in range(6)]
+    rising = [(10 + i, 10.6 + i, 9.9 + i, 10.5 + i) for i in range(6)]
+    hammer = (14, 14.25, 12, 14.2)
+    for history, expected in ((falling, True), (rising, False)):
+        open_, high, low, close = _candles(*history, hammer)
+
+        assert candlesticks(open_, high, low, close)["hammer"][-1] == expected
+
+
+def test_doji_has_almost_no_body():
+    open_, high, low, close = _candles((10, 11, 9, 10.05), (10, 11, 9, 10.5))
+
+    assert candlesticks(open_, high, low, close)["doji"].tolist() == [True, False]
+
+
+def test_pivots_need_bars_on_both_sides():
+    high = np.array([1, 2, 3, 4, 5, 9, 5, 4, 3, 2, 1, 0, 9], dtype=float)
+    swing_highs, swing_lows = pivots(high, high)
+
+    assert np.flatnonzero(swing_highs).tolist() == [5]
+    # The last bars cannot be pivots until later bars confirm them
+    assert not swing_highs[-PIVOT_ORDER:].any() and not swing_lows[-PIVOT_ORDER:].any()
+
+
+def _double_top():
+    up = np.linspace(100, 110, 21)
+    down = np.linspace(110, 100, 11)
+    return np.concatenate([up, down[1:], up[1:11], np.linspace(110, 90, 21)[1:]])
+
+
+def test_double_top_is_marked_when_the_neckline_breaks():
+    bars = daily_bars(_double_top())
+    (result,) = scan([bars])
+    (confirmed,) = np.flatnonzero(np.isin(bars[DATE], result["events"]["doubleTop"]))
+
+    # The lowest low between the two peaks is the neckline
+    neckline = bars[LOW][20:40].min()
+    assert bars[CLOSE][confirmed] < neckline <= bars[CLOSE][confirmed - 1]
+    assert not len(result["events"]["doubleBottom"])
+
+
+def test_scans_only_use_bars_up_to_each_date():
+    bars = daily_bars(random_closes(400, seed=9) * np.r_[np.ones(200), np.linspace(1, 1.3, 200)])
+    bars[OPEN] *= 1 + np.random.default_rng(9).normal(0, 0.01, 400)
+    bars[HIGH] = np.maximum(bars[HIGH], bars[OPEN])
+    bars[LOW] = np.minimum(bars[LOW], bars[OPEN])
+    (full,) = scan([bars])
+    assert sum(len(dates) for dates in full["events"].values()) > 0
+
+    for end in (150, 260, 330):
+        (partial,) = scan([bars[:, :end]])
+        last = bars[DATE][end - 1]
+        for name in PATTERNS:
+            events = full["events"][name]
+            np.testing.assert_array_equal(partial["events"][name], events[events <= last])
+
+
+def test_levels_bracket_the_latest_close():
+    (result,) = scan([daily_bars(random_closes(300, seed=2))])
+
+    assert all(level["level"] < result["close"] for level in result["support"])
+    assert all(level["level"] > result["close"] for level in result["resistance"])
+    assert all(level["touches"] >= 1 for level in result["support"] + result["resistance"])
+    supports = [level["level"] for level in result["support"]]
+    assert supports == sorted(supports, reverse=True)  # Nearest first
+
+
+@pytest.mark.parametrize("lengths", [(50, 80), (80, 50)])
+def test_shorter_histories_are_aligned_on_the_latest_bar(lengths):
+    histories = [daily_bars(random_closes(length, seed=length)) for length in lengths]
+    together = scan(histories)
+
+    for history, result in zip(histories, together):
+        (alone,) = scan([history])
+        for name in PATTERNS:
+            np.testing.assert_array_equal(result["events"][name], alone["events"][name])
@@ -0,0 +1,95 @@
+from statistics import NormalDist
+import numpy as np
+import pytest
+from app.core.bar_store import CLOSE
+from app.utils import portfolio
+from app.utils.portfolio import merge_holdings, portfolio_analysis
+from tests.support import daily_bars, random_closes
+
+
+@pytest.fixture
+def holdings_of(monkeypatch, universe_of):
+    """
+    Analyze portfolios over in-memory histories instead of the bar store.
+    """
+
+    def build(histories, industries=None):
+        monkeypatch.setattr(
+            portfolio,
+            "get_universe",
+            lambda symbols: universe_of({s: histories[s] for s in symbols if s in histories}),
+        )
+        monkeypatch.setattr(portfolio, "_industries", lambda symbols: industries or {})
+
+    return build
+
+
+def _holding(symbol, quantity, cost_basis):
+    return {"symbol": symbol, "quantity": quantity, "cost_basis": cost_basis}
+
+
+def test_holdings_of_a_symbol_merge_at_their_average_cost():
+    merged = merge_holdings([_holding("A", 10, 100), _holding("B", 1, 50), _holding("A", 30, 120)])
+
+    assert merged == [_holding("A", 40, 115), _holding("B", 1, 50)]
+
+
+def test_pnl_and_day_change_at_the_latest_close(holdings_of):
+    holdings_of(
+        {"A": daily_bars([90, 100, 110]), "B": daily_bars([50, 40, 45])},
+        {"A": "IT", "B": "Banks"},
+    )
+    result = portfolio_analysis([_holding("A", 10, 100), _holding("B", 20, 50)])
+
+    assert result["totalValue"] == 10 * 110 + 20 * 45
+    assert result["totalCost"] == 10 * 100 + 20 * 50
+    assert result["unrealizedPnl"] == 100 - 100
+    assert result["dayChange"] == 10 * 10 + 20 * 5
+    assert result["dayChangePct"] == pytest.approx(200 / (2000 - 200))
+
+    a, b = result["positions"]  # Largest first
+    assert (a["symbol"], a["industry"], a["unrealizedPnl"]) == ("A", "IT", 100)
+    assert a["unrealizedPnlPct"] == pytest.approx(0.1)
+    assert (b["symbol"], b["unrealizedPnl"], b["weight"]) == ("B", -100, pytest.approx(0.45))
+    assert [sector["industry"] for sector in result["sectors"]] == ["IT", "Banks"]
+    assert result["risk"] is not None and result["missing"] == []
+
+
+def test_value_at_risk_from_the_return_covariance(holdings_of):
+    histories = {
+        "A": daily_bars(random_closes(300, seed=1)),
+        "B": daily_bars(random_closes(300, seed=2)),
+    }
+    holdings_of(histories)
+    result = portfolio_analysis(
+        [_holding("A", 10, 100), _holding("B", 5, 100)],
+        confidence=0.99,
+        horizon_days=4,
+        lookback_days=100,
+    )
+
+    close = np.column_stack([bars[CLOSE] for bars in histories.values()])
+    returns = (close[1:] / close[:-1] - 1)[-100:]
+    market_value = close[-1] * [10, 5]
+    weights = market_value / market_value.sum()
+    volatility = np.sqrt(weights @ np.cov(returns, rowvar=False) @ weights)
+    portfolio_returns = returns @ weights
+    risk = result["risk"]
+
+    assert risk["returnDays"] == 100
+    assert risk["dailyVolatility"] == pytest.approx(volatility)
+    assert risk["parametricVarPct"] == pytest.approx(NormalDist().inv_cdf(0.99) * volatility * 2)
+    assert risk["historicalVarPct"] == pytest.approx(-np.quantile(portfolio_returns, 0.01) * 2)
+    assert risk["parametricVar"] == pytest.approx(risk["parametricVarPct"] * result["totalValue"])
+    assert risk["expectedShortfallPct"] >= risk["historicalVarPct"]
+    contributions = [position["riskContribution"] for position in result["positions"]]
+    assert sum(contributions) == pytest.approx(1)
+
+
+def test_symbols_without_bars_are_reported(holdings_of):
+    holdings_of({"A": daily_bars([100, 101])})
+    result = portfolio_analysis([_holding("A", 1, 100), _holding("GONE", 1, 100)])
+
+    assert result["missing"] == ["GONE"]
+    assert [position["symbol"] for position in result["positions"]] == ["A"]
+    assert result["risk"] is None  # One return is not enough
@@ -0,0 +1,110 @@
+from datetime import timedelta
+import numpy as np
+import pytest
+from app.core.bar_store import CLOSE, HIGH, LOW, OPEN, VOLUME, records_to_bars
+from app.utils.price_adjustment import adjustment_factors, apply_adjustments, undo_splits
+from tests.support import START, daily_bars
+
+
+def test_split_scales_earlier_prices_and_volumes():
+    bars = daily_bars([100, 100, 50, 50])
+    split = {"date": START + timedelta(days=2), "type": "split", "ratio": 2}
+    factors = adjustment_factors(bars, [split])
+
+    assert factors["dates"] == [(START + timedelta(days=2)).timestamp()]
+    assert factors["price"] == [0.5, 1.0]
+    assert factors["volume"] == [2.0, 1.0]
+
+    adjusted = apply_adjustments(bars, factors)
+    np.testing.assert_allclose(adjusted[CLOSE], [50, 50, 50, 50])
+    np.testing.assert_allclose(adjusted[VOLUME], [2000, 2000, 1000, 1000])
+    for field in (OPEN, HIGH, LOW):
+        np.testing.assert_allclose(adjusted[field][:2], bars[field][:2] / 2)
+        np.testing.assert_array_equal(adjusted[field][2:], bars[field][2:])
+
+
+def test_dividend_uses_close_before_ex_date():
+    bars = daily_bars([40, 50, 49, 49])
+    factors = adjustment_factors(
+        bars, [{"date": (START + timedelta(days=2)).isoformat(), "type": "dividend", "amount": 1}]
+    )
+
+    assert factors["price"] == pytest.approx([1 - 1 / 50, 1.0])
+    assert factors["volume"] == [1.0, 1.0]
+
+
+def test_factors_chain_later_actions():
+    bars = daily_bars([100, 100, 100, 50, 50])
+    actions = [
+        {"date": START + timedelta(days=3), "type": "split", "ratio": 2},
+        {"date": START + timedelta(days=1), "type": "dividend", "amount": 10},
+    ]
+    factors = adjustment_factors(bars, actions)
+
+    # Bars before the dividend are adjusted for both actions
+    assert factors["price"] == pytest.approx([0.9 * 0.5, 0.5, 1.0])
+    assert factors["volume"] == pytest.approx([2.0, 2.0, 1.0])
+
+
+def test_dividend_without_earlier_close_is_skipped():
+    bars = daily_bars([100, 100])
+    factors = adjustment_factors(bars, [{"date": START, "type": "dividend", "amount": 1}])
+
+    assert factors == {"dates": [], "price": [1.0], "volume": [1.0]}
+    np.testing.assert_array_equal(apply_adjustments(bars, factors), bars)
+
+
+def test_adjusted_bars_are_read_only():
+    bars = daily_bars([100, 50])
+    split = {"date": START + timedelta(days=1), "type": "split", "ratio": 2}
+    factors = adjustment_factors(bars, [split])
+    adjusted = apply_adjustments(bars, factors)
+
+    assert not adjusted.flags.writeable
+    assert bars[CLOSE][0] == 100  # The raw bars are untouched
+
+
+def _record(day, close, volume):
+    # A bar dict as download_historical_data.to_bars builds it
+    return {
+        "Date": START + timedelta(days=day),
+        "Open": close,
+        "High": close * 1.01,
+        "Low": close * 0.99,
+        "Close": close,
+        "Volume": volume,
+    }
+
+
+def test_split_inside_the_downloaded_range_is_applied_once():
+    # Yahoo's Close is split-adjusted even with auto_adjust=False: a 2-for-1
+    # split on day 2 shows the 100 traded before it as 50
+    yahoo = [_record(day, 50.0, 2000) for day in range(4)]
+    split = {"date": START + timedelta(days=2), "type": "split", "ratio": 2.0}
+    stored = undo_splits(yahoo, [split])
+
+    # Stored as traded: prices before the split doubled, volumes halved
+    assert [bar["Close"] for bar in stored] == [100, 100, 50, 50]
+    assert [bar["High"] for bar in stored] == pytest.approx([101, 101, 50.5, 50.5])
+    assert [bar["Volume"] for bar in stored] == [1000, 1000, 2000, 2000]
+
+    bars = records_to_bars(stored)
+    adjusted = apply_adjustments(bars, adjustment_factors(bars, [split]))
+    # Adjusting the stored bars scales earlier prices once, back to Yahoo's
+    np.testing.assert_allclose(adjusted[CLOSE], [50, 50, 50, 50])
+    np.testing.assert_allclose(adjusted[HIGH], [50.5, 50.5, 50.5, 50.5])
+    np.testing.assert_allclose(adjusted[VOLUME], [2000, 2000, 2000, 2000])
+
+
+def test_undoing_splits_chains_every_later_split():
+    yahoo = [_record(day, 10.0, 600) for day in range(3)]
+    splits = [
+        {"date": START + timedelta(days=2), "type": "split", "ratio": 3.0},
+        {"date": START + timedelta(days=1), "type": "split", "ratio": 2.0},
+        {"date": START + timedelta(days=30), "type": "split", "ratio": 5.0},  # After the range
+    ]
+    stored = undo_splits(yahoo, splits)
+
+    assert [bar["Close"] for bar in stored] == [300, 150, 50]
+    assert [bar["Volume"] for bar in stored] == [20, 40, 120]
+    assert undo_splits(yahoo, []) == yahoo
@@ -0,0 +1,115 @@
+from datetime import datetime, timezone
+import numpy as np
+import pytest
+from app.core.bar_store import CLOSE, DATE, HIGH, LOW, OPEN, VOLUME
+from app.utils import resampling
+from app.utils.resampling import get_resampled_history, resample
+from tests.support import daily_bars, random_closes
+
+
+def _day(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).date().isoformat()
+
+
+def test_weekly_bars_aggregate_monday_to_sunday():
+    # 2024-01-01 is a Monday: two full weeks and a partial third
+    bars = daily_bars(np.arange(1, 18, dtype=float))
+    weekly = resample(bars, "weekly")
+
+    assert [_day(date) for date in weekly[DATE]] == ["2024-01-07", "2024-01-14", "2024-01-17"]
+    np.testing.assert_array_equal(weekly[OPEN], bars[OPEN][[0, 7, 14]])
+    np.testing.assert_array_equal(weekly[CLOSE], [7, 14, 17])
+    weeks = [slice(0, 7), slice(7, 14), slice(14, None)]
+    np.testing.assert_array_equal(weekly[HIGH], [bars[HIGH][week].max() for week in weeks])
+    np.testing.assert_array_equal(weekly[LOW], [bars[LOW][week].min() for week in weeks])
+    np.testing.assert_array_equal(weekly[VOLUME], [7000, 7000, 3000])
+
+
+def test_monthly_bars_are_dated_by_last_trading_day():
+    bars = daily_bars(random_closes(70))
+    monthly = resample(bars, "monthly")
+
+    assert [_day(date) for date in monthly[DATE]] == ["2024-01-31", "2024-02-29", "2024-03-10"]
+    assert monthly[VOLUME].sum() == bars[VOLUME].sum()
+
+
+def test_unsupported_timeframe():
+    with pytest.raises(ValueError):
+        resample(daily_bars([1, 2]), "hourly")
+
+
+@pytest.fixture
+def history(monkeypatch):
+    # The daily history served to get_resampled_history, replaced per test
+    state = {"bars": None, "version": "2024-01-01 00:00:00"}
+    monkeypatch.setattr(resampling, "get_bar_history", lambda symbol, adjusted=True: state["bars"])
+    monkeypatch.setattr(resampling, "get_data_version", lambda db, symbol: state["version"])
+    monkeypatch.setattr(resampling, "_aggregates", {})
+    return state
+
+
+@pytest.mark.parametrize("timeframe", ["weekly", "monthly"])
+def test_appended_bars_rebuild_only_the_last_period(history, monkeypatch, timeframe):
+    full = daily_bars(random_closes(200, seed=3))
+    expected = resample(full, timeframe)
+
+    resampled = []
+    monkeypatch.setattr(
+        resampling,
+        "resample",
+        lambda bars, timeframe: resampled.append(bars.shape[1]) or resample(bars, timeframe),
+    )
+
+    # Bars arrive a few at a time, ending mid-period and on period boundaries
+    previous = 0
+    for end in (40, 41, 45, 59, 60, 61, 120, 200):
+        history["bars"] = full[:, :end]
+        resampled.clear()
+        np.testing.assert_array_equal(
+            get_resampled_history("TEST", timeframe), resample(full[:, :end], timeframe)
+        )
+        # After the first call, only the appended bars and the days of the
+        # last cached period (at most 31) are resampled
+        (count,) = resampled
+        assert count == end if not previous else end - previous <= count <= end - previous + 31
+        previous = end
+    np.testing.assert_array_equal(get_resampled_history("TEST", timeframe), expected)
+
+
+def test_cached_aggregate_is_reused_until_bars_change(history):
+    history["bars"] = daily_bars(random_closes(30))
+    first = get_resampled_history("TEST", "weekly")
+
+    assert get_resampled_history("TEST", "weekly") is first
+    assert not first.flags.writeable
+
+
+def test_corrected_history_is_resampled_from_scratch(history):
+    history["bars"] = daily_bars(random_closes(30))
+    get_resampled_history("TEST", "weekly")
+
+    # A history that does not extend the cached one (e.g. a corrected bar
+    # store) must not reuse its periods
+    corrected = daily_bars(
+        random_closes(35, seed=1), start=datetime(2024, 1, 3, tzinfo=timezone.utc)
+    )
+    history["bars"] = corrected
+    np.testing.assert_array_equal(
+        get_resampled_history("TEST", "weekly"), resample(corrected, "weekly")
+    )
+
+
+def test_corrected_bar_with_the_same_dates_is_resampled_from_scratch(history):
+    bars = daily_bars(random_closes(30))
+    history["bars"] = bars
+    get_resampled_history("TEST", "weekly")
+
+    # Same count and last date, but a historical close was corrected and the
+    # ingestion bumped the bar revision of the data version
+    corrected = bars.copy()
+    corrected[CLOSE][6] *= 2
+    history["bars"] = corrected
+    history["version"] += "#rev1"
+    np.testing.assert_array_equal(
+        get_resampled_history("TEST", "weekly"), resample(corrected, "weekly")
+    )
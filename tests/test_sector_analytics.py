@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from app.utils import sector_analytics
+from app.utils.sector_analytics import sector_analysis
+from tests.support import daily_bars
+
+
+@pytest.fixture
+def market(monkeypatch):
+    """
+    Serve sector analytics from in-memory histories instead of the database.
+    """
+    histories = {}
+    industries = {}
+
+    def add(industry, symbol, closes):
+        histories[symbol] = daily_bars(closes)
+        industries.setdefault(industry, []).append(symbol)
+
+    monkeypatch.setattr(sector_analytics, "_industries", lambda: industries)
+    monkeypatch.setattr(sector_analytics, "get_bar_history", histories.__getitem__)
+    monkeypatch.setattr(
+        sector_analytics,
+        "get_data_version",
+        lambda db, symbol: "test" if symbol in histories else None,
+    )
+    sector_analytics._symbol_stats.cache_clear()
+    yield add
+    sector_analytics._symbol_stats.cache_clear()
+
+
+def test_indices_weight_stocks_equally_and_by_traded_value(market):
+    market("IT", "UP", [100, 110, 121])
+    market("IT", "DOWN", [100, 90, 81])
+    (sector,) = sector_analysis()["sectors"]
+
+    # +10% and -10% every day cancel out in the equal-weighted index
+    assert sector["stocks"] == 2
+    assert sector["equalWeightLevel"] == pytest.approx(100)
+    up, down = np.mean([100, 110, 121]), np.mean([100, 90, 81])
+    daily = (0.1 * up - 0.1 * down) / (up + down)
+    assert sector["valueWeightLevel"] == pytest.approx(100 * (1 + daily) ** 2)
+
+
+def test_breadth_counts_stocks_above_their_averages(market):
+    rising = np.linspace(100, 200, 250)
+    market("Banks", "A", rising)
+    market("Banks", "B", rising[::-1])
+    market("Banks", "C", rising[:100])  # Too short for the 200-day average
+    (sector,) = sector_analysis()["sectors"]
+
+    assert sector["breadth"]["aboveSma50Pct"] == pytest.approx(200 / 3)
+    assert sector["breadth"]["aboveSma200Pct"] == pytest.approx(50)
+    # Only gains: RSI 100 for A and C
+    assert sector["breadth"]["rsiAbove70Pct"] == pytest.approx(200 / 3)
+
+
+def test_sectors_are_ranked_by_momentum_and_filtered_by_industry(market):
+    days = 300
+    market("Information Technology", "IT1", np.linspace(100, 150, days))
+    market("Oil & Gas", "OIL1", np.linspace(100, 80, days))
+    market("Financial Services", "FIN1", np.linspace(100, 120, days))
+    market("Financial Services", "FIN2", np.linspace(100, 130, days))
+
+    sectors = sector_analysis()["sectors"]
+    assert [sector["industry"] for sector in sectors] == [
+        "Information Technology",
+        "Financial Services",
+        "Oil & Gas",
+    ]
+    assert [sector["momentumRank"] for sector in sectors] == [1, 2, 3]
+    assert set(sectors[0]["momentum"]) == {"21d", "63d", "126d", "252d"}
+    assert "members" not in sectors[0]
+
+    (financials,) = sector_analysis("financial")["sectors"]
+    assert financials["momentumRank"] == 2
+    assert [member["symbol"] for member in financials["members"]] == ["FIN1", "FIN2"]
+
+
+def test_symbols_without_bars_are_left_out(market):
+    market("Metals", "STEEL", [100, 101])
+    sector_analytics._industries()["Metals"].append("UNLISTED")
+
+    (sector,) = sector_analysis()["sectors"]
+    assert sector["stocks"] == 1
@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.core import session_store
+from app.core.session_store import (
+    BUCKET_SIZE,
+    MESSAGES_COLLECTION,
+    SESSIONS_COLLECTION,
+    compact_session,
+    decode_message_cursor,
+    encode_message_cursor,
+    get_messages,
+)
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def forget_compacted(monkeypatch):
+    monkeypatch.setattr(session_store, "_compacted_sessions", set())
+
+
+def _legacy_session(db, session_id, count):
+    # Sessions written before bucketing embedded every message, and user
+    # messages used the old messageText key
+    messages = [
+        {
+            "role": "user" if index % 2 == 0 else "assistant",
+            "messageText" if index % 2 == 0 else "message_text": f"message {index}",
+            "created_at": START + timedelta(seconds=index),
+        }
+        for index in range(count)
+    ]
+    db[SESSIONS_COLLECTION].docs.append({"session_id": session_id, "messages": messages})
+
+
+def _texts(messages):
+    return [message["message_text"] for message in messages]
+
+
+def test_legacy_messages_are_moved_into_full_buckets(db):
+    _legacy_session(db, "s1", BUCKET_SIZE + 10)
+
+    assert compact_session(db, "s1") == BUCKET_SIZE + 10
+    buckets = db[MESSAGES_COLLECTION].docs
+    assert [len(bucket["messages"]) for bucket in buckets] == [BUCKET_SIZE, 10]
+    # Legacy buckets are never reopened for new messages
+    assert all(bucket["count"] == BUCKET_SIZE for bucket in buckets)
+    assert "messages" not in db[SESSIONS_COLLECTION].find_one({"session_id": "s1"})
+
+    messages, _ = get_messages(db, "s1", 1000)
+    assert _texts(messages) == [f"message {index}" for index in range(BUCKET_SIZE + 10)]
+
+
+def test_concurrent_compactions_insert_every_bucket_once(db, monkeypatch):
+    _legacy_session(db, "s1", BUCKET_SIZE + 10)
+
+    # Another worker compacts the session between our read and our insert
+    insert = session_store._insert_legacy_buckets
+
+    def racing_insert(db, buckets):
+        insert(db, buckets)
+        insert(db, buckets)
+
+    monkeypatch.setattr(session_store, "_insert_legacy_buckets", racing_insert)
+    compact_session(db, "s1")
+
+    assert len(db[MESSAGES_COLLECTION].docs) == 2
+
+
+def test_interrupted_compaction_can_run_again(db, monkeypatch):
+    _legacy_session(db, "s1", 5)
+    sessions = db[SESSIONS_COLLECTION]
+
+    def crash(*args, **kwargs):
+        raise ConnectionError("lost the connection before removing the array")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(sessions, "update_one", crash)
+        with pytest.raises(ConnectionError):
+            compact_session(db, "s1")
+
+    assert compact_session(db, "s1") == 5
+    messages, _ = get_messages(db, "s1", 100)
+    assert len(messages) == 5
+
+
+def test_compaction_runs_once_per_session(db):
+    _legacy_session(db, "s1", 3)
+    compact_session(db, "s1")
+
+    assert compact_session(db, "s1") == 0
+    assert compact_session(db, "unknown") == 0
+
+
+def _bucket(db, session_id, index, messages):
+    db[MESSAGES_COLLECTION].docs.append(
+        {
+            "_id": f"{session_id}:{index:03d}",
+            "session_id": session_id,
+            "count": len(messages),
+            "created_at": messages[0]["created_at"],
+            "messages": messages,
+        }
+    )
+
+
+def test_pages_do_not_skip_messages_sharing_a_timestamp(db):
+    # Pairs of messages share a millisecond, and ties straddle buckets
+    messages = [
+        {
+            "role": "user",
+            "message_text": f"m{index}",
+            "created_at": START + timedelta(milliseconds=index // 2),
+        }
+        for index in range(23)
+    ]
+    for start in range(0, len(messages), 5):
+        _bucket(db, "s1", start, messages[start : start + 5])
+
+    seen, cursor = [], None
+    for _ in range(len(messages)):
+        page, cursor = get_messages(db, "s1", 3, cursor=cursor)
+        seen = page + seen
+        if cursor is None:
+            break
+    assert _texts(seen) == [message["message_text"] for message in messages]
+
+
+def test_before_returns_older_messages_only(db):
+    messages = [
+        {
+            "role": "user",
+            "message_text": f"m{index}",
+            "created_at": START + timedelta(seconds=index),
+        }
+        for index in range(10)
+    ]
+    _bucket(db, "s1", 0, messages)
+
+    page, cursor = get_messages(db, "s1", 3, before=START + timedelta(seconds=5))
+    assert _texts(page) == ["m2", "m3", "m4"]
+    assert cursor is not None
+
+
+def test_cursor_round_trip():
+    created_at = START + timedelta(milliseconds=1)
+    assert decode_message_cursor(encode_message_cursor(created_at, 2)) == (created_at, 2)
+    with pytest.raises(ValueError):
+        decode_message_cursor("not a cursor")
@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+from app.core.single_flight import SingleFlight
+
+
+def test_concurrent_identical_calls_run_once():
+    flight = SingleFlight()
+    runs = []
+
+    async def compute(value):
+        runs.append(value)
+        await asyncio.sleep(0.01)
+        return value * 2
+
+    async def main():
+        return await asyncio.gather(
+            flight.do("a", lambda: compute(1)),
+            flight.do("a", lambda: compute(1)),
+            flight.do("b", lambda: compute(2)),
+        )
+
+    assert asyncio.run(main()) == [2, 2, 4]
+    assert runs == [1, 2]
+    assert flight.stats() == {
+        "inFlight": 0,
+        "executions": 2,
+        "coalesced": 1,
+        "coalescedRate": pytest.approx(1 / 3),
+    }
+
+
+def test_finished_calls_are_not_reused():
+    flight = SingleFlight()
+    runs = []
+
+    async def compute():
+        runs.append(None)
+        return len(runs)
+
+    async def main():
+        return [await flight.do("a", compute), await flight.do("a", compute)]
+
+    assert asyncio.run(main()) == [1, 2]
+
+
+def test_every_caller_gets_the_exception():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("bad symbol")
+
+    async def main():
+        return await asyncio.gather(
+            flight.do("a", fail), flight.do("a", fail), return_exceptions=True
+        )
+
+    first, second = asyncio.run(main())
+    assert isinstance(first, ValueError) and second is first
+    assert flight.stats()["executions"] == 1
+
+
+def test_a_cancelled_caller_does_not_cancel_the_others():
+    flight = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        leaving = asyncio.ensure_future(flight.do("a", compute))
+        staying = asyncio.ensure_future(flight.do("a", compute))
+        await asyncio.sleep(0.005)
+        leaving.cancel()
+        return await staying, leaving.cancelled()
+
+    assert asyncio.run(main()) == ("done", True)